@@ -11,14 +11,8 @@ from ui.tab_terrain import render_tab_terrain
 from ui.tab_info import render_tab_info
 
 # 로직 모듈 임포트
-from modules.api_kakao import KakaoNavi
-from modules.api_google import GoogleElevation
-from modules.processor import DataProcessor
-from modules.calculator import CarbonCalculator
-from modules.api_weather import WeatherAPI
-from modules.vehicle_db import VehicleDB
-from modules.api_odsay import ODsayClient
-from modules.calculator_pub import PublicTransportCalculator
+from modules.pipeline import create_resources, run_analysis
+from modules.result_cache import make_key
 
 # --- [핵심] API 키 로드 헬퍼 함수 ---
 def get_key(key_name):
@@ -42,86 +36,13 @@ def load_resources():
     load_dotenv() # 로컬용 .env 로드
     
     # [수정됨] get_key 함수를 사용하여 안전하게 키 로드
-    kakao_key = get_key("KAKAO_API_KEY")
-    google_key = get_key("GOOGLE_API_KEY")
-    odsay_key = get_key("ODSAY_API_KEY")
-    weather_key = get_key("OPENWEATHER_API_KEY")
-    
-    return {
-        "kakao": KakaoNavi(kakao_key),
-        "google": GoogleElevation(google_key, use_mock=False),
-        "weather": WeatherAPI(weather_key),
-        "odsay": ODsayClient(odsay_key),
-        "v_db": VehicleDB(),
-        "car_calc": CarbonCalculator(),
-        "pub_calc": PublicTransportCalculator()
-    }
-
-def run_analysis(start, end, my_car, res):
-    """분석 실행 로직"""
-    kakao, odsay, weather_api = res['kakao'], res['odsay'], res['weather']
-    
-    # Processor는 매번 새로 생성 (구글 객체 주입)
-    processor = DataProcessor(res['google']) 
-    
-    # 1. 좌표 변환
-    sx, sy = kakao.get_coords(start)
-    ex, ey = kakao.get_coords(end)
-    
-    if not sx or not ex:
-        return None 
-
-    # 2. 날씨 정보
-    w_info = weather_api.get_weather(sy, sx)
-
-    # 3. 승용차 분석
-    car_routes = kakao.get_multi_routes(start, end)
-    collected, car_summ, car_speeds = [], [], []
-    
-    # 이벤트 카운터
-    events = {"uphill": 0, "congestion": 0, "weather_bad": 0} 
-
-    if car_routes:
-        # 대표 경로 이벤트 집계 (첫 번째 경로 기준)
-        first_segs = processor.process_route(car_routes[0])
-        if first_segs:
-            for s in first_segs:
-                if abs(s['grade_pct']) > 5.0: events['uphill'] += 1
-                if s['speed_kph'] < 20: events['congestion'] += 1
-            if w_info['is_wet'] or w_info['temp'] > 28 or w_info['temp'] < 5:
-                events['weather_bad'] = 1
-
-        for idx, route in enumerate(car_routes):
-            strategy = route.get('strategy_label', '일반')
-            segs = processor.process_route(route)
-            if not segs: continue
-            
-            co2, _, w_pct = res['car_calc'].calculate_weather_impact(segs, w_info, my_car)
-            dist = sum(s['distance_m'] for s in segs) / 1000
-            time = route['summary']['duration'] / 60
-            if time > 0: car_speeds.append(dist/(time/60))
-            
-            stats = {'dist': dist, 'time': time, 'co2': co2, 'weather_pct': w_pct}
-            collected.append({'segments': segs, 'label': strategy, 'stats': stats, 'id': idx+1})
-            car_summ.append({"Type": "Car", "Route": strategy, "CO2": co2, "Time": time, "Dist": dist})
-
-    # 4. 대중교통 분석
-    pub_raw = odsay.search_path(sx, sy, ex, ey)
-    pub_summ = []
-    
-    if pub_raw and 'path' in pub_raw:
-        avg_speed = sum(car_speeds)/len(car_speeds) if car_speeds else None
-        for path in pub_raw['path'][:3]:
-            r = res['pub_calc'].calculate({"info": path['info'], "subPath": path['subPath']}, avg_speed)
-            p_type = "지하철" if path['pathType']==1 else "버스" if path['pathType']==2 else "복합"
-            pub_summ.append({"Type": "Pub", "Route": p_type, "CO2": r['total_co2'], "Time": r['total_time'], "Dist": r['total_dist']})
-
-    return {
-        "coords": {'sx': sx, 'sy': sy, 'ex': ex, 'ey': ey},
-        "weather": w_info,
-        "car_data": {'collected': collected, 'summary': car_summ, 'events': events},
-        "pub_data": pub_summ
-    }
+    return create_resources(
+        kakao_key=get_key("KAKAO_API_KEY"),
+        google_key=get_key("GOOGLE_API_KEY"),
+        odsay_key=get_key("ODSAY_API_KEY"),
+        weather_key=get_key("OPENWEATHER_API_KEY"),
+        dem_dir=get_key("DEM_TILE_DIR")
+    )
 
 # --- 메인 실행 ---
 def main():
@@ -183,7 +104,9 @@ def main():
         
         with placeholder.container():
             with st.spinner("📡 위성 지형 및 교통 데이터를 정밀 분석 중입니다..."):
-                result = run_analysis(s, e, my_car, res)
+                # 같은 분석이 다른 세션에서 이미 진행 중이면 그 결과를 기다려서 공유
+                flight_key = make_key(s.strip(), e.strip(), my_car)
+                result = res['flight'].do(flight_key, run_analysis, s, e, my_car, res)
                 if result:
                     st.session_state.update(result)
                     st.session_state['analyzed'] = True
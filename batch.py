@@ -0,0 +1,219 @@
+"""
+[배치 분석] OD(출발지/도착지) 목록을 읽어서 승용차 + 대중교통 분석을 병렬로 실행
+
+실행 예:
+    python batch.py od_pairs.csv -o data/batch_result.jsonl --workers 8 --rate 2
+
+- 입력: CSV (헤더: origin, destination[, vehicle][, id]) 또는 JSONL (같은 키)
+- 출력: 결과가 나올 때마다 JSONL 한 줄씩 바로 기록 (중간에 끊겨도 완료분은 보존)
+- 재시작 시 출력 파일에 status 가 ok 로 기록된 id 는 건너뜀 (resume, 오류/좌표 없음은 다시 시도)
+- --parquet 폴더를 주면 경로 요약 + 구간별 테이블을 Parquet 으로 함께 누적 저장
+"""
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dotenv import load_dotenv
+
+from modules.pipeline import create_resources, run_analysis
+from modules.result_cache import make_key
+from modules.result_writer import ResultWriter
+
+_RES = None  # 워커별 리소스 (프로세스 풀이면 프로세스마다 1번 생성)
+PARQUET_FLUSH_RECORDS = 200  # Parquet 사용 시 이 건수마다 파일로 기록한 뒤 JSONL 에 완료 표시
+
+def _init_worker(keys):
+    global _RES
+    _RES = create_resources(**keys)
+
+def load_pairs(path):
+    """CSV / JSONL 에서 OD 목록 읽기 -> [{'id', 'origin', 'destination', 'vehicle'}]"""
+    pairs = []
+    with open(path, encoding="utf-8-sig") as f:
+        if path.endswith(".jsonl") or path.endswith(".json"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+
+    for row in rows:
+        origin, dest = row.get('origin'), row.get('destination')
+        if not origin or not dest: continue
+        vehicle = str(row.get('vehicle') or "2")
+        pair_id = row.get('id') or make_key(origin.strip(), dest.strip(), vehicle)[:16]
+        pairs.append({'id': str(pair_id), 'origin': origin, 'destination': dest, 'vehicle': vehicle})
+    return pairs
+
+def load_done_ids(out_path):
+    """
+    성공(status == "ok")으로 기록된 id 목록 (resume 용)
+    오류 / 좌표 없음은 일시적인 API 장애일 수 있으므로 다음 실행에서 다시 시도
+    (같은 id 가 여러 줄이면 마지막 줄이 최신 결과)
+    """
+    done = set()
+    if not os.path.exists(out_path): return done
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if record.get('status') == "ok": done.add(record['id'])
+            except (ValueError, KeyError, AttributeError):
+                continue  # 쓰다가 끊긴 마지막 줄은 무시
+    return done
+
+def analyze_pair(pair, with_segments=False):
+    """
+    OD 1건 분석 -> 요약 레코드 (구간 데이터는 제외하고 경로별 합계만)
+    with_segments=True 면 Parquet 저장용 구간 데이터를 record['_segments'] 에 함께 담음
+    """
+    started = time.perf_counter()
+    record = {'id': pair['id'], 'origin': pair['origin'], 'destination': pair['destination'],
+              'vehicle': pair['vehicle'], 'analyzed_at': datetime.now().isoformat(timespec='seconds')}
+    try:
+        my_car = _RES['v_db'].get_vehicle_spec(pair['vehicle'])
+        result = run_analysis(pair['origin'], pair['destination'], my_car, _RES)
+        if not result:
+            record['status'] = "no_coords"
+        else:
+            record['status'] = "ok"
+            record['coords'] = result['coords']
+            record['weather'] = result['weather']
+            record['car'] = result['car_data']['summary']
+            record['events'] = result['car_data']['events']
+            record['pub'] = result['pub_data']
+            if with_segments:
+                record['_segments'] = [(c['label'], c['segments'], c['stats'])
+                                       for c in result['car_data']['collected']]
+    except Exception as e:
+        record['status'] = "error"
+        record['error'] = repr(e)
+    record['elapsed_sec'] = round(time.perf_counter() - started, 3)
+    return record
+
+def write_parquet(writer, record, segments):
+    """결과 1건을 ResultWriter 버퍼에 추가 (버퍼가 차면 part 파일로 기록)"""
+    analyzed_at = datetime.fromisoformat(record['analyzed_at'])
+    for label, segs, stats in segments:
+        writer.add_segments(record['id'], label, segs, analyzed_at)
+        writer.add_summary(record['id'], record['origin'], record['destination'], record['vehicle'],
+                           "Car", label, stats['co2'], stats['time'], stats['dist'],
+                           stats.get('weather_pct'), analyzed_at)
+    for p in record.get('pub', []):
+        writer.add_summary(record['id'], record['origin'], record['destination'], record['vehicle'],
+                           "Public", p['Route'], p['CO2'], p['Time'], p['Dist'], None, analyzed_at)
+
+def run_batch(pairs, out_path, keys, workers=4, rate=None, use_threads=False, parquet_dir=None):
+    """
+    workers: 동시에 실행할 분석 수
+    rate: 초당 시작할 수 있는 최대 분석 수 (API 쿼터 보호, None 이면 제한 없음)
+    parquet_dir: 지정하면 구간별 데이터까지 Parquet 으로 저장
+      -> 결과의 JSONL 줄은 해당 Parquet 행이 파일로 기록된 뒤에 씀
+         (중간에 끊기면 둘 다 없는 상태라 resume 때 다시 분석, Parquet 행이 먼저 기록된 경우 중복 가능)
+    """
+    done = load_done_ids(out_path)
+    todo = [p for p in pairs if p['id'] not in done]
+    print(f"📦 전체 {len(pairs)}건 / 완료 {len(pairs) - len(todo)}건 건너뜀 / 남은 작업 {len(todo)}건")
+    if not todo: return
+
+    out_dir = os.path.dirname(out_path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    if use_threads:
+        # 스레드 풀은 리소스(세션/캐시)를 1벌만 만들어 공유
+        _init_worker(keys)
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(keys,))
+
+    interval = 1.0 / rate if rate else 0
+    finished, failed = 0, 0
+    started = time.perf_counter()
+
+    writer = ResultWriter(parquet_dir) if parquet_dir else None
+    unflushed = []  # Parquet 파일로 아직 기록되지 않은 결과의 JSONL 줄
+
+    with executor as pool, open(out_path, "a", encoding="utf-8") as out:
+        try:
+            pending = set()
+            next_start = time.perf_counter()
+            queue = iter(todo)
+            exhausted = False
+
+            while pending or not exhausted:
+                # 실행 중인 작업이 workers*2 를 넘지 않도록 제출 (메모리 제한 + 속도 제한)
+                while not exhausted and len(pending) < workers * 2:
+                    pair = next(queue, None)
+                    if pair is None:
+                        exhausted = True
+                        break
+                    delay = next_start - time.perf_counter()
+                    if delay > 0: time.sleep(delay)
+                    next_start = max(next_start, time.perf_counter()) + interval
+                    pending.add(pool.submit(analyze_pair, pair, writer is not None))
+
+                if not pending: break
+                completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    record = future.result()
+                    segments = record.pop('_segments', None)
+                    line = json.dumps(record, ensure_ascii=False) + "\n"
+                    if writer is None:
+                        out.write(line)
+                    else:
+                        if segments is not None:
+                            write_parquet(writer, record, segments)
+                        unflushed.append(line)
+                        if len(unflushed) >= PARQUET_FLUSH_RECORDS or not writer.buffered_rows:
+                            writer.flush()
+                            out.writelines(unflushed)
+                            unflushed.clear()
+                    out.flush()
+                    finished += 1
+                    if record['status'] != "ok": failed += 1
+
+                elapsed = time.perf_counter() - started
+                print(f"   ✅ {finished}/{len(todo)} 완료 (실패 {failed}) | {finished / elapsed:.2f}건/s")
+        finally:
+            # 오류 / Ctrl-C 로 끊겨도 모아 둔 Parquet 행을 기록하고 그 결과들의 JSONL 줄을 씀
+            if writer is not None:
+                writer.close()
+                out.writelines(unflushed)
+                out.flush()
+
+    if writer is not None:
+        print(f"💾 Parquet 저장 완료: {parquet_dir} (파일 {len(writer.files_written)}개)")
+    print(f"💾 결과 저장 완료: {out_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="OD 목록 일괄 탄소 배출량 분석")
+    parser.add_argument("input", help="OD 목록 파일 (.csv / .jsonl)")
+    parser.add_argument("-o", "--output", default="data/batch_result.jsonl", help="결과 JSONL 경로")
+    parser.add_argument("--workers", type=int, default=4, help="동시 분석 수")
+    parser.add_argument("--rate", type=float, default=None, help="초당 최대 분석 시작 수")
+    parser.add_argument("--threads", action="store_true", help="프로세스 대신 스레드 풀 사용")
+    parser.add_argument("--parquet", default=None, help="구간별 데이터를 저장할 Parquet 폴더 (예: data/parquet)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    keys = {
+        "kakao_key": os.getenv("KAKAO_API_KEY"),
+        "google_key": os.getenv("GOOGLE_API_KEY"),
+        "odsay_key": os.getenv("ODSAY_API_KEY"),
+        "weather_key": os.getenv("OPENWEATHER_API_KEY"),
+        "dem_dir": os.getenv("DEM_TILE_DIR")
+    }
+
+    pairs = load_pairs(args.input)
+    if not pairs:
+        print("❌ 분석할 OD 데이터가 없습니다. (origin, destination 컬럼 확인)")
+        sys.exit(1)
+
+    run_batch(pairs, args.output, keys, workers=args.workers, rate=args.rate,
+              use_threads=args.threads, parquet_dir=args.parquet)
+
+if __name__ == "__main__":
+    main()
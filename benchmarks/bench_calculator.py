@@ -0,0 +1,57 @@
+"""
+[벤치마크] CarbonCalculator 스칼라 경로 vs 배열(NumPy) 경로 비교
+
+실행: python -m benchmarks.bench_calculator [구간수 ...]
+- 기본값으로 1만 / 100만 구간을 합성해서 차종(ICE/HEV/EV)별 시간과 속도 향상을 출력
+- 두 경로의 구간별 배출량이 완전히 같은지도 함께 확인
+"""
+import sys
+import time
+import numpy as np
+
+from modules.calculator import CarbonCalculator
+from modules.vehicle_db import VehicleDB
+
+def make_segments(n, seed=0):
+    rng = np.random.default_rng(seed)
+    speed = rng.choice([0, 5, 15, 30, 45, 60, 80, 100, 110], size=n).astype(float)
+    cols = {
+        "distance_m": rng.uniform(20, 130, n),
+        "speed_kph": speed,
+        "grade_pct": rng.uniform(-15, 15, n),
+        "delta_v": rng.uniform(-60, 60, n),
+        "congestion": rng.integers(0, 5, n).astype(float)
+    }
+    segments = [
+        {"distance_m": d, "speed_kph": s, "grade_pct": g, "delta_v": dv, "congestion": c}
+        for d, s, g, dv, c in zip(*(cols[k].tolist() for k in
+                                    ("distance_m", "speed_kph", "grade_pct", "delta_v", "congestion")))
+    ]
+    return segments, cols
+
+def run(n):
+    calc = CarbonCalculator()
+    segments, cols = make_segments(n)
+    weather = {'temp': 31.0, 'humidity': 75, 'is_wet': True}
+
+    print(f"\n📏 구간 수: {n:,}")
+    for key in ("2", "5", "6"):
+        spec = VehicleDB().get_vehicle_spec(key)
+
+        t0 = time.perf_counter()
+        scalar_total, _ = calc.calculate(segments, weather, spec)
+        t_scalar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        array_total, _, steps = calc.calculate_array(cols, weather, spec)
+        t_array = time.perf_counter() - t0
+
+        same = scalar_total == array_total and all(
+            seg['step_emission'] == round(x, 2) for seg, x in zip(segments, steps.tolist()))
+        print(f"   {spec['type']:>3} | 스칼라 {t_scalar:8.3f}s | 배열 {t_array:8.4f}s | "
+              f"x{t_scalar / t_array:6.1f} | {n / t_array:14,.0f} seg/s | 결과 일치: {same}")
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or [10_000, 1_000_000]
+    for n in sizes:
+        run(n)
@@ -0,0 +1,76 @@
+"""
+[벤치마크] run_analysis 전체 흐름을 네트워크 없이 측정 (로컬 대역 API 서버 사용)
+
+실행: python -m benchmarks.bench_pipeline [--pairs 5] [--latency-ms 50] [--error-rate 0.02]
+      python -m benchmarks.bench_pipeline --replay data/fixtures   (녹화된 응답만으로 실행)
+- 매 실행마다 임시 data 폴더를 써서 캐시 없이(cold) 1번, 같은 OD를 다시(warm) 1번 측정
+- API 키 없이 동작 (합성 응답은 요청 파라미터로 시드를 정하므로 실행마다 결과가 같음)
+"""
+import time
+import tempfile
+import argparse
+
+from modules import http_client
+from modules.pipeline import create_resources, run_analysis
+from modules.stub_server import StubApiServer
+
+OD_PAIRS = [
+    ("경기 수원시 팔달구 덕영대로 924", "서울 강남구 강남대로 396"),
+    ("서울 중구 세종대로 110", "서울 송파구 올림픽로 300"),
+    ("인천 남동구 정각로 29", "서울 영등포구 의사당대로 1"),
+    ("경기 성남시 분당구 판교역로 166", "서울 종로구 종로 1"),
+    ("경기 고양시 일산동구 중앙로 1036", "서울 마포구 월드컵북로 400"),
+]
+OFFLINE_KEYS = {"kakao_key": "offline", "google_key": "offline", "odsay_key": "offline", "weather_key": "offline"}
+
+def run_pairs(pairs, res, my_car):
+    results, elapsed = [], []
+    for start, end in pairs:
+        t0 = time.perf_counter()
+        results.append(run_analysis(start, end, my_car, res))
+        elapsed.append(time.perf_counter() - t0)
+    return results, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="run_analysis 오프라인 벤치마크")
+    parser.add_argument("--pairs", type=int, default=len(OD_PAIRS))
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--replay", default=None, help="녹화된 응답 폴더 (지정하면 서버 없이 재생)")
+    args = parser.parse_args()
+
+    server = None
+    if args.replay:
+        http_client.configure(mode="replay", fixture_dir=args.replay)
+        print(f"📼 재생 모드: {args.replay}")
+    else:
+        server = StubApiServer(port=0, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate)
+        http_client.configure(stub_url=server.start())
+        print(f"🧪 대역 서버: {server.url} (지연 {args.latency_ms}±{args.jitter_ms}ms, 오류율 {args.error_rate:.0%})")
+
+    pairs = (OD_PAIRS * (args.pairs // len(OD_PAIRS) + 1))[:args.pairs]
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            res = create_resources(data_dir=data_dir, **OFFLINE_KEYS)
+            my_car = res['v_db'].get_vehicle_spec("2")
+
+            for phase in ("cold", "warm"):
+                results, elapsed = run_pairs(pairs, res, my_car)
+                ok = sum(1 for r in results if r and r['car_data']['collected'])
+                print(f"   {phase:>4} | {len(pairs)}건 (성공 {ok}) | 합계 {sum(elapsed):7.3f}s | "
+                      f"평균 {sum(elapsed) / len(elapsed) * 1000:8.1f}ms | 최대 {max(elapsed) * 1000:8.1f}ms")
+    finally:
+        if server is not None:
+            server.stop()
+            print(f"📊 서버 통계: {server.stats}")
+        if args.replay:
+            print(f"📊 재생 통계: {http_client.get_fixture_stats()}")
+
+    for host, s in sorted(http_client.get_stats().items()):
+        avg = s['total_ms'] / s['calls'] if s['calls'] else 0
+        print(f"   {host:<32} 호출 {s['calls']:>4} | 오류 {s['errors']:>3} | 재시도 {s['retries']:>3} | 평균 {avg:7.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+[벤치마크] 선형 단순화(Douglas-Peucker) 켜기 전/후 비교
+
+실행: python -m benchmarks.bench_simplify [--km 5 50 400] [--tolerance 1 3 10] [--repeat 3]
+- 시나리오마다 합성 경로 3개를 process_routes 로 처리하면서 허용 오차별로
+  정점 감소율 / 처리 시간(CPU) / 고도 조회 좌표 수 / 구간 수 / 총 거리 오차를 출력
+- 도로별 길이 오차가 DataProcessor.SIMPLIFY_MAX_LENGTH_ERROR 이내인지도 함께 확인
+"""
+import io
+import time
+import argparse
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from modules.processor import DataProcessor, simplify_polyline, haversine_np, round_coords
+from benchmarks.synthetic import make_route, SyntheticElevation
+
+class CountingElevation(SyntheticElevation):
+    """조회한 좌표 수까지 세는 합성 고도 provider"""
+
+    def __init__(self):
+        super().__init__()
+        self.points = 0
+
+    def get_elevations_bulk(self, coords_list):
+        self.points += len(coords_list)
+        return super().get_elevations_bulk(coords_list)
+
+def _road_length(lat, lon):
+    return float(np.sum(haversine_np(lat[:-1], lon[:-1], lat[1:], lon[1:])))
+
+def max_road_length_error(routes, tolerance_m):
+    """도로별 (원래 길이 - 단순화 후 길이) / 원래 길이 의 최댓값"""
+    worst = 0.0
+    for route in routes:
+        for section in route['sections']:
+            for road in section['roads']:
+                flat = np.asarray(road['vertexes'], dtype=np.float64).reshape(-1, 2)
+                lat, lon = round_coords(flat[:, 1]), round_coords(flat[:, 0])
+                full = _road_length(lat, lon)
+                if full <= 0: continue
+                keep = simplify_polyline(lat, lon, tolerance_m, DataProcessor.SIMPLIFY_MAX_LENGTH_ERROR)
+                worst = max(worst, (full - _road_length(lat[keep], lon[keep])) / full)
+    return worst
+
+def run_once(routes, tolerance_m):
+    elevation = CountingElevation()
+    processor = DataProcessor(elevation, simplify_tolerance_m=tolerance_m)
+    with redirect_stdout(io.StringIO()):
+        t0 = time.process_time()
+        tables = processor.process_routes(routes)
+        cpu = time.process_time() - t0
+    return {
+        "cpu": cpu,
+        "points": elevation.points,
+        "segments": sum(len(t) for t in tables),
+        "dist": sum(float(t.column('distance_m').sum()) for t in tables),
+        "vertices": processor.simplify_stats['vertices_out'] if tolerance_m > 0 else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="선형 단순화 전/후 비교")
+    parser.add_argument("--km", type=float, nargs="+", default=[5, 50, 400])
+    parser.add_argument("--tolerance", type=float, nargs="+", default=[1, 3, 10], help="허용 오차(m)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (CPU 시간은 최솟값)")
+    args = parser.parse_args()
+
+    for km in args.km:
+        km = int(km) if float(km).is_integer() else km
+        routes = [make_route(km, seed=seed) for seed in range(3)]
+        n_vertices = sum(len(road['vertexes']) // 2 for route in routes
+                         for section in route['sections'] for road in section['roads'])
+        print(f"\n📏 {km}km 경로 {len(routes)}개 (정점 {n_vertices:,}개)")
+        print(f"   {'허용오차':>8} {'정점':>9} {'감소율':>7} {'CPU':>9} {'고도 좌표':>9} {'구간':>7} "
+              f"{'총거리 오차':>10} {'도로별 최대':>10}")
+
+        base = None
+        for tol in [0] + args.tolerance:
+            runs = [run_once(routes, tol) for _ in range(args.repeat)]
+            r = min(runs, key=lambda x: x['cpu'])
+            if base is None: base = r
+            vertices = r['vertices'] if tol > 0 else n_vertices
+            dist_err = (base['dist'] - r['dist']) / base['dist'] if base['dist'] else 0.0
+            road_err = max_road_length_error(routes, tol) if tol > 0 else 0.0
+            print(f"   {tol:>7g}m {vertices:>9,} {1 - vertices / n_vertices:>7.1%} "
+                  f"{r['cpu'] * 1000:>7.1f}ms {r['points']:>9,} {r['segments']:>7,} "
+                  f"{dist_err:>10.3%} {road_err:>10.3%}")
+            if road_err > DataProcessor.SIMPLIFY_MAX_LENGTH_ERROR:
+                print(f"   ⚠️ 도로 길이 오차가 상한({DataProcessor.SIMPLIFY_MAX_LENGTH_ERROR:.1%})을 넘었습니다")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+[벤치마크 모음] 합성 경로로 처리 파이프라인 단계별 처리량 / 최대 메모리 측정 + 기준값 대비 회귀 검사
+
+실행: python -m benchmarks.bench_suite                       (기본 시나리오, 저장소의 baseline.json 과 비교)
+      python -m benchmarks.bench_suite --save-baseline       (현재 결과를 기준값으로 저장, 3회 측정의 중앙값)
+      python -m benchmarks.bench_suite --km 5 400 --repeat 5 --threshold 0.3
+
+- 시나리오: 5km 도심 / 50km 혼합 / 400km 고속도로 (--km 로 변경, 거리로 도로 유형 자동 선택)
+- 단계: process_route, 중앙값/이동평균 필터, calculate, calculate_weather_impact,
+        PublicTransportCalculator.calculate, 정적(matplotlib)/대화형(plotly) 그래프
+- 시간은 repeat 회 중 최솟값, 메모리는 tracemalloc 으로 따로 1회 측정 (측정 오버헤드가 시간에 섞이지 않게)
+- 기준값보다 threshold(기본 50%) 이상 느려지거나 메모리가 늘면 회귀로 표시하고 종료 코드 1 (CI 에서 사용)
+  느려진 단계는 최대 CONFIRM_ROUNDS 번 다시 재서 최솟값으로 판단 (공유 머신의 일시적인 흔들림 제외)
+  기준값 파일이 없어도 종료 코드 1 (기준값은 측정한 머신 기준이므로 환경이 바뀌면 --save-baseline 으로 다시 저장)
+"""
+import gc
+import io
+import os
+import sys
+import json
+import time
+import warnings
+import platform
+import tempfile
+import argparse
+import tracemalloc
+from datetime import datetime
+from contextlib import redirect_stdout
+
+import matplotlib
+matplotlib.use("Agg")  # 화면 없이 이미지 렌더링
+
+import numpy as np
+
+from modules.processor import DataProcessor
+from modules.calculator import CarbonCalculator
+from modules.calculator_pub import PublicTransportCalculator
+from modules.vehicle_db import VehicleDB
+from modules.visualizer import draw_comparison_graph, create_interactive_graph
+from benchmarks.synthetic import make_route, make_transit_path, SyntheticElevation
+
+DEFAULT_KM = [5, 50, 400]
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+WEATHER = {'temp': 31.0, 'humidity': 75, 'condition': 'Rain', 'is_wet': True}
+TRANSIT_PATHS = 200  # 대중교통 계산 단계에서 한 번에 계산할 경로 수
+MIN_SAMPLE_SEC = 0.05  # 1ms 미만 단계는 여러 번 묶어서 재야 흔들림이 줄어듦
+MIN_MEM_DELTA_MB = 0.25  # 이보다 작은 메모리 변화는 회귀로 보지 않음
+MIN_TIME_DELTA_SEC = 0.0005  # 이보다 작은 시간 변화도 회귀로 보지 않음 (1ms 미만 단계는 캐시 상태에 따라 크게 흔들림)
+CONFIRM_ROUNDS = 5  # 기준값보다 느리게 나온 단계를 다시 재는 최대 횟수
+
+def measure(fn, repeat):
+    """
+    (1회 최소 실행 시간 초, 최대 메모리 MB) - 단계 안의 print 출력 / 폰트 경고는 버림
+    timeit 처럼 1회 측정 묶음이 MIN_SAMPLE_SEC 이상이 되도록 반복 횟수(number)를 늘려서 잼
+    (timeit 처럼 시간 측정 중에는 GC 를 꺼서 앞 시나리오가 남긴 객체 수에 따라 흔들리지 않게)
+    """
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    with warnings.catch_warnings(), redirect_stdout(io.StringIO()):
+        warnings.simplefilter("ignore")
+        gc.collect()
+        gc.disable()
+        try:
+            number = 1
+            while True:
+                t0 = time.perf_counter()
+                for _ in range(number): fn()
+                elapsed = time.perf_counter() - t0
+                if elapsed >= MIN_SAMPLE_SEC or number >= 10_000: break
+                number *= 10 if elapsed < MIN_SAMPLE_SEC / 10 else 2
+            best = elapsed / number
+
+            for _ in range(repeat - 1):
+                t0 = time.perf_counter()
+                for _ in range(number): fn()
+                best = min(best, (time.perf_counter() - t0) / number)
+        finally:
+            if gc_was_enabled: gc.enable()
+
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak / 1024 / 1024
+
+def build_stages(km, tmp_dir):
+    """시나리오 1개의 단계 목록 [(이름, 함수, 처리 단위 수, 단위)]"""
+    processor = DataProcessor(SyntheticElevation())
+    calc = CarbonCalculator()
+    pub_calc = PublicTransportCalculator()
+    my_car = VehicleDB().get_vehicle_spec("2")
+
+    routes = [make_route(km, seed=seed) for seed in range(3)]
+    with redirect_stdout(io.StringIO()):
+        all_segments = processor.process_routes(routes)
+
+    segments = all_segments[0]
+    elevations = [seg['start_alt'] for seg in segments]
+    transit_paths = [make_transit_path(km, seed) for seed in range(TRANSIT_PATHS)]
+
+    collected = []
+    for idx, (route, segs) in enumerate(zip(routes, all_segments)):
+        co2, _, w_pct = calc.calculate_weather_impact(segs, WEATHER, my_car)
+        stats = {'dist': sum(s['distance_m'] for s in segs) / 1000,
+                 'time': route['summary']['duration'] / 60, 'co2': co2, 'weather_pct': w_pct}
+        collected.append({'segments': segs, 'label': f"경로{idx + 1}", 'stats': stats, 'id': idx + 1})
+    n_plot = sum(len(c['segments']) for c in collected)
+    png_path = os.path.join(tmp_dir, f"bench_{km}km.png")
+
+    return [
+        ("process_route", lambda: processor.process_route(routes[0]), len(segments), "seg"),
+        ("median_filter", lambda: processor.apply_median_filter(elevations), len(elevations), "pt"),
+        ("moving_average", lambda: processor.apply_moving_average(elevations), len(elevations), "pt"),
+        ("calculate", lambda: calc.calculate(segments, WEATHER, my_car), len(segments), "seg"),
+        ("weather_impact", lambda: calc.calculate_weather_impact(segments, WEATHER, my_car), len(segments), "seg"),
+        ("pub_calculate", lambda: [pub_calc.calculate(p, 35.0) for p in transit_paths], TRANSIT_PATHS, "path"),
+        ("graph_static", lambda: draw_comparison_graph(collected, "출발", "도착", png_path), n_plot, "seg"),
+        ("graph_interactive", lambda: create_interactive_graph(collected), n_plot, "seg"),
+    ]
+
+def time_limit(base, threshold):
+    """회귀로 보지 않는 최대 시간 = 기준값 * (1 + threshold) (최소 MIN_TIME_DELTA_SEC 증가까지는 허용)"""
+    return max(base['sec'] * (1 + threshold), base['sec'] + MIN_TIME_DELTA_SEC)
+
+def run_suite(km_list, repeat, baseline=None, threshold=0.5):
+    """baseline 이 있으면 기준값보다 threshold 이상 느리게 나온 단계만 다시 재서 최솟값을 사용"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for km in km_list:
+            scenario = f"{km}km"
+            results[scenario] = {}
+            stages = build_stages(km, tmp_dir)
+            print(f"\n📏 시나리오 {scenario} (구간 {stages[0][2]:,}개)")
+            for name, fn, count, unit in stages:
+                sec, peak_mb = measure(fn, repeat)
+                base = (baseline or {}).get("results", {}).get(scenario, {}).get(name)
+                for _ in range(CONFIRM_ROUNDS):
+                    if not base or sec <= time_limit(base, threshold): break
+                    sec = min(sec, measure(fn, repeat)[0])
+                rate = count / sec if sec > 0 else float("inf")
+                results[scenario][name] = {"sec": sec, "rate": rate, "unit": unit, "peak_mb": peak_mb}
+                print(f"   {name:<18} {sec * 1000:10.2f}ms | {rate:14,.0f} {unit}/s | 최대 메모리 {peak_mb:8.2f}MB")
+    return results
+
+def median_results(runs):
+    """run_suite 를 여러 번 돌린 결과 -> 단계별 중앙값 (빨랐던 1회가 기준값이 되지 않도록)"""
+    merged = {}
+    for scenario, stages in runs[0].items():
+        merged[scenario] = {}
+        for name, first in stages.items():
+            merged[scenario][name] = {key: float(np.median([run[scenario][name][key] for run in runs]))
+                                      for key in ("sec", "rate", "peak_mb")}
+            merged[scenario][name]['unit'] = first['unit']
+    return merged
+
+def compare(results, baseline, threshold):
+    """기준값 대비 회귀 목록 [(시나리오, 단계, 항목, 기준값, 현재값)]"""
+    regressions = []
+    print(f"\n📊 기준값 대비 (기준 작성: {baseline.get('meta', {}).get('created', '?')}, 허용 {threshold:.0%})")
+    for scenario, stages in results.items():
+        base_stages = baseline.get("results", {}).get(scenario)
+        if not base_stages: continue
+        for name, cur in stages.items():
+            base = base_stages.get(name)
+            if not base: continue
+            d_time = cur['sec'] / base['sec'] - 1 if base['sec'] else 0
+            d_mem = cur['peak_mb'] / base['peak_mb'] - 1 if base['peak_mb'] else 0
+            flag = ""
+            if cur['sec'] > time_limit(base, threshold):
+                regressions.append((scenario, name, "time", base['sec'], cur['sec']))
+                flag = " ⚠️ 느려짐"
+            if d_mem > threshold and cur['peak_mb'] - base['peak_mb'] > MIN_MEM_DELTA_MB:
+                regressions.append((scenario, name, "memory", base['peak_mb'], cur['peak_mb']))
+                flag += " ⚠️ 메모리 증가"
+            print(f"   {scenario:>6} {name:<18} 시간 {d_time:+7.1%} | 메모리 {d_mem:+7.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="처리 파이프라인 벤치마크 모음")
+    parser.add_argument("--km", type=float, nargs="+", default=DEFAULT_KM, help="시나리오 경로 길이(km)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--baseline-runs", type=int, default=3, help="기준값 저장 시 전체 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="회귀로 볼 증가 비율")
+    args = parser.parse_args()
+
+    km_list = [int(km) if float(km).is_integer() else km for km in args.km]
+    if args.save_baseline:
+        results = median_results([run_suite(km_list, args.repeat) for _ in range(max(args.baseline_runs, 1))])
+        meta = {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                "numpy": np.__version__, "machine": platform.platform(), "repeat": args.repeat,
+                "runs": max(args.baseline_runs, 1)}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준값 저장: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\n❌ 기준값 파일이 없습니다: {args.baseline} (--save-baseline 으로 먼저 저장)")
+        sys.exit(1)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    results = run_suite(km_list, args.repeat, baseline, args.threshold)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ 회귀 {len(regressions)}건")
+        for scenario, name, kind, base, cur in regressions:
+            print(f"   - {scenario} {name} ({kind}): {base:.4f} -> {cur:.4f}")
+        sys.exit(1)
+    else:
+        print("\n✅ 회귀 없음")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+[합성 데이터] 벤치마크용 카카오 길찾기 형식 경로 / ODsay 경로 / 고도 provider
+
+- make_route(km, profile): sections/roads/vertexes + traffic_speed/traffic_state 를 가진 경로 JSON
+  urban(도심: 짧은 도로, 촘촘한 좌표, 저속/정체) / highway(고속도로: 긴 도로, 성긴 좌표, 고속, 터널)
+  mixed(둘을 섞음) / auto(거리로 자동 선택: 10km 이하 urban, 200km 이상 highway)
+- 같은 (km, profile, seed) 는 항상 같은 경로
+"""
+import math
+import random
+
+from modules.stub_server import synth_elevation
+
+PROFILES = {
+    "urban": {
+        "names": ["덕영대로", "강남대로", "테헤란로", "세종대로", "일반도로", "한남대교"],
+        "road_m": (50, 400), "vertex_m": (5, 25), "speeds": [0, 10, 15, 25, 35, 50],
+        "states": [1, 2, 3, 4], "limit": 50, "turn": 0.35
+    },
+    "highway": {
+        "names": ["경부고속도로", "영동고속도로", "서해안고속도로", "수원IC", "남산터널", "죽령터널"],
+        "road_m": (1000, 8000), "vertex_m": (30, 200), "speeds": [70, 80, 90, 100, 110],
+        "states": [1, 1, 1, 2], "limit": 100, "turn": 0.05
+    },
+}
+
+def _pick_profile(profile, km, rnd):
+    if profile == "auto":
+        profile = "urban" if km <= 10 else "highway" if km >= 200 else "mixed"
+    if profile == "mixed":
+        return PROFILES["urban"] if rnd.random() < 0.3 else PROFILES["highway"]
+    return PROFILES[profile]
+
+def make_route(km=20, profile="auto", seed=0):
+    """합성 카카오 경로 (route 1개: {'summary', 'sections': [{'roads': [...]}]})"""
+    if profile not in ("auto", "mixed") and profile not in PROFILES:
+        raise ValueError(f"알 수 없는 profile: {profile}")
+    rnd = random.Random(f"{km}-{profile}-{seed}")
+    lat, lon = 37.26, 127.02
+    heading = rnd.uniform(0, 2 * math.pi)
+
+    roads, total_m, total_sec = [], 0.0, 0.0
+    while total_m < km * 1000:
+        p = _pick_profile(profile, km, rnd)
+        road_len = min(rnd.uniform(*p['road_m']), km * 1000 - total_m + 1)
+        vertexes = [lon, lat]
+        length = 0.0
+        while length < road_len:
+            step = rnd.uniform(*p['vertex_m'])
+            heading += rnd.uniform(-p['turn'], p['turn'])
+            lat += step * math.cos(heading) / 111000
+            lon += step * math.sin(heading) / 88000
+            vertexes += [round(lon, 7), round(lat, 7)]
+            length += step
+
+        speed = rnd.choice(p['speeds'])
+        state = rnd.choice(p['states']) if speed else 4
+        roads.append({"name": rnd.choice(p['names']), "distance": int(length),
+                      "traffic_speed": speed, "limit_speed": p['limit'], "traffic_state": state,
+                      "vertexes": vertexes})
+        total_m += length
+        total_sec += length / (max(speed, 5) / 3.6)
+
+    return {"summary": {"distance": int(total_m), "duration": int(total_sec)},
+            "sections": [{"distance": int(total_m), "duration": int(total_sec), "roads": roads}]}
+
+def make_transit_path(km=20, seed=0):
+    """합성 ODsay 경로 1개 (도보-버스-지하철-...-도보, 거리에 비례해 환승 수 증가)"""
+    rnd = random.Random(f"transit-{km}-{seed}")
+    n_legs = max(1, min(6, int(km // 15) + 1))
+    ride_m = max(500, (km * 1000 - 800) / n_legs)
+    sub_path = [{"trafficType": 3, "distance": 400}]
+    for _ in range(n_legs):
+        if rnd.random() < 0.5:
+            sub_path.append({"trafficType": 1, "distance": ride_m,
+                             "lane": [{"name": f"수도권 {rnd.randint(1, 9)}호선"}]})
+        else:
+            sub_path.append({"trafficType": 2, "distance": ride_m,
+                             "lane": [{"busNo": str(rnd.randint(100, 9999)), "type": rnd.choice([1, 11, 12])}]})
+        sub_path.append({"trafficType": 3, "distance": 150})
+    sub_path[-1]['distance'] = 400
+    total_m = sum(s['distance'] for s in sub_path)
+    return {"info": {"totalDistance": total_m, "totalTime": int(total_m / 400)}, "subPath": sub_path}
+
+class SyntheticElevation:
+    """네트워크 없는 고도 provider (get_elevations_bulk 만 구현, 같은 좌표는 항상 같은 고도)"""
+    use_mock = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_elevations_bulk(self, coords_list):
+        self.calls += 1
+        return [synth_elevation(lat, lon) for lat, lon in coords_list]
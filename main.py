@@ -6,12 +6,18 @@ from dotenv import load_dotenv
 # --- 모듈 임포트 ---
 # 1. 승용차 & 분석 모듈
 from modules.api_kakao import KakaoNavi
+from modules.geocode_cache import GeocodeCache
 from modules.api_google import GoogleElevation
+from modules.elevation_cache import CachedElevation
+from modules.elevation_dem import DEMElevation
 from modules.processor import DataProcessor
 from modules.calculator import CarbonCalculator
 from modules.visualizer import draw_comparison_graph 
 from modules.api_weather import WeatherAPI
 from modules.vehicle_db import VehicleDB
+from modules.result_writer import ResultWriter
+from modules import http_client, metrics
+from modules.pipeline import register_cache_metrics
 
 # 2. 대중교통 모듈
 from modules.api_odsay import ODsayClient
@@ -24,17 +30,25 @@ def main():
     GOOGLE_KEY = os.getenv("GOOGLE_API_KEY")
     ODSAY_KEY = os.getenv("ODSAY_API_KEY")
     OPENWEATHER_KEY = os.getenv("OPENWEATHER_API_KEY")
+    DEM_TILE_DIR = os.getenv("DEM_TILE_DIR")
+    # 오프라인 실험: HTTP_REPLAY=record/replay, HTTP_STUB_URL=로컬 대역 서버 주소
+    http_client.configure_from_env()
+    # METRICS=1 이면 단계별 소요 시간 / API / 캐시 통계를 모아서 마지막에 출력 + 저장
+    metrics.configure_from_env()
 
     # 2. 인스턴스 초기화
-    kakao = KakaoNavi(KAKAO_KEY)
-    google = GoogleElevation(GOOGLE_KEY, use_mock=False)
-    processor = DataProcessor(google)
+    kakao = KakaoNavi(KAKAO_KEY, geocode_cache=GeocodeCache(db_path="data/geocode_cache.sqlite"))
+    google = CachedElevation(GoogleElevation(GOOGLE_KEY, use_mock=False))
+    # DEM 타일 폴더가 있으면 오프라인 고도 우선 사용 (타일 밖 지역만 구글 조회)
+    elevation = DEMElevation(DEM_TILE_DIR, fallback=google) if DEM_TILE_DIR else google
+    processor = DataProcessor(elevation)
     car_calculator = CarbonCalculator()
     weather_api = WeatherAPI(OPENWEATHER_KEY)
     vehicle_db = VehicleDB()
     
     odsay = ODsayClient(ODSAY_KEY)
     pub_calculator = PublicTransportCalculator()
+    register_cache_metrics(google, kakao.geocode_cache)
 
     print("\n" + "=" * 70)
     print("      🌍 [졸업연구] 통합 탄소 배출량 분석 시스템 (Car vs Public)")
@@ -61,8 +75,9 @@ def main():
 
     # 4. 좌표 변환
     print(f"\n🔍 주소 변환 중...")
-    sx, sy = kakao.get_coords(start_addr)
-    ex, ey = kakao.get_coords(end_addr)
+    with metrics.span("geocode"):
+        sx, sy = kakao.get_coords(start_addr)
+        ex, ey = kakao.get_coords(end_addr)
 
     if not sx or not ex:
         print("\n❌ 주소 변환에 실패했습니다. 올바른 주소를 입력해주세요.")
@@ -70,7 +85,8 @@ def main():
 
     # 5. 날씨 정보 조회 (출발지 기준)
     print(f"\n🌦️ [Step 3] 현재 기상 상태 확인 중...")
-    weather_info = weather_api.get_weather(sy, sx)
+    with metrics.span("weather"):
+        weather_info = weather_api.get_weather(sy, sx)
     print(f"   >>> 기온: {weather_info['temp']}°C | 습도: {weather_info['humidity']}% | 상태: {weather_info['condition']}")
     
     if weather_info['is_wet']: 
@@ -83,7 +99,8 @@ def main():
     # ==========================================
     print(f"\n[1] 🚗 승용차 경로 분석 중... ({start_addr} -> {end_addr})")
     
-    car_routes = kakao.get_multi_routes(start_addr, end_addr)
+    with metrics.span("routing"):
+        car_routes = kakao.get_multi_routes((sx, sy), (ex, ey))
     car_results = [] 
     
     global_avg_car_speed = None 
@@ -92,23 +109,25 @@ def main():
 
     if car_routes:
         print(f"   ✅ 총 {len(car_routes)}개의 승용차 경로를 발견했습니다.")
+
+        # (1) 데이터 처리 (100m 리샘플링 + 10% 경사 제한)
+        # 모든 경로의 고도를 한 번에 조회 (겹치는 구간 중복 요청 제거)
+        all_segments = processor.process_routes(car_routes)
         
-        for idx, route in enumerate(car_routes):
+        for idx, (route, segments) in enumerate(zip(car_routes, all_segments)):
             strategy = route.get('strategy_label', '일반')
             print(f"   >>> 승용차 경로 {idx+1} [{strategy}] 정밀 분석 중...")
             
-            # (1) 데이터 처리 (100m 리샘플링 + 10% 경사 제한)
-            segments = processor.process_route(route)
-            
             if not segments:
                 print("      ⚠️ 유효한 구간 데이터가 없습니다. 건너뜁니다.")
                 continue
             
             # (2) 탄소 배출량 계산 (VSP + 날씨 + 차량스펙)
             # calculate_weather_impact 함수 내부에서 vehicle_spec을 사용하도록 전달
-            total_co2, add_g, weather_pct = car_calculator.calculate_weather_impact(
-                segments, weather_info, vehicle_spec=my_car
-            )
+            with metrics.span("calculation"):
+                total_co2, add_g, weather_pct = car_calculator.calculate_weather_impact(
+                    segments, weather_info, vehicle_spec=my_car
+                )
             
             total_dist = sum(s['distance_m'] for s in segments) / 1000
             
@@ -148,11 +167,22 @@ def main():
             
             print(f"      📊 [{strategy}] 거리: {total_dist:.1f}km | CO2: {total_co2:.0f}g (기상영향: {weather_pct:+.1f}%)")
 
+        # 전 차종 비교 (차종 x 경로 CO2 행렬)
+        if collected_car_data:
+            with metrics.span("fleet_matrix"):
+                matrix = car_calculator.calculate_fleet_matrix(
+                    [d['segments'] for d in collected_car_data], vehicle_db.specs, weather_info)
+            fleet_df = pd.DataFrame(matrix['co2'].round(0), index=matrix['names'],
+                                    columns=[d['label'] for d in collected_car_data])
+            print("\n   🚙 [전 차종 비교] 경로별 CO2 (g)")
+            print(fleet_df.to_string())
+
         # 통합 그래프 생성
         if collected_car_data:
             timestamp = datetime.now().strftime("%H%M%S")
             img_name = f"data/images/car_comparison_{timestamp}.png"
-            draw_comparison_graph(collected_car_data, start_addr, end_addr, img_name)
+            with metrics.span("plotting"):
+                draw_comparison_graph(collected_car_data, start_addr, end_addr, img_name)
 
         # 전체 평균 속도 산출 (버스 패널티용)
         if car_speeds_collector:
@@ -161,6 +191,8 @@ def main():
             if global_avg_car_speed <= 20:
                 print("      ⚠️ 정체 구간 감지! 버스 배출량 계산에 할증이 적용됩니다.")
 
+        print(f"   🗄️ {google.summary()}")
+
     else:
         print("   ⚠️ 승용차 경로를 찾을 수 없습니다.")
 
@@ -170,7 +202,8 @@ def main():
     # ==========================================
     print(f"\n[2] 🚌 대중교통 경로 분석 중... (ODsay API)")
     
-    pub_data = odsay.search_path(sx, sy, ex, ey)
+    with metrics.span("transit_search"):
+        pub_data = odsay.search_path(sx, sy, ex, ey)
     pub_results = []
 
     if pub_data and 'path' in pub_data:
@@ -178,10 +211,11 @@ def main():
         
         for idx, path in enumerate(paths):
             # 대중교통 계산 (승용차 속도 연동)
-            res = pub_calculator.calculate(
-                {"info": path['info'], "subPath": path['subPath']},
-                avg_car_speed=global_avg_car_speed
-            )
+            with metrics.span("transit_calc"):
+                res = pub_calculator.calculate(
+                    {"info": path['info'], "subPath": path['subPath']},
+                    avg_car_speed=global_avg_car_speed
+                )
             
             path_type_name = "복합"
             if path['pathType'] == 1: path_type_name = "지하철"
@@ -246,6 +280,25 @@ def main():
         csv_filename = f"data/final_result_{ts}.csv"
         df.to_csv(csv_filename, index=False, encoding="utf-8-sig")
         print(f"\n💾 상세 분석 결과가 '{csv_filename}'에 저장되었습니다.")
+
+        # 구간별 데이터까지 컬럼형(Parquet)으로 누적 저장 (data/parquet/...)
+        with ResultWriter("data/parquet") as writer:
+            for d in collected_car_data:
+                writer.add_segments(ts, d['label'], d['segments'])
+                writer.add_summary(ts, start_addr, end_addr, my_car['name'], "Car", d['label'],
+                                   d['stats']['co2'], d['stats']['time'], d['stats']['dist'], d['stats']['weather_pct'])
+            for r in pub_results:
+                writer.add_summary(ts, start_addr, end_addr, my_car['name'], "Public", r['Method'],
+                                   r['CO2_g'], r['Time_min'], r['Distance_km'], r['Weather_Impact_pct'])
+        print(f"💾 구간별 데이터가 Parquet 파일 {len(writer.files_written)}개로 저장되었습니다.")
+
+        if metrics.is_enabled():
+            print("\n⏱️ [단계별 소요 시간]")
+            for line in metrics.summary_lines():
+                print(f"   {line}")
+            metrics_file = f"data/metrics_{ts}.prom"
+            metrics.write_prometheus(metrics_file)
+            print(f"💾 계측 스냅샷(Prometheus 형식)이 '{metrics_file}'에 저장되었습니다.")
         print("✨ 프로그램이 성공적으로 종료되었습니다.")
 
 if __name__ == "__main__":
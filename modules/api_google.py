@@ -1,16 +1,126 @@
-import requests
 import random
 import math
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.http_client import HttpTransport
+
+def encode_polyline(points):
+    """
+    구글 Encoded Polyline 알고리즘으로 (lat, lon) 리스트를 문자열로 압축
+    (좌표당 평균 6~10자 -> "lat,lon|" 형식 약 22자 대비 URL 길이 1/3 이하, 정밀도 1e-5도 ≈ 1m)
+    """
+    result = []
+    prev_lat, prev_lon = 0, 0
+    for lat, lon in points:
+        i_lat = int(round(lat * 1e5))
+        i_lon = int(round(lon * 1e5))
+        for delta in (i_lat - prev_lat, i_lon - prev_lon):
+            value = ~(delta << 1) if delta < 0 else (delta << 1)
+            while value >= 0x20:
+                result.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            result.append(chr(value + 63))
+        prev_lat, prev_lon = i_lat, i_lon
+    return "".join(result)
+
+def decode_polyline(encoded):
+    """encode_polyline 의 역변환: 문자열 -> [(lat, lon), ...]"""
+    points = []
+    index, lat, lon = 0, 0, 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift, value = 0, 0
+            while True:
+                b = ord(encoded[index]) - 63
+                index += 1
+                value |= (b & 0x1f) << shift
+                shift += 5
+                if b < 0x20: break
+            deltas.append(~(value >> 1) if value & 1 else value >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / 1e5, lon / 1e5))
+    return points
 
 class GoogleElevation:
-    def __init__(self, api_key, use_mock=False):
+    BASE_URL = "https://maps.googleapis.com/maps/api/elevation/json"
+    MAX_POINTS = 512         # 구글 Elevation API 1회 요청 최대 좌표 수
+    MAX_LOCATION_CHARS = 8000  # locations 파라미터 길이 한도 (URL 16384자 제한 대비 여유)
+
+    def __init__(self, api_key, use_mock=False, max_workers=8, use_polyline=True, chunk_size=50):
+        """
+        max_workers: 동시에 보낼 청크 요청 수 (스레드 풀 크기)
+        use_polyline: True면 encoded polyline 으로 좌표를 압축해서 요청당 최대 512개까지 묶음
+                      False면 기존처럼 "lat,lon|..." 문자열로 chunk_size 개씩 끊음
+        """
         self.api_key = api_key
         self.use_mock = use_mock
+        self.max_workers = max_workers
+        self.use_polyline = use_polyline
+        self.chunk_size = chunk_size
+        self.http = HttpTransport(timeout=10)
+
+    def _clean_point(self, item):
+        # 입력이 딕셔너리인지 튜플인지 확인, NaN/None 은 (0, 0)으로 대체
+        if isinstance(item, dict):
+            lat, lon = item.get('lat'), item.get('lng')
+        else:
+            lat, lon = item[0], item[1]
+
+        if (lat is not None and lon is not None and 
+            not math.isnan(float(lat)) and not math.isnan(float(lon))):
+            return float(lat), float(lon)
+        return 0.0, 0.0
+
+    def _make_chunks(self, points):
+        """배치 크기 정책: 좌표 수 / URL 길이 한도 안에서 최대한 많이 묶음 -> [(locations 문자열, 좌표 수)]"""
+        if not self.use_polyline:
+            chunks = []
+            for i in range(0, len(points), self.chunk_size):
+                chunk = points[i : i + self.chunk_size]
+                chunks.append(("|".join(f"{lat:.6f},{lon:.6f}" for lat, lon in chunk), len(chunk)))
+            return chunks
+
+        chunks = []
+        start = 0
+        while start < len(points):
+            end = min(len(points), start + self.MAX_POINTS)
+            encoded = encode_polyline(points[start:end])
+            # 길이 한도를 넘으면 절반씩 줄여가며 맞춤
+            while len(encoded) + 4 > self.MAX_LOCATION_CHARS and end - start > 1:
+                end = start + (end - start) // 2
+                encoded = encode_polyline(points[start:end])
+            chunks.append(("enc:" + encoded, end - start))
+            start = end
+        return chunks
+
+    def _fetch_chunk(self, chunk):
+        """청크 1개 요청. 실패하면 이 청크 길이만큼만 0으로 채움 (다른 청크 결과는 밀리지 않음)"""
+        locations_str, count = chunk
+        params = {
+            "locations": locations_str,
+            "key": self.api_key
+        }
+        try:
+            # [핵심] POST가 아닌 GET 사용
+            resp = self.http.get(self.BASE_URL, params=params)
+
+            data = resp.json()
+            if data['status'] != 'OK':
+                print(f"   ⚠️ 구글 거절 ({data['status']}): {data.get('error_message')}")
+            elif len(data['results']) != count:
+                # OK 인데 개수가 다르면 어느 좌표의 값인지 알 수 없으므로 청크 전체를 실패로 처리
+                print(f"   ⚠️ 구글 응답 개수 불일치: 요청 {count}개 / 응답 {len(data['results'])}개")
+            else:
+                return [res['elevation'] for res in data['results']]
+        except Exception as e:
+            print(f"   ⚠️ 연결 오류: {e}")
+        return [0] * count
 
     def get_elevations_bulk(self, coords_list):
         """
-        [최종 수정] POST 방식 문제 해결을 위해 GET 방식으로 전환하되,
-        URL 길이 제한(8192자)을 넘지 않도록 50개씩 끊어서 요청 (Chunking)
+        좌표를 청크로 나눠 스레드 풀로 동시에 요청하고, 입력 순서대로 결과를 이어 붙임
         """
         if not coords_list: return []
 
@@ -18,54 +128,17 @@ class GoogleElevation:
         if self.use_mock:
             return [50 + random.uniform(-5, 50) for _ in range(len(coords_list))]
 
+        points = [self._clean_point(item) for item in coords_list]
+        chunks = self._make_chunks(points)
+
         results = []
-        # GET 요청은 URL 길이가 한정되어 있으므로 안전하게 50개씩 끊음
-        # (좌표 1개당 약 25자 * 50개 = 1250자 -> 아주 여유로움)
-        chunk_size = 50 
-        
-        base_url = "https://maps.googleapis.com/maps/api/elevation/json"
-
-        for i in range(0, len(coords_list), chunk_size):
-            chunk = coords_list[i : i + chunk_size]
-            
-            # 1. 좌표 데이터 정제 (NaN 제거)
-            valid_points = []
-            for item in chunk:
-                # 입력이 딕셔너리인지 튜플인지 확인
-                if isinstance(item, dict):
-                    lat, lon = item.get('lat'), item.get('lng')
-                else:
-                    lat, lon = item[0], item[1]
-
-                if (lat is not None and lon is not None and 
-                    not math.isnan(float(lat)) and not math.isnan(float(lon))):
-                    # 소수점 6자리로 줄여서 URL 길이 절약
-                    valid_points.append(f"{float(lat):.6f},{float(lon):.6f}")
-                else:
-                    valid_points.append("0,0")
-
-            # 2. GET 파라미터 조립 (파이프 | 로 구분)
-            locations_str = "|".join(valid_points)
-            
-            params = {
-                "locations": locations_str,
-                "key": self.api_key
-            }
-            
-            try:
-                # [핵심] POST가 아닌 GET 사용
-                resp = requests.get(base_url, params=params, timeout=10)
-                
-                data = resp.json()
-                if data['status'] == 'OK':
-                    for res in data['results']:
-                        results.append(res['elevation'])
-                else:
-                    print(f"   ⚠️ 구글 거절 ({data['status']}): {data.get('error_message')}")
-                    results.extend([0] * len(chunk))
-                    
-            except Exception as e:
-                print(f"   ⚠️ 연결 오류: {e}")
-                results.extend([0] * len(chunk))
-                
-        return results
\ No newline at end of file
+        if len(chunks) == 1 or self.max_workers <= 1:
+            for chunk in chunks:
+                results.extend(self._fetch_chunk(chunk))
+            return results
+
+        # executor.map 은 제출 순서대로 결과를 돌려주므로 순서가 보존됨
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            for chunk_result in pool.map(self._fetch_chunk, chunks):
+                results.extend(chunk_result)
+        return results
@@ -1,14 +1,35 @@
-import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.http_client import HttpTransport
 
 class KakaoNavi:
-    def __init__(self, api_key):
+    def __init__(self, api_key, geocode_cache=None):
+        """geocode_cache: GeocodeCache (있으면 같은 주소는 카카오 Local API를 다시 부르지 않음)"""
         self.headers = {"Authorization": f"KakaoAK {api_key}"}
+        self.http = HttpTransport(timeout=5)
+        self.geocode_cache = geocode_cache
 
     def get_coords(self, query):
+        if self.geocode_cache is not None:
+            cached = self.geocode_cache.get(query)
+            if cached: return cached
+
+        x, y = self._request_coords(query)
+        if x and self.geocode_cache is not None:
+            self.geocode_cache.put(query, x, y)
+        return x, y
+
+    def _resolve(self, place):
+        """(x, y) 좌표면 그대로, 주소 문자열이면 지오코딩"""
+        if isinstance(place, (tuple, list)):
+            return place[0], place[1]
+        return self.get_coords(place)
+
+    def _request_coords(self, query):
         url = "https://dapi.kakao.com/v2/local/search/address.json"
         try:
-            resp = requests.get(url, headers=self.headers, params={"query": query})
+            resp = self.http.get(url, headers=self.headers, params={"query": query})
             
             # [디버깅 코드 추가] 상태 코드 확인
             if resp.status_code != 200:
@@ -27,8 +48,9 @@ class KakaoNavi:
         return None, None
 
     def get_multi_routes(self, origin, dest):
-        ox, oy = self.get_coords(origin)
-        dx, dy = self.get_coords(dest)
+        """origin/dest: 주소 문자열 또는 이미 변환한 (x, y) 좌표"""
+        ox, oy = self._resolve(origin)
+        dx, dy = self._resolve(dest)
         
         if not ox or not dx: return []
 
@@ -53,57 +75,63 @@ class KakaoNavi:
             }
         ]
         
+        base_params = {
+            "origin": f"{ox},{oy}",
+            "destination": f"{dx},{dy}",
+            "alternatives": "false",
+            "car_fuel": "GASOLINE",
+            "car_type": "1"
+        }
+
+        print(f"   🔄 3가지 전략(추천, 최단거리, 무료도로)으로 경로를 동시에 탐색합니다...")
+
+        # 3개 전략 요청은 서로 독립적이므로 동시에 보냄 (결과는 전략 순서대로 받음)
+        with ThreadPoolExecutor(max_workers=len(strategies)) as pool:
+            responses = list(pool.map(lambda strategy: self._request_route(url, base_params, strategy), strategies))
+
         collected_routes = []
         seen_signatures = set() 
 
-        print(f"   🔄 3가지 전략(추천, 최단거리, 무료도로)으로 경로를 탐색합니다...")
-
-        for strategy in strategies:
+        for strategy, route in zip(strategies, responses):
+            if not route: continue
             label = strategy['label']
-            custom_params = strategy['params']
+            summary = route['summary']
             
-            # 기본 파라미터 + 전략별 커스텀 파라미터 합치기
-            base_params = {
-                "origin": f"{ox},{oy}",
-                "destination": f"{dx},{dy}",
-                "alternatives": "false",
-                "car_fuel": "GASOLINE",
-                "car_type": "1"
-            }
-            final_params = {**base_params, **custom_params}
+            # 중복 제거 (거리와 시간이 1% 오차 내로 같으면 같은 경로로 간주)
+            dist = summary['distance']
+            dur = summary['duration']
+            
+            is_duplicate = False
+            for s_dist, s_dur in seen_signatures:
+                if abs(dist - s_dist) < 100 and abs(dur - s_dur) < 60:
+                    is_duplicate = True
+                    break
             
-            try:
-                resp = requests.get(url, headers=self.headers, params=final_params)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    routes = data.get('routes', [])
-                    
-                    if routes:
-                        route = routes[0]
-                        summary = route['summary']
-                        
-                        # 중복 제거 (거리와 시간이 1% 오차 내로 같으면 같은 경로로 간주)
-                        dist = summary['distance']
-                        dur = summary['duration']
-                        
-                        is_duplicate = False
-                        for s_dist, s_dur in seen_signatures:
-                            if abs(dist - s_dist) < 100 and abs(dur - s_dur) < 60:
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            seen_signatures.add((dist, dur))
-                            route['strategy_label'] = label 
-                            collected_routes.append(route)
-                            print(f"      👉 [{label}] 새로운 경로 확보 (거리: {dist/1000:.1f}km)")
-                        else:
-                            print(f"      ℹ️ [{label}] 기존 경로와 중복되어 제외됨")
-                            
-            except Exception as e:
-                print(f"      ⚠️ API 호출 오류 ({label}): {e}")
+            if not is_duplicate:
+                seen_signatures.add((dist, dur))
+                route['strategy_label'] = label 
+                collected_routes.append(route)
+                print(f"      👉 [{label}] 새로운 경로 확보 (거리: {dist/1000:.1f}km)")
+            else:
+                print(f"      ℹ️ [{label}] 기존 경로와 중복되어 제외됨")
 
         if not collected_routes:
             print("   ⚠️ 경로를 찾지 못했습니다.")
 
-        return collected_routes
\ No newline at end of file
+        return collected_routes
+
+    def _request_route(self, url, base_params, strategy):
+        """전략 1개로 길찾기 요청 -> 첫 번째 경로 (실패 시 None)"""
+        label = strategy['label']
+        # 기본 파라미터 + 전략별 커스텀 파라미터 합치기
+        final_params = {**base_params, **strategy['params']}
+        
+        try:
+            resp = self.http.get(url, headers=self.headers, params=final_params)
+            if resp.status_code == 200:
+                routes = resp.json().get('routes', [])
+                if routes:
+                    return routes[0]
+        except Exception as e:
+            print(f"      ⚠️ API 호출 오류 ({label}): {e}")
+        return None
@@ -1,10 +1,11 @@
-import requests
+from modules.http_client import HttpTransport
 
 class ODsayClient:
     def __init__(self, api_key):
         # [핵심 수정] 여기서 인코딩하지 않고 원본 키 그대로 저장
         self.api_key = api_key
         self.base_url = "https://api.odsay.com/v1/api"
+        self.http = HttpTransport(timeout=10)
 
     def search_path(self, sx, sy, ex, ey):
         """
@@ -23,8 +24,8 @@ class ODsayClient:
         }
         
         try:
-            # requests.get이 params를 URL에 붙일 때 자동으로 인코딩 수행
-            resp = requests.get(url, params=params)
+            # requests 가 params를 URL에 붙일 때 자동으로 인코딩 수행
+            resp = self.http.get(url, params=params)
             
             if resp.status_code == 200:
                 data = resp.json()
@@ -1,9 +1,10 @@
-import requests
+from modules.http_client import HttpTransport
 
 class WeatherAPI:
     def __init__(self, api_key):
         self.api_key = api_key
         self.url = "https://api.openweathermap.org/data/2.5/weather"
+        self.http = HttpTransport(timeout=3, max_retries=1)
 
     def get_weather(self, lat, lon):
         if not self.api_key: # 키 없으면 기본값
@@ -11,7 +12,7 @@ class WeatherAPI:
 
         try:
             params = {"lat": lat, "lon": lon, "appid": self.api_key, "units": "metric"}
-            resp = requests.get(self.url, params=params, timeout=3)
+            resp = self.http.get(self.url, params=params)
             if resp.status_code == 200:
                 d = resp.json()
                 cond = d['weather'][0]['main']
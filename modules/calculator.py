@@ -1,6 +1,14 @@
 import math
+import numpy as np
+
+from modules.vehicle_db import VehicleDB
+from modules.segment_table import SegmentTable
 
 class CarbonCalculator:
+    # get_bin() 의 VSP 경계값 (np.digitize 용) -> 구간 번호 d 는 bin 0(음수), 2~14 로 매핑
+    VSP_EDGES = np.array([0, 3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 39], dtype=np.float64)
+    DIGITIZE_TO_BIN = np.array([0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14])
+
     def __init__(self):
         self.emission_map = {
             0: 0.20, 1: 0.75, 
@@ -8,6 +16,7 @@ class CarbonCalculator:
             6: 4.80, 7: 5.90, 8: 7.10, 9: 8.40, 10: 9.80,
             11: 11.50, 12: 13.50, 13: 16.00, 14: 19.50, 15: 25.00
         }
+        self.emission_rates = np.array([self.emission_map[i] for i in range(16)])
 
     def get_weather_factors(self, weather_data):
         temp_c = weather_data.get('temp', 20.0)
@@ -58,79 +67,251 @@ class CarbonCalculator:
         if vsp < 39: return 13
         return 14
 
-    def calculate(self, segments, weather_data=None, vehicle_spec=None):
-        if not weather_data: weather_data = {'temp': 20.0, 'humidity': 50, 'is_wet': False}
-        if not vehicle_spec: vehicle_spec = {"type": "ice", "drag_term": 0.000264, "emission_factor": 1.0}
+    BASE_WEATHER = {'temp': 20.0, 'humidity': 50, 'is_wet': False}
+    DEFAULT_SPEC = {"type": "ice", "drag_term": 0.000264, "emission_factor": 1.0}
+
+    def get_kinematics(self, seg):
+        """구간 주행시간(s)과 가속도(m/s²) - 날씨와 무관하므로 시나리오끼리 공유 가능"""
+        dist_m = seg['distance_m']
+        speed_kph = seg['speed_kph']
+        delta_v = seg['delta_v']
 
+        time_sec = dist_m / (speed_kph / 3.6) if speed_kph > 0.1 else 0
+        accel = 0
+        if time_sec > 0: accel = (delta_v / 3.6) / time_sec
+
+        cong = seg.get('congestion', 0)
+        if cong >= 3: accel += 0.15
+        return time_sec, accel
+
+    def get_step_co2(self, speed_kph, accel, grade_pct, time_sec, factors, vehicle_spec):
+        """구간 1개의 CO2(g). factors = get_weather_factors() 결과"""
+        k_air, c_r, aux_val = factors
         fuel_type = vehicle_spec.get('type', 'ice')
-        k_air, c_r, aux_load_pct = self.get_weather_factors(weather_data) # aux는 여기서 사용안함(전기차 제외) logic 확인 필요, 아래에서 다시 확인
-        
-        # *수정: get_weather_factors는 aux_kw_ton을 반환함. 
-        # 위 코드에서 aux_load_pct로 받으면 혼동이 올 수 있으나 VSP 계산엔 aux_kw_ton이 들어감.
-        # 내연기관은 aux_kw_ton을 VSP에 더하고, 전기차는 전력량에 % 부하를 더하는 식으로 분기했었음.
-        # 여기서는 깔끔하게 재정리.
-        
-        k_air, c_r, aux_val = self.get_weather_factors(weather_data)
-        
         drag_term = vehicle_spec.get('drag_term', 0.000264)
         weight_kg = vehicle_spec.get('weight_kg', 1500)
         e_factor = vehicle_spec.get('emission_factor', 1.0)
 
-        total_co2 = 0
-        total_dist = 0
+        # VSP 계산 (aux_val은 기생 부하)
+        # 전기차는 aux를 여기서 더하지 않고 전력량에서 처리
+        vsp_aux = 0 if fuel_type == 'ev' else aux_val
+        vsp = self.get_vsp_scientific(speed_kph, accel, grade_pct, k_air, c_r, vsp_aux, drag_term)
 
-        for seg in segments:
-            dist_m = seg['distance_m']
-            speed_kph = seg['speed_kph']
-            grade_pct = seg['grade_pct']
-            delta_v = seg['delta_v']
+        if fuel_type == "ev":
+            power_kw = vsp * (weight_kg / 1000)
+            if power_kw > 0: energy_kwh = (power_kw * time_sec / 3600) / 0.85
+            else: energy_kwh = (power_kw * time_sec / 3600) * 0.60
             
-            time_sec = dist_m / (speed_kph / 3.6) if speed_kph > 0.1 else 0
-            accel = 0
-            if time_sec > 0: accel = (delta_v / 3.6) / time_sec
+            # 전기차 보조 부하 (비율로 적용, 예: 히터 시 1.3배)
+            # 간단하게 aux_val을 비율로 환산 (대략적)
+            ev_aux_ratio = 1.0 + (aux_val * 0.1) 
+            energy_kwh *= ev_aux_ratio
             
-            cong = seg.get('congestion', 0)
-            if cong >= 3: accel += 0.15
+            return energy_kwh * 424.0
 
-            # VSP 계산 (aux_val은 기생 부하)
-            # 전기차는 aux를 여기서 더하지 않고 전력량에서 처리
-            vsp_aux = 0 if fuel_type == 'ev' else aux_val
-            vsp = self.get_vsp_scientific(speed_kph, accel, grade_pct, k_air, c_r, vsp_aux, drag_term)
-            
-            step_co2 = 0
-
-            if fuel_type == "ev":
-                power_kw = vsp * (weight_kg / 1000)
-                if power_kw > 0: energy_kwh = (power_kw * time_sec / 3600) / 0.85
-                else: energy_kwh = (power_kw * time_sec / 3600) * 0.60
-                
-                # 전기차 보조 부하 (비율로 적용, 예: 히터 시 1.3배)
-                # 간단하게 aux_val을 비율로 환산 (대략적)
-                ev_aux_ratio = 1.0 + (aux_val * 0.1) 
-                energy_kwh *= ev_aux_ratio
-                
-                step_co2 = energy_kwh * 424.0
-            
-            else:
-                bin_idx = self.get_bin(vsp, speed_kph)
-                base_emission = self.emission_map.get(bin_idx, 5.0) * time_sec
-                if fuel_type == "hev":
-                    if vsp < 5 and speed_kph < 40: base_emission *= 0.1
-                    else: base_emission *= 0.7
-                
-                step_co2 = base_emission * e_factor
+        bin_idx = self.get_bin(vsp, speed_kph)
+        base_emission = self.emission_map.get(bin_idx, 5.0) * time_sec
+        if fuel_type == "hev":
+            if vsp < 5 and speed_kph < 40: base_emission *= 0.1
+            else: base_emission *= 0.7
+        
+        return base_emission * e_factor
+
+    def calculate(self, segments, weather_data=None, vehicle_spec=None):
+        if not weather_data: weather_data = self.BASE_WEATHER
+        if not vehicle_spec: vehicle_spec = self.DEFAULT_SPEC
+
+        # get_weather_factors는 (공기밀도 보정, 구름저항, 보조부하 aux_kw_ton)을 반환
+        # 내연기관은 aux를 VSP에 더하고, 전기차는 전력량에 비율로 더함 (get_step_co2 참고)
+        factors = self.get_weather_factors(weather_data)
+
+        # 구간 테이블이면 배열 경로로 계산 (구간별 결과는 아래 루프와 비트 단위로 동일)
+        if isinstance(segments, SegmentTable):
+            total_co2, total_dist, steps = self.calculate_array(self.segment_columns(segments), weather_data, vehicle_spec)
+            segments.set_column('step_emission', [round(x, 2) for x in steps.tolist()])
+            return total_co2, total_dist
+
+        total_co2 = 0
+        total_dist = 0
+
+        for seg in segments:
+            time_sec, accel = self.get_kinematics(seg)
+            step_co2 = self.get_step_co2(seg['speed_kph'], accel, seg['grade_pct'], time_sec, factors, vehicle_spec)
 
             total_co2 += step_co2
-            total_dist += (dist_m / 1000)
+            total_dist += (seg['distance_m'] / 1000)
             
             seg['step_emission'] = round(step_co2, 2)
 
         return total_co2, total_dist
 
+    # ==================================================
+    # 🧮 [배열 계산기] 구간 테이블을 NumPy 컬럼으로 받아 한 번에 계산
+    #    (스칼라 경로와 연산 순서를 맞춰서 구간별 결과가 비트 단위로 동일)
+    # ==================================================
+    def segment_columns(self, segments):
+        """dict 구간 리스트 / SegmentTable -> 계산에 필요한 컬럼 배열"""
+        if isinstance(segments, SegmentTable):
+            return {key: segments.column(key) for key in ("distance_m", "speed_kph", "grade_pct", "delta_v", "congestion")}
+        n = len(segments)
+        cols = {
+            "distance_m": np.empty(n), "speed_kph": np.empty(n), "grade_pct": np.empty(n),
+            "delta_v": np.empty(n), "congestion": np.empty(n)
+        }
+        for i, seg in enumerate(segments):
+            cols["distance_m"][i] = seg['distance_m']
+            cols["speed_kph"][i] = seg['speed_kph']
+            cols["grade_pct"][i] = seg['grade_pct']
+            cols["delta_v"][i] = seg['delta_v']
+            cols["congestion"][i] = seg.get('congestion', 0)
+        return cols
+
+    def get_kinematics_array(self, cols):
+        speed = cols['speed_kph']
+        moving = speed > 0.1
+        time_sec = np.zeros(len(speed))
+        np.divide(cols['distance_m'], speed / 3.6, out=time_sec, where=moving)
+
+        accel = np.zeros(len(speed))
+        np.divide(cols['delta_v'] / 3.6, time_sec, out=accel, where=time_sec > 0)
+        accel = np.where(cols['congestion'] >= 3, accel + 0.15, accel)
+        return time_sec, accel
+
+    def get_bin_array(self, vsp, speed):
+        bins = self.DIGITIZE_TO_BIN[np.digitize(vsp, self.VSP_EDGES)]
+        return np.where(speed < 1.0, 1, bins)
+
+    def get_step_co2_array(self, speed_kph, accel, grade_pct, time_sec, factors, vehicle_spec):
+        """get_step_co2() 의 배열 버전 (ICE / HEV / EV)"""
+        return self.get_fleet_step_co2(speed_kph, accel, grade_pct, time_sec, factors, [vehicle_spec])[0]
+
+    def get_fleet_step_co2(self, speed_kph, accel, grade_pct, time_sec, factors, vehicle_specs):
+        """
+        여러 차종을 한 번에 계산: 스펙 값(무게, 공기저항, 배출계수, 타입)을 (차종 x 1) 열벡터로 두고
+        구간 배열 (1 x 구간)과 브로드캐스팅 -> (차종 x 구간) 배출량
+        """
+        k_air, c_r, aux_val = factors
+        is_ev = np.array([spec.get('type', 'ice') == 'ev' for spec in vehicle_specs])
+        is_hev = np.array([spec.get('type', 'ice') == 'hev' for spec in vehicle_specs])[:, None]
+        drag_term = np.array([spec.get('drag_term', 0.000264) for spec in vehicle_specs])[:, None]
+        weight_kg = np.array([spec.get('weight_kg', 1500) for spec in vehicle_specs], dtype=np.float64)[:, None]
+        e_factor = np.array([spec.get('emission_factor', 1.0) for spec in vehicle_specs], dtype=np.float64)[:, None]
+
+        # 전기차는 aux를 VSP에 더하지 않고 전력량에서 처리
+        vsp_aux = np.where(is_ev, 0.0, aux_val)[:, None]
+        v = speed_kph / 3.6
+        grade_dec = grade_pct / 100
+        vsp = v * (1.1 * accel + 9.81 * grade_dec + c_r) + (drag_term * k_air) * (v ** 3) + vsp_aux
+
+        step_co2 = np.empty(vsp.shape)
+
+        if is_ev.any():
+            power_kw = vsp[is_ev] * (weight_kg[is_ev] / 1000)
+            energy = power_kw * time_sec / 3600
+            energy_kwh = np.where(power_kw > 0, energy / 0.85, energy * 0.60)
+            energy_kwh = energy_kwh * (1.0 + (aux_val * 0.1))
+            step_co2[is_ev] = energy_kwh * 424.0
+
+        fuel = ~is_ev
+        if fuel.any():
+            vsp_f = vsp[fuel]
+            base_emission = self.emission_rates[self.get_bin_array(vsp_f, speed_kph)] * time_sec
+            hev_mode = np.where((vsp_f < 5) & (speed_kph < 40), base_emission * 0.1, base_emission * 0.7)
+            base_emission = np.where(is_hev[fuel], hev_mode, base_emission)
+            step_co2[fuel] = base_emission * e_factor[fuel]
+
+        return step_co2
+
+    def _running_total(self, values):
+        # 파이썬 for 루프 누적과 같은 순서로 더함 (np.sum 의 pairwise 합과 미세하게 다름)
+        return float(np.cumsum(values)[-1]) if len(values) else 0
+
+    def calculate_array(self, cols, weather_data=None, vehicle_spec=None):
+        """
+        calculate() 의 배열 버전. cols = segment_columns() 결과
+        반환: (총 CO2, 총 거리 km, 구간별 CO2 배열)
+        """
+        if not weather_data: weather_data = self.BASE_WEATHER
+        if not vehicle_spec: vehicle_spec = self.DEFAULT_SPEC
+
+        time_sec, accel = self.get_kinematics_array(cols)
+        steps = self.get_step_co2_array(cols['speed_kph'], accel, cols['grade_pct'], time_sec,
+                                        self.get_weather_factors(weather_data), vehicle_spec)
+        return self._running_total(steps), self._running_total(cols['distance_m'] / 1000), steps
+
+    def evaluate_weather_scenarios(self, segments, real_weather, vehicle_spec=None):
+        """
+        [단일 패스] 실제 날씨 / 기준 날씨(20°C) 두 시나리오를 한 번에 계산
+        - 주행시간·가속도는 1번만 (배열로) 계산해서 두 시나리오가 공유
+        - segments 는 수정하지 않음 (구간별 배출량은 리스트로 반환)
+        """
+        if not real_weather: real_weather = self.BASE_WEATHER
+        if not vehicle_spec: vehicle_spec = self.DEFAULT_SPEC
+
+        cols = self.segment_columns(segments)
+        time_sec, accel = self.get_kinematics_array(cols)
+        speed_kph, grade_pct = cols['speed_kph'], cols['grade_pct']
+
+        real_steps = self.get_step_co2_array(speed_kph, accel, grade_pct, time_sec,
+                                             self.get_weather_factors(real_weather), vehicle_spec)
+        base_steps = self.get_step_co2_array(speed_kph, accel, grade_pct, time_sec,
+                                             self.get_weather_factors(self.BASE_WEATHER), vehicle_spec)
+
+        return {
+            "real_co2": self._running_total(real_steps),
+            "base_co2": self._running_total(base_steps),
+            "real_steps": real_steps.tolist(),
+            "base_steps": base_steps.tolist()
+        }
+
+    def calculate_fleet_matrix(self, route_segments, vehicle_specs=None, weather_data=None):
+        """
+        [차종 비교 행렬] 모든 차종 x 모든 경로의 CO2 를 한 번에 계산
+        route_segments: 경로별 구간 리스트의 리스트
+        vehicle_specs: {키: 스펙} (기본값: VehicleDB 전체)
+        반환: {"keys": [...], "names": [...], "co2": (차종 수 x 경로 수) 배열}
+        """
+        if vehicle_specs is None: vehicle_specs = VehicleDB().specs
+        if not weather_data: weather_data = self.BASE_WEATHER
+
+        keys = list(vehicle_specs.keys())
+        specs = [vehicle_specs[k] for k in keys]
+
+        # 모든 경로의 구간을 이어 붙여서 운동량(시간/가속도)은 1번만 계산
+        if all(isinstance(segments, SegmentTable) for segments in route_segments):
+            cols = self.segment_columns(SegmentTable.concat(route_segments))
+        else:
+            cols = self.segment_columns([seg for segments in route_segments for seg in segments])
+        time_sec, accel = self.get_kinematics_array(cols)
+        steps = self.get_fleet_step_co2(cols['speed_kph'], accel, cols['grade_pct'], time_sec,
+                                        self.get_weather_factors(weather_data), specs)
+
+        matrix = np.zeros((len(specs), len(route_segments)))
+        start = 0
+        for r_idx, segments in enumerate(route_segments):
+            end = start + len(segments)
+            if end > start:
+                # calculate() 와 같은 순서의 누적합 (결과 일치)
+                matrix[:, r_idx] = np.cumsum(steps[:, start:end], axis=1)[:, -1]
+            start = end
+
+        return {
+            "keys": keys,
+            "names": [spec.get('name', key) for key, spec in zip(keys, specs)],
+            "co2": matrix
+        }
+
     def calculate_weather_impact(self, segments, real_weather, vehicle_spec=None):
-        real_co2, _ = self.calculate(segments, real_weather, vehicle_spec)
-        base_weather = {'temp': 20.0, 'humidity': 50, 'is_wet': False}
-        base_co2, _ = self.calculate(segments, base_weather, vehicle_spec)
+        result = self.evaluate_weather_scenarios(segments, real_weather, vehicle_spec)
+        real_co2, base_co2 = result['real_co2'], result['base_co2']
+
+        # 시각화용 구간 배출량은 항상 실제 날씨 기준으로 기록
+        if isinstance(segments, SegmentTable):
+            segments.set_column('step_emission', [round(x, 2) for x in result['real_steps']])
+        else:
+            for seg, step_co2 in zip(segments, result['real_steps']):
+                seg['step_emission'] = round(step_co2, 2)
+
         diff = real_co2 - base_co2
         pct = (diff / base_co2) * 100 if base_co2 > 0 else 0
-        return real_co2, diff, pct
\ No newline at end of file
+        return real_co2, diff, pct
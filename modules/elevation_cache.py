@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+
+class CachedElevation:
+    """
+    [고도 캐시] GoogleElevation 앞단에 두는 영구(SQLite) 고도 캐시
+
+    - 좌표를 약 10m 격자(위경도 0.0001도)로 양자화한 셀 번호를 키로 사용
+    - 캐시에 있는 점은 로컬에서 바로 응답, 없는 점(miss)만 모아서 원래 API로 전송
+    - get_elevations_bulk(coords) -> list 인터페이스가 같아서 DataProcessor에 그대로 주입 가능
+    """
+
+    LON_SPAN = 4_000_000  # 셀 번호 = 위도칸 * LON_SPAN + (경도칸 + LON_SPAN/2)
+
+    def __init__(self, provider, db_path="data/elevation_cache.sqlite", grid_deg=0.0001):
+        """grid_deg: 격자 1칸 크기 (기본 0.0001도 = 위도 약 11m, 한국 경도 약 9m)"""
+        self.provider = provider
+        self.db_path = db_path
+        self.grid_deg = grid_deg
+
+        self.stats = {"hits": 0, "misses": 0, "upstream_calls": 0}
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        # Streamlit은 세션마다 다른 스레드에서 호출하므로 연결 하나를 락으로 보호해서 공유
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS elevation (cell INTEGER PRIMARY KEY, alt REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @property
+    def use_mock(self):
+        return getattr(self.provider, 'use_mock', False)
+
+    def cell_key(self, lat, lon):
+        q_lat = int(round(float(lat) / self.grid_deg))
+        q_lon = int(round(float(lon) / self.grid_deg))
+        return q_lat * self.LON_SPAN + (q_lon + self.LON_SPAN // 2)
+
+    def hit_rate(self):
+        with self._lock:
+            hits, misses = self.stats['hits'], self.stats['misses']
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats['hits'] + stats['misses']
+        rate = stats['hits'] / total if total else 0.0
+        return (f"고도 캐시 hit {stats['hits']} / miss {stats['misses']} "
+                f"(적중률 {rate * 100:.1f}%, API 호출 {stats['upstream_calls']}회)")
+
+    def _lookup(self, keys):
+        found = {}
+        keys = list(keys)
+        # SQLite 파라미터 개수 제한(999)을 넘지 않도록 끊어서 조회
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT cell, alt FROM elevation WHERE cell IN ({marks})", chunk
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def get_elevations_bulk(self, coords_list):
+        if not coords_list: return []
+
+        # Mock 모드는 임의값이라 캐시하지 않음
+        if self.use_mock:
+            return self.provider.get_elevations_bulk(coords_list)
+
+        keys = []
+        for item in coords_list:
+            if isinstance(item, dict):
+                lat, lon = item.get('lat'), item.get('lng')
+            else:
+                lat, lon = item[0], item[1]
+            keys.append(self.cell_key(lat, lon))
+
+        # 통계는 여러 스레드(Streamlit 세션)가 함께 갱신하므로 조회와 같은 락 안에서 더함
+        with self._lock:
+            alt_map = self._lookup(set(keys))
+            hits = sum(1 for k in keys if k in alt_map)
+            self.stats['hits'] += hits
+            self.stats['misses'] += len(keys) - hits
+
+        # miss 셀마다 대표 좌표 1개만 API로 보냄
+        miss_coords = {}
+        for key, item in zip(keys, coords_list):
+            if key not in alt_map and key not in miss_coords:
+                miss_coords[key] = item
+
+        if miss_coords:
+            miss_keys = list(miss_coords.keys())
+            fetched = self.provider.get_elevations_bulk(list(miss_coords.values()))
+
+            new_rows = []
+            for key, alt in zip(miss_keys, fetched):
+                alt_map[key] = alt
+                # 0은 API 실패 시 채워 넣는 값이므로 저장하지 않음 (다음에 다시 조회)
+                if alt: new_rows.append((key, float(alt)))
+
+            with self._lock:
+                self.stats['upstream_calls'] += 1
+                if new_rows:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO elevation (cell, alt) VALUES (?, ?)", new_rows
+                    )
+                    self._conn.commit()
+
+        return [alt_map.get(k, 0) for k in keys]
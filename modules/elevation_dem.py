@@ -0,0 +1,115 @@
+import os
+import math
+import numpy as np
+
+class DEMElevation:
+    """
+    [오프라인 고도] 로컬 DEM(SRTM/ASTER 형식) 타일에서 고도를 읽는 백엔드
+
+    - 타일 1장 = 위경도 1도 x 1도, 파일명은 SRTM 규칙 (예: N37E127.npy / N37E127.hgt)
+    - .npy 는 np.load(mmap_mode='r'), .hgt/.raw 는 big-endian int16 numpy.memmap 으로 열어서
+      필요한 페이지만 OS 페이지 캐시에서 읽음 (여러 워커 프로세스가 같은 타일을 공유)
+    - 고도는 주변 4개 격자점의 쌍선형 보간(bilinear)으로 벡터 계산
+    - GoogleElevation 과 같은 get_elevations_bulk(coords) -> list 인터페이스
+    """
+
+    VOID = -32768  # SRTM 결측값
+
+    def __init__(self, tile_dir, fallback=None):
+        """
+        tile_dir: 타일 파일이 들어 있는 폴더
+        fallback: 타일이 없는 지역을 대신 조회할 provider (예: GoogleElevation), 없으면 0
+        """
+        self.tile_dir = tile_dir
+        self.fallback = fallback
+        self.use_mock = False
+        self._tiles = {}  # (lat0, lon0) -> 2차원 배열 (memmap) 또는 None
+
+    def tile_name(self, lat0, lon0):
+        ns = "N" if lat0 >= 0 else "S"
+        ew = "E" if lon0 >= 0 else "W"
+        return f"{ns}{abs(lat0):02d}{ew}{abs(lon0):03d}"
+
+    def _open_tile(self, lat0, lon0):
+        key = (lat0, lon0)
+        if key in self._tiles:
+            return self._tiles[key]
+
+        base = os.path.join(self.tile_dir, self.tile_name(lat0, lon0))
+        tile = None
+        if os.path.exists(base + ".npy"):
+            tile = np.load(base + ".npy", mmap_mode='r')
+        else:
+            for ext in (".hgt", ".raw"):
+                path = base + ext
+                if os.path.exists(path):
+                    # 정사각형 타일 (1201x1201: 3초, 3601x3601: 1초)
+                    size = int(math.isqrt(os.path.getsize(path) // 2))
+                    tile = np.memmap(path, dtype='>i2', mode='r', shape=(size, size))
+                    break
+
+        self._tiles[key] = tile
+        return tile
+
+    def _interpolate(self, tile, lat0, lon0, lats, lons):
+        n = tile.shape[0]
+        # 1행 = 북쪽 끝(lat0+1), 1열 = 서쪽 끝(lon0)
+        row = (lat0 + 1 - lats) * (n - 1)
+        col = (lons - lon0) * (n - 1)
+
+        r0 = np.clip(np.floor(row).astype(np.int64), 0, n - 2)
+        c0 = np.clip(np.floor(col).astype(np.int64), 0, n - 2)
+        fr = row - r0
+        fc = col - c0
+
+        z00 = tile[r0, c0].astype(np.float64)
+        z01 = tile[r0, c0 + 1].astype(np.float64)
+        z10 = tile[r0 + 1, c0].astype(np.float64)
+        z11 = tile[r0 + 1, c0 + 1].astype(np.float64)
+
+        # 결측 격자점은 해수면(0)으로 처리
+        for z in (z00, z01, z10, z11):
+            z[z == self.VOID] = 0.0
+
+        top = z00 * (1 - fc) + z01 * fc
+        bottom = z10 * (1 - fc) + z11 * fc
+        return top * (1 - fr) + bottom * fr
+
+    def get_elevations_bulk(self, coords_list):
+        if not coords_list: return []
+
+        lats, lons = [], []
+        for item in coords_list:
+            if isinstance(item, dict):
+                lat, lon = item.get('lat'), item.get('lng')
+            else:
+                lat, lon = item[0], item[1]
+            lats.append(float(lat) if lat is not None else math.nan)
+            lons.append(float(lon) if lon is not None else math.nan)
+
+        lats = np.asarray(lats)
+        lons = np.asarray(lons)
+        result = np.zeros(len(lats))
+        missing = np.zeros(len(lats), dtype=bool)
+
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        tile_lat = np.floor(np.where(valid, lats, 0)).astype(np.int64)
+        tile_lon = np.floor(np.where(valid, lons, 0)).astype(np.int64)
+
+        # 타일별로 묶어서 한 번에 보간
+        keys = np.stack([tile_lat, tile_lon], axis=1)[valid]
+        for lat0, lon0 in np.unique(keys, axis=0).tolist():
+            mask = valid & (tile_lat == lat0) & (tile_lon == lon0)
+            tile = self._open_tile(lat0, lon0)
+            if tile is None:
+                missing |= mask
+                continue
+            result[mask] = self._interpolate(tile, lat0, lon0, lats[mask], lons[mask])
+
+        # 타일이 없는 지역은 fallback provider 로 조회
+        if self.fallback is not None and missing.any():
+            idx = np.flatnonzero(missing)
+            fetched = self.fallback.get_elevations_bulk([coords_list[i] for i in idx])
+            result[idx] = fetched
+
+        return result.tolist()
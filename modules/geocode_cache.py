@@ -0,0 +1,81 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+class GeocodeCache:
+    """
+    [주소 캐시] 주소 -> (x, y) 좌표 캐시 (메모리 LRU + 선택적 SQLite 영구 저장)
+
+    - 키는 정규화한 주소 (앞뒤 공백 제거, 연속 공백 1칸, 소문자)
+    - ttl_sec 이 지난 항목은 무시하고 다시 조회
+    - st.cache_resource 로 만든 KakaoNavi 에 붙이면 모든 Streamlit 세션이 공유
+    """
+
+    def __init__(self, maxsize=1024, ttl_sec=30 * 24 * 3600, db_path=None):
+        self.maxsize = maxsize
+        self.ttl_sec = ttl_sec
+        self.db_path = db_path
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._lru = OrderedDict()  # key -> (x, y, 저장 시각)
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if db_path:
+            db_dir = os.path.dirname(db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+            # 배치 프로세스 풀의 워커들이 같은 파일을 쓰므로 WAL + 잠금 대기 시간 설정
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode (addr TEXT PRIMARY KEY, x TEXT, y TEXT, ts REAL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def normalize(address):
+        return re.sub(r"\s+", " ", str(address).strip()).lower()
+
+    def get(self, address):
+        key = self.normalize(address)
+        now = time.time()
+
+        with self._lock:
+            item = self._lru.get(key)
+            if item is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT x, y, ts FROM geocode WHERE addr = ?", (key,)
+                ).fetchone()
+                if row: item = tuple(row)
+
+            if item is not None and now - item[2] <= self.ttl_sec:
+                self._lru[key] = item
+                self._lru.move_to_end(key)
+                self._trim()
+                self.stats['hits'] += 1
+                return item[0], item[1]
+
+            self._lru.pop(key, None)
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, address, x, y):
+        key = self.normalize(address)
+        item = (x, y, time.time())
+        with self._lock:
+            self._lru[key] = item
+            self._lru.move_to_end(key)
+            self._trim()
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO geocode (addr, x, y, ts) VALUES (?, ?, ?, ?)", (key, *item)
+                )
+                self._conn.commit()
+
+    def _trim(self):
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
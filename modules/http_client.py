@@ -0,0 +1,157 @@
+import os
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules.single_flight import SingleFlight
+from modules.http_replay import FixtureStore
+
+# 호스트별 공유 세션 (keep-alive 커넥션 풀) 과 호출 통계
+_sessions = {}
+_stats = {}
+_lock = threading.Lock()
+
+# 동시에 나가는 똑같은 GET 요청(같은 URL/파라미터/헤더)은 1번만 보내고 응답을 공유
+_flight = SingleFlight()
+
+# 오프라인 실험용 설정 (configure 참고): 녹화/재생 모드, 응답 저장소, 대역 서버 주소
+_offline = {"mode": None, "store": None, "stub_url": None}
+
+def configure(mode=None, fixture_dir="data/fixtures", stub_url=None):
+    """
+    모든 API 클라이언트의 전송 방식을 한 번에 전환
+    mode: None(실제 호출) / "record"(실제 응답을 fixture_dir 에 저장) / "replay"(저장된 응답만 사용, 네트워크 없음)
+    stub_url: 지정하면 모든 요청을 로컬 대역 서버로 보냄 (예: http://127.0.0.1:8765 -> /{원래 호스트}/{경로})
+    """
+    if mode not in (None, "record", "replay"):
+        raise ValueError(f"알 수 없는 모드: {mode}")
+    with _lock:
+        _offline['mode'] = mode
+        _offline['store'] = FixtureStore(fixture_dir) if mode else None
+        _offline['stub_url'] = stub_url.rstrip("/") if stub_url else None
+
+def configure_from_env():
+    """환경변수 HTTP_REPLAY(record/replay), HTTP_FIXTURE_DIR, HTTP_STUB_URL 로 configure (둘 다 없으면 그대로 둠)"""
+    if not os.getenv("HTTP_REPLAY") and not os.getenv("HTTP_STUB_URL"): return
+    configure(mode=os.getenv("HTTP_REPLAY") or None,
+              fixture_dir=os.getenv("HTTP_FIXTURE_DIR") or "data/fixtures",
+              stub_url=os.getenv("HTTP_STUB_URL") or None)
+
+def get_fixture_stats():
+    store = _offline['store']
+    return dict(store.stats) if store else {}
+
+def get_session(host):
+    """호스트 1개당 requests.Session 1개를 만들어 모든 클라이언트/스레드가 공유"""
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+def get_stats():
+    """호스트별 호출 통계 스냅샷 {host: {calls, errors, retries, total_ms, max_ms, bytes}}"""
+    with _lock:
+        return {host: dict(s) for host, s in _stats.items()}
+
+def _record(host, elapsed_ms, error=False, retried=False, nbytes=0):
+    with _lock:
+        s = _stats.setdefault(host, {"calls": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                     "bytes": 0})
+        if retried:
+            s["retries"] += 1
+            return
+        s["calls"] += 1
+        s["total_ms"] += elapsed_ms
+        s["max_ms"] = max(s["max_ms"], elapsed_ms)
+        s["bytes"] += nbytes
+        if error: s["errors"] += 1
+
+class HttpTransport:
+    """
+    [공통 전송 계층] 카카오/구글/ODsay/날씨 API 클라이언트가 함께 쓰는 HTTP GET 래퍼
+
+    - 호스트별 풀링 세션 재사용 (매 호출마다 TCP+TLS 핸드셰이크 하지 않음)
+    - 클라이언트별 타임아웃 (무한 대기 방지)
+    - 429/5xx 및 연결 오류 시 지터가 들어간 지수 백오프로 제한된 횟수만 재시도
+    - 호출 수/오류/재시도/지연시간(ms)/응답 바이트 통계 기록 (get_stats)
+    - single_flight=True 면 동시에 들어온 동일 요청을 1번으로 병합 (쿼터 보호)
+    - configure() 로 녹화/재생, 로컬 대역 서버 전환 (클라이언트 코드는 그대로)
+    """
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, timeout=10, max_retries=2, backoff_base=0.3, backoff_max=4.0, single_flight=True):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.single_flight = single_flight
+
+    def _backoff(self, attempt, resp=None):
+        # 서버가 Retry-After(초)를 주면 우선 사용
+        if resp is not None:
+            retry_after = resp.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay, self.backoff_max) * random.uniform(0.5, 1.5)
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        if not self.single_flight:
+            return self._get(url, params, headers, timeout)
+        key = (url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items())))
+        return _flight.do(key, self._get, url, params, headers, timeout)
+
+    def _get(self, url, params=None, headers=None, timeout=None):
+        host = urlparse(url).netloc
+        mode, store, stub_url = _offline['mode'], _offline['store'], _offline['stub_url']
+
+        # 재생 모드: 네트워크 없이 저장된 응답 반환 (없으면 실제 연결 실패와 같은 예외)
+        if mode == "replay":
+            resp = store.load(url, params)
+            _record(host, 0, error=resp is None, nbytes=len(resp.content) if resp is not None else 0)
+            if resp is None:
+                raise requests.ConnectionError(f"녹화된 응답 없음: {url} {params}")
+            return resp
+
+        # 대역 서버: 원래 호스트를 경로 앞에 붙여서 한 서버가 모든 API를 흉내냄
+        target = url
+        if stub_url:
+            parsed = urlparse(url)
+            target = f"{stub_url}/{parsed.netloc}{parsed.path}"
+
+        session = get_session(urlparse(target).netloc)
+        timeout = timeout or self.timeout
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                resp = session.get(target, params=params, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                _record(host, (time.perf_counter() - start) * 1000, error=True)
+                if attempt >= self.max_retries: raise
+                _record(host, 0, retried=True)
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            failed = resp.status_code in self.RETRY_STATUS
+            _record(host, (time.perf_counter() - start) * 1000, error=failed, nbytes=len(resp.content))
+            if failed and attempt < self.max_retries:
+                _record(host, 0, retried=True)
+                time.sleep(self._backoff(attempt, resp))
+                attempt += 1
+                continue
+            if mode == "record" and not failed:
+                store.save(url, params, resp)
+            return resp
@@ -0,0 +1,80 @@
+import os
+import json
+import hashlib
+from urllib.parse import urlparse
+
+# 파일에 남기면 안 되는 인증 파라미터/헤더 (키에서도 제외 -> 다른 키로 녹화한 응답도 재생 가능)
+SECRET_PARAMS = ("key", "apiKey", "appid", "appKey")
+SECRET_HEADERS = ("Authorization",)
+
+def clean_params(params):
+    return {k: str(v) for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+
+def fixture_key(url, params=None):
+    """URL + 인증키를 뺀 파라미터 -> 고정 길이 키 (파라미터 순서와 무관)"""
+    raw = json.dumps([url, sorted(clean_params(params).items())], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+class ReplayResponse:
+    """녹화된 응답을 requests.Response 처럼 쓰기 위한 최소 객체 (status_code / text / json / headers)"""
+
+    def __init__(self, status_code, text, headers=None, url=""):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.url = url
+
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+class FixtureStore:
+    """
+    [녹화/재생] API 응답을 {fixture_dir}/{host}/{키}.json 파일로 저장하고 다시 꺼내 씀
+
+    - record: 실제 응답을 받은 뒤 파일로 저장 (인증키는 저장하지 않음)
+    - replay: 네트워크 없이 저장된 응답만 돌려줌 (없으면 None -> 호출 측에서 연결 오류로 처리)
+    """
+
+    def __init__(self, fixture_dir="data/fixtures"):
+        self.fixture_dir = fixture_dir
+        self.stats = {"saved": 0, "hits": 0, "misses": 0}
+
+    def _path(self, url, params):
+        host = urlparse(url).netloc or "local"
+        return os.path.join(self.fixture_dir, host, fixture_key(url, params) + ".json")
+
+    def load(self, url, params=None):
+        path = self._path(url, params)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return ReplayResponse(data['status'], data['body'], data.get('headers'), data['url'])
+
+    def save(self, url, params, resp):
+        path = self._path(url, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {
+            "url": url,
+            "params": clean_params(params),
+            "status": resp.status_code,
+            "headers": {"Content-Type": resp.headers.get("Content-Type", "application/json")},
+            "body": resp.text
+        }
+        # 동시에 같은 응답을 쓰더라도 반쯤 쓴 파일이 남지 않도록 임시 파일 -> rename
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.stats['saved'] += 1
@@ -0,0 +1,166 @@
+"""
+[계측] 분석 단계별 소요 시간(span) / API 호출 통계 / 캐시 적중률 수집 + 내보내기
+
+    from modules import metrics
+    metrics.enable(trace_path="data/traces.jsonl")
+    with metrics.span("geocode"):
+        ...
+    print(metrics.prometheus_text())
+
+- 꺼져 있으면(기본값) span() 은 미리 만들어 둔 빈 컨텍스트를 돌려주기만 함 -> 오버헤드 거의 없음
+- 켜져 있으면 단계별 호출 수 / 합계 / 최대 시간을 모으고, trace_path 가 있으면 span 마다 JSONL 1줄 기록
+- API 호출 통계는 http_client.get_stats(), 캐시 적중률은 register_cache() 로 등록한 함수에서 가져옴
+- 환경변수: METRICS=1 이면 활성화, METRICS_TRACE_PATH 로 JSONL 경로 지정
+"""
+import os
+import json
+import time
+import uuid
+import threading
+from contextlib import nullcontext
+
+from modules import http_client
+
+_NOOP = nullcontext()
+_enabled = False
+_trace_path = None
+_lock = threading.Lock()
+_local = threading.local()  # 스레드별 열린 span 스택 (부모 span / trace id 연결용)
+_stages = {}                # {단계: {"count", "total_ms", "max_ms"}}
+_caches = {}                # {캐시 이름: stats 를 돌려주는 함수}
+
+def enable(trace_path=None):
+    global _enabled, _trace_path
+    if trace_path:
+        trace_dir = os.path.dirname(trace_path)
+        if trace_dir: os.makedirs(trace_dir, exist_ok=True)
+    _trace_path = trace_path
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def configure_from_env():
+    """METRICS=1 이면 활성화 (METRICS_TRACE_PATH 가 있으면 span 을 JSONL 로 기록)"""
+    if os.getenv("METRICS", "").lower() in ("1", "true", "yes", "on"):
+        enable(os.getenv("METRICS_TRACE_PATH") or None)
+
+def reset():
+    with _lock:
+        _stages.clear()
+
+def register_cache(name, stats_fn):
+    """stats_fn() -> {"hits": n, "misses": n} (스냅샷 시점에 호출)"""
+    _caches[name] = stats_fn
+
+class _Span:
+    __slots__ = ("name", "attrs", "trace_id", "parent", "start")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        if stack:
+            self.trace_id, self.parent = stack[-1].trace_id, stack[-1].name
+        else:
+            self.trace_id, self.parent = uuid.uuid4().hex[:16], None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+        _local.stack.pop()
+        with _lock:
+            s = _stages.setdefault(self.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            s['count'] += 1
+            s['total_ms'] += elapsed_ms
+            s['max_ms'] = max(s['max_ms'], elapsed_ms)
+            if _trace_path:
+                event = {"ts": round(time.time(), 3), "trace_id": self.trace_id, "span": self.name,
+                         "parent": self.parent, "ms": round(elapsed_ms, 3), "pid": os.getpid(),
+                         "thread": threading.current_thread().name, "error": exc_type.__name__ if exc_type else None}
+                if self.attrs: event['attrs'] = self.attrs
+                with open(_trace_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+        return False
+
+def span(name, **attrs):
+    """단계 1개의 소요 시간 측정 (with metrics.span("routing"): ...)"""
+    if not _enabled: return _NOOP
+    return _Span(name, attrs)
+
+def snapshot():
+    """현재까지의 계측값 {'stages', 'http', 'caches'}"""
+    with _lock:
+        stages = {name: dict(s) for name, s in _stages.items()}
+    caches = {}
+    for name, stats_fn in list(_caches.items()):
+        s = stats_fn()
+        total = s['hits'] + s['misses']
+        caches[name] = {"hits": s['hits'], "misses": s['misses'], "hit_rate": s['hits'] / total if total else 0.0}
+    return {"stages": stages, "http": http_client.get_stats(), "caches": caches}
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+def prometheus_text(prefix="ecoroute"):
+    """Prometheus 텍스트 형식 스냅샷 (파일로 저장해서 node_exporter textfile 등으로 수집)"""
+    snap = snapshot()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{prefix}_{name}{{{labels}}} {value:g}")
+
+    stages = sorted(snap['stages'].items())
+    metric("stage_calls_total", "counter", "Stage executions",
+           [(f'stage="{_label(k)}"', s['count']) for k, s in stages])
+    metric("stage_seconds_total", "counter", "Total time spent in stage",
+           [(f'stage="{_label(k)}"', s['total_ms'] / 1000) for k, s in stages])
+    metric("stage_seconds_max", "gauge", "Slowest single stage execution",
+           [(f'stage="{_label(k)}"', s['max_ms'] / 1000) for k, s in stages])
+
+    hosts = sorted(snap['http'].items())
+    metric("http_requests_total", "counter", "HTTP requests sent",
+           [(f'host="{_label(h)}"', s['calls']) for h, s in hosts])
+    metric("http_errors_total", "counter", "HTTP requests failed (5xx/429/connection)",
+           [(f'host="{_label(h)}"', s['errors']) for h, s in hosts])
+    metric("http_retries_total", "counter", "HTTP retries",
+           [(f'host="{_label(h)}"', s['retries']) for h, s in hosts])
+    metric("http_request_seconds_total", "counter", "Total HTTP latency",
+           [(f'host="{_label(h)}"', s['total_ms'] / 1000) for h, s in hosts])
+    metric("http_request_seconds_max", "gauge", "Slowest HTTP request",
+           [(f'host="{_label(h)}"', s['max_ms'] / 1000) for h, s in hosts])
+    metric("http_response_bytes_total", "counter", "HTTP response body bytes",
+           [(f'host="{_label(h)}"', s.get('bytes', 0)) for h, s in hosts])
+
+    caches = sorted(snap['caches'].items())
+    metric("cache_hits_total", "counter", "Cache hits", [(f'cache="{_label(c)}"', s['hits']) for c, s in caches])
+    metric("cache_misses_total", "counter", "Cache misses", [(f'cache="{_label(c)}"', s['misses']) for c, s in caches])
+    metric("cache_hit_ratio", "gauge", "Cache hit ratio", [(f'cache="{_label(c)}"', s['hit_rate']) for c, s in caches])
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path, prefix="ecoroute"):
+    out_dir = os.path.dirname(path)
+    if out_dir: os.makedirs(out_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(prefix))
+    os.replace(tmp_path, path)
+
+def summary_lines():
+    """콘솔 출력용 단계별 요약 (느린 단계 순)"""
+    stages = sorted(snapshot()['stages'].items(), key=lambda kv: -kv[1]['total_ms'])
+    return [f"{name:<22} {s['count']:>5}회 | 합계 {s['total_ms']:10.1f}ms | 평균 {s['total_ms'] / s['count']:8.1f}ms "
+            f"| 최대 {s['max_ms']:8.1f}ms" for name, s in stages]
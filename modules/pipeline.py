@@ -0,0 +1,218 @@
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.api_kakao import KakaoNavi
+from modules.geocode_cache import GeocodeCache
+from modules.api_google import GoogleElevation
+from modules.elevation_cache import CachedElevation
+from modules.elevation_dem import DEMElevation
+from modules.processor import DataProcessor
+from modules.calculator import CarbonCalculator
+from modules.api_weather import WeatherAPI
+from modules.vehicle_db import VehicleDB
+from modules.api_odsay import ODsayClient
+from modules.calculator_pub import PublicTransportCalculator
+from modules.result_cache import ResultCache, make_key
+from modules.single_flight import SingleFlight
+from modules import http_client, metrics
+
+def create_resources(kakao_key, google_key, odsay_key, weather_key, dem_dir=None, data_dir="data"):
+    """
+    분석에 필요한 API 클라이언트 / 계산기 / 캐시 묶음 생성
+    (Streamlit 앱은 st.cache_resource 로 1번만, 배치 워커는 프로세스마다 1번 생성)
+    """
+    # HTTP_REPLAY / HTTP_STUB_URL 이 설정되어 있으면 녹화 응답 / 로컬 대역 서버 사용
+    http_client.configure_from_env()
+    # METRICS=1 이면 단계별 시간 / 캐시 적중률 계측
+    metrics.configure_from_env()
+
+    # 고도 provider: DEM 타일 폴더가 지정되면 오프라인 DEM 우선 (타일 밖 지역만 구글+캐시)
+    elevation_cache = CachedElevation(GoogleElevation(google_key, use_mock=False),
+                                      db_path=os.path.join(data_dir, "elevation_cache.sqlite"))
+    elevation = DEMElevation(dem_dir, fallback=elevation_cache) if dem_dir else elevation_cache
+
+    geocode_cache = GeocodeCache(db_path=os.path.join(data_dir, "geocode_cache.sqlite"))
+    result_cache = ResultCache(db_path=os.path.join(data_dir, "result_cache.sqlite"))
+    register_cache_metrics(elevation_cache, geocode_cache, result_cache)
+
+    return {
+        "kakao": KakaoNavi(kakao_key, geocode_cache=geocode_cache),
+        "google": elevation,
+        "weather": WeatherAPI(weather_key),
+        "odsay": ODsayClient(odsay_key),
+        "v_db": VehicleDB(),
+        "car_calc": CarbonCalculator(),
+        "pub_calc": PublicTransportCalculator(),
+        "result_cache": result_cache,
+        "flight": SingleFlight()
+    }
+
+def register_cache_metrics(elevation_cache=None, geocode_cache=None, result_cache=None):
+    """캐시 적중률을 metrics 스냅샷에 포함 (없는 캐시는 건너뜀)"""
+    if elevation_cache is not None:
+        metrics.register_cache("elevation", lambda: elevation_cache.stats)
+    if geocode_cache is not None:
+        metrics.register_cache("geocode", lambda: geocode_cache.stats)
+    if result_cache is not None:
+        for ns in ("car", "route", "pub", "weather", DataProcessor.GEOMETRY_CACHE_NS):
+            metrics.register_cache(f"result_{ns}", lambda ns=ns: _result_cache_stats(result_cache, ns))
+
+def _result_cache_stats(result_cache, namespace):
+    s = result_cache.stats.get(namespace, {})
+    return {"hits": s.get('mem_hits', 0) + s.get('disk_hits', 0), "misses": s.get('misses', 0)}
+
+# 결과 캐시 TTL: 실시간 교통이 반영되는 승용차 결과는 짧게, 대중교통 경로 검색 결과는 길게
+CAR_RESULT_TTL = 10 * 60
+PUB_RESULT_TTL = 6 * 3600
+# 날씨는 승용차 결과 키에 들어가므로 승용차 결과를 저장할 때마다 같은 TTL 로 다시 저장
+# -> 승용차 결과가 캐시에 있으면 그때 쓴 날씨도 항상 캐시에 있음 (경로 탐색 전에 결과 캐시 확인 가능)
+WEATHER_TTL = CAR_RESULT_TTL
+
+def weather_bucket(w_info):
+    """캐시 키용 날씨 구간화 (기온 2°C, 습도 10% 단위 + 비/눈 여부)"""
+    return {
+        'temp': round(w_info['temp'] / 2) * 2,
+        'humidity': int(w_info['humidity']) // 10 * 10,
+        'is_wet': w_info['is_wet']
+    }
+
+def analyze_car_routes(car_routes, processor, w_info, my_car, res):
+    """승용차 경로 분석 -> car_data (구간, 요약, 이벤트, 전 차종 비교)"""
+    collected, car_summ, car_speeds = [], [], []
+    
+    # 이벤트 카운터
+    events = {"uphill": 0, "congestion": 0, "tunnel": 0, "weather_bad": 0} 
+
+    if car_routes:
+        # 전체 경로의 고도를 한 번에 조회해서 경로별로 처리 (이벤트 통계도 함께 집계)
+        all_results = processor.process_routes(car_routes, with_events=True)
+
+        for idx, (route, (segs, route_events)) in enumerate(zip(car_routes, all_results)):
+            strategy = route.get('strategy_label', '일반')
+            if not segs: continue
+
+            # 대표 경로 이벤트 집계 (첫 번째 경로 기준)
+            if idx == 0:
+                events['uphill'] = route_events['uphill']
+                events['congestion'] = route_events['congestion']
+                events['tunnel'] = route_events['tunnel']
+                if w_info['is_wet'] or w_info['temp'] > 28 or w_info['temp'] < 5:
+                    events['weather_bad'] = 1
+            
+            with metrics.span("calculation"):
+                co2, _, w_pct = res['car_calc'].calculate_weather_impact(segs, w_info, my_car)
+            dist = sum(segs.column('distance_m').tolist()) / 1000
+            time = route['summary']['duration'] / 60
+            if time > 0: car_speeds.append(dist/(time/60))
+            
+            stats = {'dist': dist, 'time': time, 'co2': co2, 'weather_pct': w_pct}
+            collected.append({'segments': segs, 'label': strategy, 'stats': stats, 'id': idx+1, 'events': route_events})
+            car_summ.append({"Type": "Car", "Route": strategy, "CO2": co2, "Time": time, "Dist": dist})
+
+    # 전 차종 비교 (같은 구간으로 차종 x 경로 CO2 행렬을 한 번에 계산)
+    fleet = None
+    if collected:
+        with metrics.span("fleet_matrix"):
+            matrix = res['car_calc'].calculate_fleet_matrix(
+                [c['segments'] for c in collected], res['v_db'].specs, w_info)
+        fleet = [{"Vehicle": name, "Route": c['label'], "CO2": float(matrix['co2'][v_idx, r_idx])}
+                 for v_idx, name in enumerate(matrix['names'])
+                 for r_idx, c in enumerate(collected)]
+
+    avg_speed = sum(car_speeds)/len(car_speeds) if car_speeds else None
+    return {'collected': collected, 'summary': car_summ, 'events': events, 'fleet': fleet,
+            'avg_speed': avg_speed}
+
+def run_analysis(start, end, my_car, res):
+    """분석 실행 로직"""
+    with metrics.span("run_analysis", vehicle=my_car.get('name')):
+        return _run_analysis(start, end, my_car, res)
+
+def _run_analysis(start, end, my_car, res):
+    kakao, odsay, weather_api = res['kakao'], res['odsay'], res['weather']
+    cache = res['result_cache']
+    
+    # Processor는 매번 새로 생성 (구글 객체 주입)
+    # 정점 배열이 같은 경로는 결과 캐시에 저장된 정적 레이어를 재사용 -> 교통 정보만 새로 반영
+    processor = DataProcessor(res['google'], geometry_cache=res['result_cache'])
+    
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        # 1. 좌표 변환 (출발/도착 동시에)
+        with metrics.span("geocode"):
+            f_start = pool.submit(kakao.get_coords, start)
+            f_end = pool.submit(kakao.get_coords, end)
+            sx, sy = f_start.result()
+            ex, ey = f_end.result()
+        
+        if not sx or not ex:
+            return None 
+
+        # 캐시 키: 변환된 좌표 + 출발 시간대(시) (+ 승용차는 차량 스펙, 날씨 구간)
+        coords = {'sx': sx, 'sy': sy, 'ex': ex, 'ey': ey}
+        hour = datetime.now().hour
+
+        # 2. 날씨(출발지 + 시간대 키)가 캐시에 있으면 승용차 결과 캐시를 먼저 확인
+        #    -> 승용차 결과가 있으면 경로 탐색(카카오)을 요청하지 않음
+        weather_key = make_key({'sx': sx, 'sy': sy}, hour)
+        w_info = cache.get("weather", weather_key)
+        car_key = car_data = None
+        if w_info is not None:
+            car_key = make_key(coords, my_car, weather_bucket(w_info), hour)
+            car_data = cache.get("car", car_key)
+
+        # 3. 날씨 / 경로 탐색 / 대중교통은 서로 독립적이므로 동시에 요청 (캐시에 없는 것만)
+        #    경로 원본은 날씨와 무관한 키로 따로 캐시 -> 날씨 응답을 기다리지 않고 바로 요청
+        f_weather = pool.submit(weather_api.get_weather, sy, sx) if w_info is None else None
+        car_routes = f_routes = None
+        if car_data is None:
+            route_key = make_key(coords, hour)
+            car_routes = cache.get("route", route_key)
+            if car_routes is None:
+                f_routes = pool.submit(kakao.get_multi_routes, (sx, sy), (ex, ey))
+        pub_key = make_key(coords, hour)
+        pub_raw = cache.get("pub", pub_key)
+        f_pub = pool.submit(odsay.search_path, sx, sy, ex, ey) if pub_raw is None else None
+
+        # 4. 승용차 분석 (날씨를 새로 받았으면 그 날씨 구간으로 결과 캐시 확인)
+        if f_weather is not None:
+            with metrics.span("weather"):
+                w_info = f_weather.result()
+            car_key = make_key(coords, my_car, weather_bucket(w_info), hour)
+            car_data = cache.get("car", car_key)
+        if f_routes is not None:
+            with metrics.span("routing"):
+                car_routes = f_routes.result()
+            if car_routes:
+                cache.put("route", route_key, car_routes, CAR_RESULT_TTL)
+
+        if car_data is None:
+            car_data = analyze_car_routes(car_routes, processor, w_info, my_car, res)
+            # 날씨 API 실패 시의 기본값('Error')으로 계산한 결과는 저장하지 않음
+            if car_data['collected'] and w_info.get('condition') != 'Error':
+                cache.put("weather", weather_key, w_info, WEATHER_TTL)
+                cache.put("car", car_key, car_data, CAR_RESULT_TTL)
+
+        if f_pub is not None:
+            with metrics.span("transit_search"):
+                pub_raw = f_pub.result()
+            if pub_raw:
+                cache.put("pub", pub_key, pub_raw, PUB_RESULT_TTL)
+
+    # 5. 대중교통 분석 (승용차 평균 속도로 버스 할증 적용)
+    pub_summ = []
+    
+    if pub_raw and 'path' in pub_raw:
+        avg_speed = car_data['avg_speed']
+        for path in pub_raw['path'][:3]:
+            with metrics.span("transit_calc"):
+                r = res['pub_calc'].calculate({"info": path['info'], "subPath": path['subPath']}, avg_speed)
+            p_type = "지하철" if path['pathType']==1 else "버스" if path['pathType']==2 else "복합"
+            pub_summ.append({"Type": "Pub", "Route": p_type, "CO2": r['total_co2'], "Time": r['total_time'], "Dist": r['total_dist']})
+
+    return {
+        "coords": coords,
+        "weather": w_info,
+        "car_data": car_data,
+        "pub_data": pub_summ
+    }
@@ -1,5 +1,12 @@
 import math
+import hashlib
 import statistics
+from bisect import insort, bisect_left
+import numpy as np
+
+from modules import metrics
+from modules.segment_table import SegmentTable
+from modules.result_cache import make_key
 
 def haversine(lat1, lon1, lat2, lon2):
     try:
@@ -13,25 +20,216 @@ def haversine(lat1, lon1, lat2, lon2):
     except:
         return 0
 
+def haversine_np(lat1, lon1, lat2, lon2):
+    """haversine()의 NumPy 버전 (배열 단위로 한 번에 계산)"""
+    R = 6371000
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = np.radians(lat2 - lat1)
+    dlambda = np.radians(lon2 - lon1)
+    a = np.sin(dphi/2)**2 + np.cos(phi1)*np.cos(phi2) * np.sin(dlambda/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    return R * c
+
+def round_coords(values, digits=6):
+    """
+    파이썬 round(x, digits) 와 같은 결과를 내는 배열 반올림
+    np.round 는 x * 10^digits 에서 생기는 오차 때문에 x.xxxxxx5 부근에서 결과가 다를 수 있으므로
+    반올림 경계(소수부 0.5) 근처 값만 파이썬 round 로 다시 계산
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** digits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-3)
+    for i in near_half.tolist():
+        rounded[i] = round(float(values[i]), digits)
+    return rounded
+
+def simplify_polyline(lat, lon, tolerance_m, max_length_error=0.005, bounds=None):
+    """
+    [선형 단순화] Douglas-Peucker 로 남길 정점 번호 배열을 반환 (도로마다 첫/끝 정점은 항상 유지)
+    - 빠진 정점은 남은 선분에서 tolerance_m 이내 (좌우 오차)
+    - 남은 선분 길이(haversine)는 원래 정점들을 따라간 길이의 (1 - max_length_error) 배 이상
+      -> 정점 사이 거리의 합인 구간 거리도 같은 비율 이내로만 짧아짐 (길어지지는 않음)
+    - bounds: 도로별 정점 범위 [(시작, 끝), ...] (끝은 미포함). 모든 도로의 같은 깊이 분할을
+      한 번에 배열로 처리하므로 재귀/도로별 호출 없이 분할 깊이만큼만 반복
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    n = len(lat)
+    if bounds is None: bounds = [(0, n)]
+    if tolerance_m <= 0 or n <= 2: return np.arange(n)
+
+    R = 6371000
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    cum = np.zeros(n)
+    np.cumsum(haversine_np(lat[:-1], lon[:-1], lat[1:], lon[1:]), out=cum[1:])
+
+    keep = np.zeros(n, dtype=bool)
+    span_a = np.asarray([a for a, b in bounds if b > a], dtype=np.intp)
+    span_b = np.asarray([b - 1 for a, b in bounds if b > a], dtype=np.intp)
+    keep[span_a] = keep[span_b] = True
+
+    while True:
+        inner = span_b - span_a - 1
+        live = inner > 0
+        span_a, span_b, inner = span_a[live], span_b[live], inner[live]
+        if not len(span_a): break
+
+        # 분할 대상 구간들의 안쪽 정점을 한 줄로 펼침 (sid: 각 정점이 속한 구간 번호)
+        sid = np.repeat(np.arange(len(span_a)), inner)
+        first = np.cumsum(inner) - inner
+        idx = np.arange(len(sid)) - np.repeat(first, inner) + span_a[sid] + 1
+
+        # 구간 시작점 위도 기준 평면 근사(m)로 선분까지의 수직 거리
+        a_idx, b_idx = span_a[sid], span_b[sid]
+        scale = np.cos(lat_r[a_idx]) * R
+        dx, dy = (lon_r[b_idx] - lon_r[a_idx]) * scale, (lat_r[b_idx] - lat_r[a_idx]) * R
+        px, py = (lon_r[idx] - lon_r[a_idx]) * scale, (lat_r[idx] - lat_r[a_idx]) * R
+        chord_len = np.hypot(dx, dy)
+        dev = np.where(chord_len > 0, np.abs(px * dy - py * dx) / np.where(chord_len > 0, chord_len, 1.0),
+                       np.hypot(px, py))
+
+        # 구간별 최대 거리 정점 (같으면 앞쪽)
+        max_dev = np.maximum.reduceat(dev, first)
+        hit = np.flatnonzero(dev == max_dev[sid])
+        hit = hit[np.r_[True, sid[hit][1:] != sid[hit][:-1]]]
+        split_at = idx[hit]
+
+        arc = cum[span_b] - cum[span_a]
+        chord = haversine_np(lat[span_a], lon[span_a], lat[span_b], lon[span_b])
+        split = (max_dev > tolerance_m) | (arc - chord > max_length_error * arc)
+        if not split.any(): break
+
+        m = split_at[split]
+        keep[m] = True
+        span_a, span_b = np.concatenate([span_a[split], m]), np.concatenate([m, span_b[split]])
+    return np.flatnonzero(keep)
+
 class DataProcessor:
-    def __init__(self, google_api):
+    # engine: "vectorized" (NumPy 컬럼 연산) / "legacy" (기존 순수 파이썬 루프)
+    ENGINES = ("vectorized", "legacy")
+
+    # 이벤트 집계 기준: 급경사(|경사| > 5%) / 정체(속도 < 20km/h)
+    STEEP_GRADE_PCT = 5.0
+    CONGESTION_KPH = 20
+
+    # 고속도로 판정: 속도 80km/h 이상이거나 도로명에 아래 키워드 포함
+    HIGHWAY_KPH = 80
+    HIGHWAY_KEYWORDS = ("고속", "IC", "JC", "순환", "대교", "터널")
+
+    # 선형 단순화 시 허용하는 도로 길이 감소 비율 (구간 거리 오차 상한)
+    SIMPLIFY_MAX_LENGTH_ERROR = 0.005
+
+    # resolution: "fixed" (segment_length 마다 자름) / "adaptive" (거칠게 자른 뒤 변화가 큰 곳만 다시 자름)
+    RESOLUTIONS = ("fixed", "adaptive")
+    # 적응형: 1차는 고정 구간 4개씩 묶은 거친 구간, 아래 기준을 넘는 묶음만 다시 자름
+    # (경사 기준을 넘는 묶음은 segment_length / ADAPTIVE_FINE_FACTOR, 속도 기준만 넘는 묶음은 원래 고정 구간)
+    ADAPTIVE_COARSE_FACTOR = 4
+    ADAPTIVE_FINE_FACTOR = 2
+    ADAPTIVE_GRADE_CHANGE_PCT = 2.0  # 이웃 구간과의 경사 차이 (경사 자체는 STEEP_GRADE_PCT 기준)
+    ADAPTIVE_SPEED_CHANGE_KPH = 20   # 도로의 속도 변화량 (계산기가 도로의 모든 구간에 가속도로 반영)
+
+    # 정적 레이어(구간 geometry + 스무딩 고도) 캐시: 실시간 교통과 무관하므로 길게 보관
+    GEOMETRY_CACHE_NS = "route_geometry"
+    GEOMETRY_CACHE_TTL = 7 * 24 * 3600
+
+    def __init__(self, google_api, engine="vectorized", segment_length=100,
+                 median_window=5, smooth_window=10, simplify_tolerance_m=0,
+                 resolution="fixed", max_elevation_points=None, geometry_cache=None):
+        """
+        median_window / smooth_window: 고도 스무딩 윈도우 크기 (구간 개수 기준)
+        -> 산악 경로에서는 크게 잡아도 필터 비용이 윈도우에 비례해 늘지 않음
+        simplify_tolerance_m: 0 보다 크면 샘플링 전에 도로별 정점을 Douglas-Peucker 로 단순화
+        -> 고속도로 직선 구간의 거의 일직선인 정점들을 건너뜀 (구간 거리 오차는 SIMPLIFY_MAX_LENGTH_ERROR 이내)
+           구간은 남은 정점에서만 잘리므로 정점 간격이 segment_length 보다 넓어지면 구간 수 / 고도 조회 수도 줄어듦
+        resolution="adaptive": 평탄한 고속도로는 거친 구간 그대로, 경사/속도 변화가 큰 곳만 정밀하게
+        -> 급경사 / 경사 변화가 큰 곳은 고정 구간보다 촘촘하게(segment_length / ADAPTIVE_FINE_FACTOR) 자름
+           (정점에서만 자르므로 정점 간격보다 촘촘해지지는 않음, 도심 언덕처럼 정점이 많은 곳에서 효과)
+        -> max_elevation_points 로 경로당 고도 조회 좌표 수 상한 지정 (변화가 큰 곳부터 상한 안에서 정밀화,
+           1차 좌표 수가 이미 상한보다 많으면 경고 후 1차 결과 그대로)
+           상한을 주지 않으면 고정 방식의 좌표 수가 상한 (평탄한 곳에서 아낀 만큼 급경사를 촘촘하게)
+        geometry_cache: ResultCache 처럼 get(ns, key) / put(ns, key, value, ttl) 을 가진 캐시
+        -> 정점 배열이 같은 경로는 샘플링 / 고도 조회 / 스무딩을 건너뛰고 속도·혼잡도만 새로 반영
+           (vectorized + fixed 에서만 사용, 적응형은 속도에 따라 구간이 달라지므로 제외)
+           고도 조회에 실패한(0 / 누락) 좌표가 있는 경로는 저장하지 않음
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"지원하지 않는 engine: {engine} (가능: {self.ENGINES})")
+        if resolution not in self.RESOLUTIONS:
+            raise ValueError(f"지원하지 않는 resolution: {resolution} (가능: {self.RESOLUTIONS})")
+        if resolution == "adaptive" and engine == "legacy":
+            raise ValueError("adaptive resolution 은 vectorized engine 에서만 지원합니다")
         self.google = google_api
+        self.engine = engine
+        self.segment_length = segment_length
+        self.median_window = median_window
+        self.smooth_window = smooth_window
+        self.simplify_tolerance_m = simplify_tolerance_m
+        self.simplify_stats = {"vertices_in": 0, "vertices_out": 0}
+        self.resolution = resolution
+        self.max_elevation_points = max_elevation_points
+        # 적응형 통계: 실제 조회 좌표 수 / 고정 방식이었다면 조회했을 좌표 수 / 정밀화한 거친 구간 수
+        # (그중 고정 구간보다 촘촘하게 자른 수)
+        self.adaptive_stats = {"points": 0, "fixed_points": 0, "refined": 0, "fine": 0, "coarse": 0}
+        self.geometry_cache = geometry_cache
 
-    # 1. 중앙값 필터
-    def apply_median_filter(self, elevations, window_size=5):
+    # 1. 중앙값 필터 (정렬된 슬라이딩 윈도우: 한 칸 이동 시 1개 삽입 / 1개 삭제)
+    def apply_median_filter(self, elevations, window_size=None):
         if not elevations: return []
+        if window_size is None: window_size = self.median_window
+        if self.engine == "legacy":
+            return self._median_filter_legacy(elevations, window_size)
+
         filtered = []
         half = window_size // 2
         length = len(elevations)
+        window = []
+        lo, hi = 0, 0   # 현재 window 에 들어 있는 원소 범위 [lo, hi)
         for i in range(length):
             start = max(0, i - half)
             end = min(length, i + half + 1)
-            filtered.append(statistics.median(elevations[start:end]))
+            while hi < end:
+                insort(window, elevations[hi])
+                hi += 1
+            while lo < start:
+                del window[bisect_left(window, elevations[lo])]
+                lo += 1
+
+            n = len(window)
+            mid = n // 2
+            if n % 2: filtered.append(window[mid])
+            else: filtered.append((window[mid - 1] + window[mid]) / 2)
         return filtered
 
-    # 2. 이동 평균 필터
-    def apply_moving_average(self, elevations, window_size=10):
+    # 2. 이동 평균 필터 (누적합으로 구간합을 O(1)에 계산, 양 끝은 기존처럼 윈도우가 줄어듦)
+    def apply_moving_average(self, elevations, window_size=None):
         if not elevations: return []
+        if window_size is None: window_size = self.smooth_window
+        if self.engine == "legacy":
+            return self._moving_average_legacy(elevations, window_size)
+
+        half = window_size // 2
+        length = len(elevations)
+        prefix = np.zeros(length + 1)
+        np.cumsum(np.asarray(elevations, dtype=np.float64), out=prefix[1:])
+
+        idx = np.arange(length)
+        start = np.maximum(0, idx - half)
+        end = np.minimum(length, idx + half + 1)
+        return ((prefix[end] - prefix[start]) / (end - start)).tolist()
+
+    def _median_filter_legacy(self, elevations, window_size):
+        filtered = []
+        half = window_size // 2
+        length = len(elevations)
+        for i in range(length):
+            start = max(0, i - half)
+            end = min(length, i + half + 1)
+            filtered.append(statistics.median(elevations[start:end]))
+        return filtered
+
+    def _moving_average_legacy(self, elevations, window_size):
         smoothed = []
         half = window_size // 2
         length = len(elevations)
@@ -42,176 +240,645 @@ class DataProcessor:
             smoothed.append(sum(subset) / len(subset))
         return smoothed
 
-    def process_route(self, route_data):
-        processed_segments = []
-        coords_to_query = [] 
-        temp_segments = []
-
-        sections = route_data.get('sections', [])
-        prev_speed = 0
-
-        # --- 1. 파싱 및 샘플링 ---
-        for section in sections:
-            roads = section.get('roads', [])
-            for road in roads:
+    def _iter_roads(self, route_data):
+        """카카오 응답에서 (도로명, 속도, 혼잡도, vertexes) 를 순서대로 꺼냄"""
+        for section in route_data.get('sections', []):
+            for road in section.get('roads', []):
                 name = road.get('name', '일반 도로')
                 speed = road.get('traffic_speed', 0)
                 if speed <= 0: speed = road.get('limit_speed', 30)
                 state = road.get('traffic_state', 0)
-                
+
                 vertexes = road.get('vertexes') or road.get('vertex')
                 if not vertexes: continue
+                yield name, speed, state, vertexes
+
+    def _simplify(self, lat, lon, bounds=None):
+        """샘플링용 좌표(소수 6자리)에서 남길 정점 번호 (거리 오차 상한이 샘플링 좌표 기준으로 성립)"""
+        keep = simplify_polyline(lat, lon, self.simplify_tolerance_m, self.SIMPLIFY_MAX_LENGTH_ERROR, bounds)
+        self.simplify_stats['vertices_in'] += len(lat)
+        self.simplify_stats['vertices_out'] += len(keep)
+        return keep
+
+    # 3-A. 기존 방식 (정점마다 파이썬 루프)
+    def _sample_segments_legacy(self, route_data):
+        temp_segments = []
+        prev_speed = 0
+        cut_len = self.segment_length
 
-                path_coords = []
-                for i in range(0, len(vertexes), 2):
-                    if i+1 < len(vertexes):
-                        lat = round(vertexes[i+1], 6)
-                        lon = round(vertexes[i], 6)
-                        path_coords.append((lat, lon))
+        for name, speed, state, vertexes in self._iter_roads(route_data):
+            path_coords = []
+            for i in range(0, len(vertexes), 2):
+                if i+1 < len(vertexes):
+                    lat = round(vertexes[i+1], 6)
+                    lon = round(vertexes[i], 6)
+                    path_coords.append((lat, lon))
 
-                if not path_coords: continue
+            if not path_coords: continue
+            if self.simplify_tolerance_m > 0:
+                keep = self._simplify([p[0] for p in path_coords], [p[1] for p in path_coords])
+                path_coords = [path_coords[i] for i in keep.tolist()]
 
-                start_pt = path_coords[0]
-                accumulated_dist = 0
-                segment_path_dist = 0
+            start_pt = path_coords[0]
+            accumulated_dist = 0
+            segment_path_dist = 0
 
-                for i in range(len(path_coords) - 1):
-                    curr_pt = path_coords[i]
-                    next_pt = path_coords[i+1]
+            for i in range(len(path_coords) - 1):
+                curr_pt = path_coords[i]
+                next_pt = path_coords[i+1]
+                
+                step_dist = haversine(curr_pt[0], curr_pt[1], next_pt[0], next_pt[1])
+                accumulated_dist += step_dist
+                segment_path_dist += step_dist
+                
+                if accumulated_dist >= cut_len or i == len(path_coords) - 2:
+                    end_pt = next_pt
+                    
+                    delta_v = speed - prev_speed
                     
-                    step_dist = haversine(curr_pt[0], curr_pt[1], next_pt[0], next_pt[1])
-                    accumulated_dist += step_dist
-                    segment_path_dist += step_dist
+                    straight_dist = haversine(start_pt[0], start_pt[1], end_pt[0], end_pt[1])
+                    sinuosity = segment_path_dist / straight_dist if straight_dist > 0 else 1.0
                     
-                    if accumulated_dist >= 100 or i == len(path_coords) - 2:
-                        end_pt = next_pt
-                        coords_to_query.append(start_pt)
-                        coords_to_query.append(end_pt)
-                        
-                        delta_v = speed - prev_speed
-                        
-                        straight_dist = haversine(start_pt[0], start_pt[1], end_pt[0], end_pt[1])
-                        sinuosity = segment_path_dist / straight_dist if straight_dist > 0 else 1.0
-                        
-                        temp_segments.append({
-                            "name": name,
-                            "distance_m": accumulated_dist,
-                            "speed_kph": speed,
-                            "congestion": state,
-                            "delta_v": delta_v,
-                            "p_start": start_pt,
-                            "p_end": end_pt,
-                            "sinuosity": sinuosity
-                        })
-                        
-                        start_pt = end_pt
-                        accumulated_dist = 0
-                        segment_path_dist = 0
-                prev_speed = speed
-
-        # --- 2. 구글 API 호출 ---
-        if not coords_to_query: return []
+                    temp_segments.append({
+                        "name": name,
+                        "distance_m": accumulated_dist,
+                        "speed_kph": speed,
+                        "congestion": state,
+                        "delta_v": delta_v,
+                        "p_start": start_pt,
+                        "p_end": end_pt,
+                        "sinuosity": sinuosity
+                    })
+                    
+                    start_pt = end_pt
+                    accumulated_dist = 0
+                    segment_path_dist = 0
+            prev_speed = speed
+
+        return temp_segments
+
+    # 3-B. 벡터화 방식 (정점 배열 -> 누적거리 -> searchsorted 로 절단점 탐색)
+    def _sample_segments_vectorized(self, route_data):
+        """
+        모든 도로의 정점을 하나의 배열로 이어 붙인 뒤
+        1) 구간 거리를 벡터 haversine 으로 한 번에 계산하고
+        2) 모든 정점에서 "다음 100m 절단점"을 searchsorted 1번으로 미리 구한 뒤 (도로 끝에서 자름)
+        3) 도로 시작점부터 그 번호를 따라가며 구간을 만든다.
+        반환값은 컬럼(배열) 형태의 구간 테이블이다. (적응형 묶음용 정점 배열 / 절단 정점 번호 포함)
+        """
+        geometry = self._route_geometry(route_data)
+        cum, bounds = geometry['cum'], geometry['bounds']
+        seg_road, seg_start, seg_end = [], [], []
+        if not bounds:
+            return self._segments_from_cuts(geometry, seg_road, seg_start, seg_end)
+
+        road_last = np.repeat([b - 1 for _, b in bounds], [b - a for a, b in bounds])
+        next_cut = np.minimum(np.searchsorted(cum, cum + self.segment_length, side='left'), road_last).tolist()
+        for r_idx, (a, b) in enumerate(bounds):
+            s = a
+            last = b - 1
+            while s < last:
+                k = next_cut[s]
+                seg_road.append(r_idx)
+                seg_start.append(s)
+                seg_end.append(k)
+                s = k
+        return self._segments_from_cuts(geometry, seg_road, seg_start, seg_end)
+
+    def _route_geometry(self, route_data):
+        """경로 1개 -> 이어 붙인 정점 배열 {roads, lat, lon, cum(도로 안 누적거리), bounds(도로별 정점 범위)}"""
+        roads = []        # (name, speed, state, delta_v)
+        lat_parts, lon_parts, bounds = [], [], []
+        prev_speed = 0
+        offset = 0
+
+        for name, speed, state, vertexes in self._iter_roads(route_data):
+            n_pts = len(vertexes) // 2
+            if n_pts == 0: continue
+
+            flat = np.asarray(vertexes[:n_pts * 2], dtype=np.float64).reshape(-1, 2)
+            lat_parts.append(flat[:, 1])
+            lon_parts.append(flat[:, 0])
+            bounds.append((offset, offset + n_pts))
+            roads.append((name, speed, state, speed - prev_speed))
+            offset += n_pts
+            prev_speed = speed
+
+        if not roads:
+            return {"roads": roads, "lat": np.zeros(0), "lon": np.zeros(0), "cum": np.zeros(0), "bounds": bounds}
+
+        # 기존 방식(파이썬 round)과 같은 좌표 -> 같은 구간 거리 / 고도 캐시 키
+        lat = round_coords(np.concatenate(lat_parts))
+        lon = round_coords(np.concatenate(lon_parts))
+        if self.simplify_tolerance_m > 0:
+            # 도로 경계(첫/끝 정점)는 항상 남으므로 남은 정점 번호에서 새 범위를 찾음
+            keep = self._simplify(lat, lon, bounds)
+            lat, lon = lat[keep], lon[keep]
+            bounds = list(zip(np.searchsorted(keep, [a for a, _ in bounds]).tolist(),
+                              (np.searchsorted(keep, [b - 1 for _, b in bounds]) + 1).tolist()))
+
+        # 인접 정점 간 거리 (도로 경계를 넘는 쌍은 0으로 만들어 누적에서 제외)
+        step = np.zeros(len(lat))
+        step[1:] = haversine_np(lat[:-1], lon[:-1], lat[1:], lon[1:])
+        step[[b[0] for b in bounds]] = 0.0
+        return {"roads": roads, "lat": lat, "lon": lon, "cum": np.cumsum(step), "bounds": bounds}
+
+    def _segments_from_cuts(self, geometry, seg_road, seg_start, seg_end):
+        """구간별 (도로 번호, 시작 정점, 끝 정점) -> 구간 테이블 (거리 / 굴곡도 / 양 끝 좌표)"""
+        lat, lon, cum = geometry['lat'], geometry['lon'], geometry['cum']
+        if not len(seg_road):
+            return {"road_idx": np.zeros(0, dtype=np.int64), "distance_m": np.zeros(0),
+                    "sinuosity": np.zeros(0), "start_lat": np.zeros(0), "start_lon": np.zeros(0),
+                    "end_lat": np.zeros(0), "end_lon": np.zeros(0), "roads": geometry['roads'],
+                    "seg_start": np.zeros(0, dtype=np.intp), "seg_end": np.zeros(0, dtype=np.intp),
+                    "geometry": geometry}
+
+        seg_road = np.asarray(seg_road)
+        i_s = np.asarray(seg_start)
+        i_e = np.asarray(seg_end)
+        dist = cum[i_e] - cum[i_s]
+        straight = haversine_np(lat[i_s], lon[i_s], lat[i_e], lon[i_e])
+        safe = np.where(straight > 0, straight, 1.0)
+        sinuosity = np.where(straight > 0, dist / safe, 1.0)
+
+        return {
+            "road_idx": seg_road,
+            "distance_m": dist,
+            "sinuosity": sinuosity,
+            "start_lat": lat[i_s], "start_lon": lon[i_s],
+            "end_lat": lat[i_e], "end_lon": lon[i_e],
+            "roads": geometry['roads'],
+            "seg_start": i_s, "seg_end": i_e, "geometry": geometry
+        }
+
+    def _columns_to_sampled(self, table):
+        """벡터화 샘플링 결과 -> 샘플 컬럼 (도로 단위 값은 구간 수만큼 펼침, 이름은 도로 번호로 참조)"""
+        roads = table['roads']
+        road_idx = table['road_idx']
+        speed = np.asarray([r[1] for r in roads], dtype=np.float64)
+        state = np.asarray([r[2] for r in roads], dtype=np.int64)
+        delta_v = np.asarray([r[3] for r in roads], dtype=np.float64)
+        return {
+            "names": [r[0] for r in roads],
+            "name_idx": road_idx,
+            "distance_m": table['distance_m'].tolist(),
+            "speed_kph": speed[road_idx].tolist() if len(roads) else [],
+            "congestion": state[road_idx].tolist() if len(roads) else [],
+            "delta_v": delta_v[road_idx].tolist() if len(roads) else [],
+            "sinuosity": table['sinuosity'].tolist(),
+            "p_start": list(zip(table['start_lat'].tolist(), table['start_lon'].tolist())),
+            "p_end": list(zip(table['end_lat'].tolist(), table['end_lon'].tolist()))
+        }
+
+    def _dicts_to_sampled(self, temp_segments):
+        """기존 방식(dict 리스트) 샘플링 결과 -> 샘플 컬럼"""
+        table = SegmentTable.from_dicts([{"name": item['name']} for item in temp_segments])
+        sampled = {"names": table.names, "name_idx": table.name_idx}
+        for key in ("distance_m", "speed_kph", "congestion", "delta_v", "sinuosity", "p_start", "p_end"):
+            sampled[key] = [item[key] for item in temp_segments]
+        return sampled
+
+    def _sample_segments(self, route_data):
+        """경로 1개 -> 샘플 컬럼 {names, name_idx, distance_m, speed_kph, congestion, delta_v, sinuosity, p_start, p_end}"""
+        if self.engine == "legacy":
+            return self._dicts_to_sampled(self._sample_segments_legacy(route_data))
+        table = self._sample_segments_vectorized(route_data)
+        if self.resolution == "adaptive":
+            return self._coarsen(table)
+        return self._columns_to_sampled(table)
+
+    def _coarsen(self, table):
+        """
+        [적응형 1차] 도로 안에서 고정 구간을 ADAPTIVE_COARSE_FACTOR 개씩 묶은 거친 샘플 컬럼
+        (도로 경계는 넘지 않음, 정밀화 때 되돌릴 고정 구간 테이블을 'fine' 으로 함께 보관)
+        """
+        road_idx = table['road_idx']
+        m = len(road_idx)
+        pos = np.arange(m)
+        road_first = np.r_[True, road_idx[1:] != road_idx[:-1]] if m else np.zeros(0, dtype=bool)
+        pos_in_road = pos - np.maximum.accumulate(np.where(road_first, pos, 0)) if m else pos
+        group_first = np.flatnonzero(road_first | (pos_in_road % self.ADAPTIVE_COARSE_FACTOR == 0))
+        group_last = np.r_[group_first[1:] - 1, m - 1] if m else group_first
+
+        coarse = self._segments_from_cuts(table['geometry'], road_idx[group_first],
+                                          table['seg_start'][group_first], table['seg_end'][group_last])
+        sampled = self._columns_to_sampled(coarse)
+        sampled['fine'] = table
+        sampled['group_first'] = group_first
+        return sampled
+
+    def _refine_adaptive(self, cols, alt_map):
+        """
+        [적응형 2차] 거친 구간의 고도(1차 조회 결과)로 경사를 구해서
+        - 경사가 급하거나(STEEP_GRADE_PCT) 이웃 구간과 경사 차이가 큰(ADAPTIVE_GRADE_CHANGE_PCT) 묶음은
+          segment_length / ADAPTIVE_FINE_FACTOR 마다 다시 자름
+        - 도로의 속도 변화만 큰(ADAPTIVE_SPEED_CHANGE_KPH) 묶음은 원래 고정 구간으로 되돌림
+        max_elevation_points(없으면 고정 방식의 좌표 수) 안에서 기준을 많이 넘는 묶음부터 정밀화
+        """
+        fine, group_first = cols['fine'], cols['group_first']
+        n = len(group_first)
+        fine_sampled = self._columns_to_sampled(fine)
+        fixed_points = len(dict.fromkeys(fine_sampled['p_start'] + fine_sampled['p_end']))
+        self.adaptive_stats['fixed_points'] += fixed_points
+        self.adaptive_stats['coarse'] += n
+        if not n: return fine_sampled
+
+        elev_s = np.asarray([alt_map.get(pt, 0) for pt in cols['p_start']], dtype=np.float64)
+        elev_e = np.asarray([alt_map.get(pt, 0) for pt in cols['p_end']], dtype=np.float64)
+        dist = np.asarray(cols['distance_m'], dtype=np.float64)
+        grade = np.zeros(n)
+        np.divide((elev_e - elev_s) * 100, dist, out=grade, where=dist > 0)
+
+        grade_change = np.zeros(n)
+        if n > 1:
+            diff = np.abs(np.diff(grade))
+            grade_change[1:] = diff
+            grade_change[:-1] = np.maximum(grade_change[:-1], diff)
+        speed_change = np.abs(np.asarray(cols['delta_v'], dtype=np.float64))
+
+        grade_score = np.maximum(np.abs(grade) / self.STEEP_GRADE_PCT, grade_change / self.ADAPTIVE_GRADE_CHANGE_PCT)
+        score = np.maximum(grade_score, speed_change / self.ADAPTIVE_SPEED_CHANGE_KPH)
+
+        # 묶음별 정점 범위 / 묶음을 풀면 늘어나는 좌표 수 = 묶음 안 고정 구간 수 - 1
+        n_fixed = np.diff(np.r_[group_first, len(fine['road_idx'])])
+        extra = (n_fixed - 1).tolist()
+        coarse_start = fine['seg_start'][group_first].tolist()
+        coarse_end = fine['seg_end'][group_first + n_fixed - 1].tolist()
+
+        # 경사 기준을 넘는 묶음: segment_length / ADAPTIVE_FINE_FACTOR 마다 정점에서 자른 구간 (묶음 경계는 넘지 않음)
+        fine_cuts = {}
+        steep = np.flatnonzero(grade_score >= 1).tolist()
+        if steep:
+            cum = fine['geometry']['cum']
+            next_cut = np.searchsorted(cum, cum + self.segment_length / self.ADAPTIVE_FINE_FACTOR, side='left').tolist()
+            for i in steep:
+                s, e = coarse_start[i], coarse_end[i]
+                cuts = [s]
+                while s < e:
+                    s = min(next_cut[s], e)
+                    cuts.append(s)
+                # 고정 구간보다 촘촘해지지 않으면(정점 간격이 넓은 곳) 고정 구간으로 되돌리는 것과 같음
+                if len(cuts) - 1 > n_fixed[i]:
+                    fine_cuts[i] = cuts
+
+        # level: 0 = 거친 구간 그대로 / 1 = 원래 고정 구간 / 2 = 고정 구간보다 촘촘하게
+        # 기준을 넘는 묶음을 먼저 고정 구간으로 되돌리고, 남은 상한으로 경사가 큰 묶음부터 촘촘하게 자름
+        level = [0] * n
+        order = [i for i in np.argsort(-score, kind='stable').tolist() if score[i] >= 1]
+        budget = self.max_elevation_points if self.max_elevation_points is not None else fixed_points
+        points = len(dict.fromkeys(cols['p_start'] + cols['p_end']))
+        if points > budget:
+            print(f"      ⚠️ [Adaptive] 1차 좌표 {points:,}개가 상한 {budget:,}개를 넘어 정밀화 없이 진행합니다")
+            order = []
+        for i in order:
+            if 0 < extra[i] <= budget - points:
+                level[i] = 1
+                points += extra[i]
+        for i in order:
+            if i not in fine_cuts: continue
+            cost = len(fine_cuts[i]) - 2 - (extra[i] if level[i] else 0)
+            if cost <= budget - points:
+                level[i] = 2
+                points += cost
+
+        # 묶음 순서대로 거친 구간 / 고정 구간 / 촘촘한 구간을 이어 붙임
+        fine_road = fine['road_idx'].tolist()
+        fine_start = fine['seg_start'].tolist()
+        fine_end = fine['seg_end'].tolist()
+        seg_road, seg_start, seg_end = [], [], []
+        for i, first in enumerate(group_first.tolist()):
+            if level[i] == 0:
+                seg_road.append(fine_road[first])
+                seg_start.append(coarse_start[i])
+                seg_end.append(coarse_end[i])
+            elif level[i] == 1:
+                last = first + extra[i] + 1
+                seg_road.extend(fine_road[first:last])
+                seg_start.extend(fine_start[first:last])
+                seg_end.extend(fine_end[first:last])
+            else:
+                cuts = fine_cuts[i]
+                seg_road.extend([fine_road[first]] * (len(cuts) - 1))
+                seg_start.extend(cuts[:-1])
+                seg_end.extend(cuts[1:])
+
+        sampled = self._columns_to_sampled(self._segments_from_cuts(fine['geometry'], seg_road, seg_start, seg_end))
+        self.adaptive_stats['points'] += len(dict.fromkeys(sampled['p_start'] + sampled['p_end']))
+        self.adaptive_stats['refined'] += sum(1 for lv in level if lv)
+        self.adaptive_stats['fine'] += level.count(2)
+        return sampled
+
+    def _fetch_elevations(self, coords_to_query):
+        """중복 좌표를 제거하고 한 번에 고도 조회 -> {(lat, lon): 고도}"""
+        if not coords_to_query: return {}
         unique_coords = list(dict.fromkeys(coords_to_query))
         raw_elevations = self.google.get_elevations_bulk(unique_coords)
-        alt_map = {pt: alt for pt, alt in zip(unique_coords, raw_elevations)}
+        return {pt: alt for pt, alt in zip(unique_coords, raw_elevations)}
 
-        merged_data = []
-        for item in temp_segments:
-            item['start_alt'] = alt_map.get(item.pop('p_start'), 0)
-            item['end_alt'] = alt_map.get(item.pop('p_end'), 0)
-            merged_data.append(item)
+    def process_route(self, route_data):
+        return self.process_routes([route_data])[0]
+
+    def process_routes(self, routes, with_events=False):
+        """
+        [배치 처리] 여러 경로(추천/최단/무료)를 한 번에 처리
+        - 모든 경로의 샘플 좌표 합집합으로 고도를 1회만 조회 (겹치는 구간은 1번만 요청)
+        - 필터링은 경로별로 따로 수행, 입력 순서대로 구간 테이블(SegmentTable)을 반환
+          (dict 리스트가 필요하면 table.to_dicts())
+        - with_events=True 면 [(구간 테이블, 이벤트 통계)] 형태로 반환
+          이벤트 통계: uphill(급경사) / congestion(정체) / tunnel·real·neighbor_avg(필터 보정 횟수)
+        """
+        # --- 0. 정적 레이어 캐시 확인 (정점 배열이 같으면 1~3 단계의 고도/스무딩 결과를 재사용) ---
+        keys = [None] * len(routes)
+        layers = [None] * len(routes)
+        if self._use_geometry_cache():
+            with metrics.span("geometry_cache"):
+                keys = [self._geometry_key(route) for route in routes]
+                layers = [self.geometry_cache.get(self.GEOMETRY_CACHE_NS, key) for key in keys]
+            reused = sum(layer is not None for layer in layers)
+            if reused:
+                print(f"      ♻️ [Incremental] 정적 레이어 재사용 {reused}/{len(routes)}개 경로 (교통 정보만 갱신)")
+        todo = [i for i, layer in enumerate(layers) if layer is None]
+
+        # --- 1. 파싱 및 샘플링 ---
+        before = dict(self.simplify_stats)
+        with metrics.span("sampling"):
+            sampled = [self._sample_segments(routes[i]) for i in todo]
+        if self.simplify_tolerance_m > 0:
+            v_in = self.simplify_stats['vertices_in'] - before['vertices_in']
+            v_out = self.simplify_stats['vertices_out'] - before['vertices_out']
+            if v_in:
+                print(f"      📐 [Simplify] 정점 {v_in:,} -> {v_out:,}개 ({1 - v_out / v_in:.1%} 감소, "
+                      f"허용 오차 {self.simplify_tolerance_m}m)")
+
+        coords_to_query = []
+        for cols in sampled:
+            for p_start, p_end in zip(cols['p_start'], cols['p_end']):
+                coords_to_query.append(p_start)
+                coords_to_query.append(p_end)
+
+        # --- 2. 구글 API 호출 (전체 경로 1회) ---
+        with metrics.span("elevation"):
+            alt_map = self._fetch_elevations(coords_to_query)
+
+        # --- 2-1. 적응형: 변화가 큰 구간만 다시 자르고, 새로 생긴 좌표만 1회 더 조회 ---
+        if self.resolution == "adaptive":
+            before = dict(self.adaptive_stats)
+            with metrics.span("refine"):
+                sampled = [self._refine_adaptive(cols, alt_map) for cols in sampled]
+            extra = [pt for cols in sampled for pt in cols['p_start'] + cols['p_end'] if pt not in alt_map]
+            with metrics.span("elevation"):
+                alt_map.update(self._fetch_elevations(extra))
+
+            points = self.adaptive_stats['points'] - before['points']
+            fixed_points = self.adaptive_stats['fixed_points'] - before['fixed_points']
+            refined = self.adaptive_stats['refined'] - before['refined']
+            finer = self.adaptive_stats['fine'] - before['fine']
+            coarse = self.adaptive_stats['coarse'] - before['coarse']
+            if coarse:
+                print(f"      🎯 [Adaptive] 고도 좌표 {points:,}개 (고정 {self.segment_length}m 대비 "
+                      f"{points - fixed_points:+,}개) / 정밀화 {refined}/{coarse} 구간 "
+                      f"(그중 {finer}개는 {self.segment_length / self.ADAPTIVE_FINE_FACTOR:g}m)")
+
+        results = [None] * len(routes)
+        with metrics.span("filter"):
+            for i, cols in zip(todo, sampled):
+                smoothed_elevs = self._smooth_elevations(cols, alt_map)
+                # 0 / 누락은 고도 조회 실패 값이므로 저장하지 않음 (CachedElevation 과 같은 기준, 다음에 다시 조회)
+                if keys[i] is not None and all(alt_map.get(pt) for pt in cols['p_start'] + cols['p_end']):
+                    self.geometry_cache.put(self.GEOMETRY_CACHE_NS, keys[i], self._static_layer(cols, smoothed_elevs),
+                                            self.GEOMETRY_CACHE_TTL)
+                elif keys[i] is not None:
+                    print("      ⚠️ [Incremental] 고도 조회 실패 좌표가 있어 정적 레이어를 저장하지 않습니다")
+                results[i] = self._build_route(cols, smoothed_elevs)
+            for i, layer in enumerate(layers):
+                if layer is not None:
+                    results[i] = self._build_route(self._apply_traffic(layer, routes[i]), layer['smoothed'])
+        if with_events:
+            return results
+        return [segments for segments, _ in results]
+
+    def _use_geometry_cache(self):
+        return self.geometry_cache is not None and self.engine == "vectorized" and self.resolution == "fixed"
+
+    def _geometry_key(self, route_data):
+        """정적 레이어 캐시 키: 도로명 + 정점 배열 해시 + 결과에 영향을 주는 처리 설정 (교통 정보는 제외)"""
+        h = hashlib.sha256()
+        for name, _, _, vertexes in self._iter_roads(route_data):
+            h.update(name.encode("utf-8") + b"\0")
+            raw = np.asarray(vertexes, dtype=np.float64).tobytes()
+            h.update(len(raw).to_bytes(8, "little") + raw)
+        return make_key(self.GEOMETRY_CACHE_NS, h.hexdigest(), self.segment_length, self.median_window,
+                        self.smooth_window, self.simplify_tolerance_m)
+
+    def _static_layer(self, cols, smoothed_elevs):
+        """교통 정보와 무관한 부분만 (도로명 / 구간별 도로 번호 / 거리 / 굴곡도 / 스무딩 고도)"""
+        return {"names": list(cols['names']), "name_idx": np.asarray(cols['name_idx']).tolist(),
+                "distance_m": list(cols['distance_m']), "sinuosity": list(cols['sinuosity']),
+                "smoothed": list(smoothed_elevs)}
+
+    def _apply_traffic(self, layer, route_data):
+        """정적 레이어 + 새 응답의 도로별 속도/혼잡도 -> 샘플 컬럼 (정점은 파싱하지 않음)"""
+        roads = [(speed, state) for _, speed, state, vertexes in self._iter_roads(route_data) if len(vertexes) // 2]
+        speed = np.asarray([r[0] for r in roads], dtype=np.float64)
+        state = np.asarray([r[1] for r in roads], dtype=np.int64)
+        delta_v = np.diff(speed, prepend=0.0)
+        road_idx = np.asarray(layer['name_idx'], dtype=np.intp)
+        return {
+            "names": layer['names'], "name_idx": road_idx,
+            "distance_m": layer['distance_m'], "sinuosity": layer['sinuosity'],
+            "speed_kph": speed[road_idx].tolist(),
+            "congestion": state[road_idx].tolist(),
+            "delta_v": delta_v[road_idx].tolist()
+        }
+
+    def _smooth_elevations(self, cols, alt_map):
+        """샘플 컬럼 + 고도 -> 구간 경계(구간 수 + 1개)의 스무딩 고도"""
+        if not len(cols['distance_m']): return []
+        raw_elevs = [alt_map.get(pt, 0) for pt in cols['p_start']]
+        raw_elevs.append(alt_map.get(cols['p_end'][-1], 0))
+
+        median_elevs = self.apply_median_filter(raw_elevs)
+        return self.apply_moving_average(median_elevs)
+
+    def _build_route(self, cols, smoothed_elevs):
+        """샘플 컬럼 + 스무딩 고도 -> 필터링된 SegmentTable, 이벤트 통계"""
+        stats = {"tunnel": 0, "real": 0, "neighbor_avg": 0, "uphill": 0, "congestion": 0}
+        names, name_idx = cols['names'], cols['name_idx']
+        distances, speeds, sinuosities = cols['distance_m'], cols['speed_kph'], cols['sinuosity']
+        n = len(distances)
+        start_alts, end_alts, grades = [], [], []
 
         # --- 3. 필터링 및 재구성 ---
-        if merged_data:
-            raw_elevs = [d['start_alt'] for d in merged_data]
-            raw_elevs.append(merged_data[-1]['end_alt'])
+        if n:
+            if self.engine == "legacy":
+                seg_names = [names[j] for j in np.asarray(name_idx).tolist()]
+                start_alts, end_alts, grades = self._grade_filter_legacy(
+                    smoothed_elevs, seg_names, distances, speeds, sinuosities, stats)
+            else:
+                start_alts, end_alts, grades = self._grade_filter(
+                    smoothed_elevs, names, name_idx, distances, speeds, sinuosities, stats)
+
+        table = SegmentTable(names, name_idx, {
+            "distance_m": distances, "speed_kph": speeds, "congestion": cols['congestion'],
+            "delta_v": cols['delta_v'], "sinuosity": sinuosities,
+            "start_alt": start_alts, "end_alt": end_alts, "grade_pct": grades
+        })
+        if n:
+            print(f"      ✂️ [Filter] 터널{stats['tunnel']}회 / 산악{stats['real']}회 / 이웃보정{stats['neighbor_avg']}회")
+        
+        return table, stats
+
+    # 4-A. 경사 필터 (기존 방식: 구간마다 모든 판정을 파이썬 루프로)
+    def _grade_filter_legacy(self, smoothed_elevs, seg_names, distances, speeds, sinuosities, stats):
+        n = len(distances)
+        start_alts, end_alts, grades = [], [], []
+        current_alt = smoothed_elevs[0]
+        
+        # 이전 구간의 확정된 경사도 저장용 (초기값 0)
+        prev_final_grade = 0
+
+        for i in range(n):
+            dist = distances[i]
             
-            median_elevs = self.apply_median_filter(raw_elevs, window_size=5)
-            smoothed_elevs = self.apply_moving_average(median_elevs, window_size=10)
+            # 현재 스무딩 데이터 기준 다음 높이
+            target_next = smoothed_elevs[i+1]
             
-            current_alt = smoothed_elevs[0]
-            stats = {"tunnel": 0, "real": 0, "neighbor_avg": 0}
+            if dist > 0:
+                raw_grade = ((target_next - current_alt) / dist) * 100
+            else:
+                raw_grade = 0
             
-            # 이전 구간의 확정된 경사도 저장용 (초기값 0)
-            prev_final_grade = 0
-
-            for i, item in enumerate(merged_data):
-                dist = item['distance_m']
-                
-                # 현재 스무딩 데이터 기준 다음 높이
-                target_next = smoothed_elevs[i+1]
-                
-                if dist > 0:
-                    raw_grade = ((target_next - current_alt) / dist) * 100
-                else:
-                    raw_grade = 0
-                
-                speed = item['speed_kph']
-                sinuosity = item['sinuosity']
-                is_highway = (speed >= 80) or any(k in item['name'] for k in ["고속", "IC", "JC", "순환", "대교", "터널"])
-                
-                final_grade = raw_grade
+            speed = speeds[i]
+            sinuosity = sinuosities[i]
+            is_highway = (speed >= self.HIGHWAY_KPH) or any(k in seg_names[i] for k in self.HIGHWAY_KEYWORDS)
+            
+            final_grade = raw_grade
 
-                # ==================================================
-                # 🚦 [필터링 로직]
-                # ==================================================
-                if is_highway:
-                    # 고속도로: 기존 로직 유지 (엄격)
-                    if abs(raw_grade) < 0.5:
+            # ==================================================
+            # 🚦 [필터링 로직]
+            # ==================================================
+            if is_highway:
+                # 고속도로: 기존 로직 유지 (엄격)
+                if abs(raw_grade) < 0.5:
+                    final_grade = 0
+                elif abs(raw_grade) > 7.0:
+                    if sinuosity < 1.05:
                         final_grade = 0
-                    elif abs(raw_grade) > 7.0:
-                        if sinuosity < 1.05:
-                            final_grade = 0
-                            stats["tunnel"] += 1
-                        else:
-                            limit = 5.0
-                            if raw_grade > limit: final_grade = limit
-                            elif raw_grade < -limit: final_grade = -limit
-                            stats["real"] += 1
+                        stats["tunnel"] += 1
                     else:
                         limit = 5.0
                         if raw_grade > limit: final_grade = limit
                         elif raw_grade < -limit: final_grade = -limit
+                        stats["real"] += 1
                 else:
-                    # [일반도로] 15% 초과 시 이웃 평균 보정
-                    if abs(raw_grade) > 15.0:
-                        # 1. 다음 구간의 예상 경사도 계산 (Look-ahead)
-                        next_grade_est = 0
-                        if i + 1 < len(merged_data):
-                            next_dist = merged_data[i+1]['distance_m']
-                            # i+1번째와 i+2번째 고도 차이 이용
-                            if i + 2 < len(smoothed_elevs) and next_dist > 0:
-                                next_grade_est = ((smoothed_elevs[i+2] - smoothed_elevs[i+1]) / next_dist) * 100
-                        
-                        # 2. 이전 구간(prev_final_grade)과 다음 구간(next_grade_est)의 평균
-                        avg_grade = (prev_final_grade + next_grade_est) / 2
-                        
-                        # 3. 그래도 너무 크면 15%로 안전 제한 (Safety Clamp)
-                        if avg_grade > 15.0: avg_grade = 15.0
-                        elif avg_grade < -15.0: avg_grade = -15.0
-                        
-                        final_grade = avg_grade
-                        stats["neighbor_avg"] += 1
+                    limit = 5.0
+                    if raw_grade > limit: final_grade = limit
+                    elif raw_grade < -limit: final_grade = -limit
+            else:
+                # [일반도로] 15% 초과 시 이웃 평균 보정
+                if abs(raw_grade) > 15.0:
+                    # 1. 다음 구간의 예상 경사도 계산 (Look-ahead)
+                    next_grade_est = 0
+                    if i + 1 < n:
+                        next_dist = distances[i+1]
+                        # i+1번째와 i+2번째 고도 차이 이용
+                        if i + 2 < len(smoothed_elevs) and next_dist > 0:
+                            next_grade_est = ((smoothed_elevs[i+2] - smoothed_elevs[i+1]) / next_dist) * 100
                     
-                    # 15% 이하는 그대로 인정
-                    else:
-                        final_grade = raw_grade
-
-                # 재구성
-                next_alt = current_alt + (dist * final_grade / 100)
-                
-                item['start_alt'] = current_alt
-                item['end_alt'] = next_alt
-                item['grade_pct'] = final_grade
-                
-                processed_segments.append(item)
+                    # 2. 이전 구간(prev_final_grade)과 다음 구간(next_grade_est)의 평균
+                    avg_grade = (prev_final_grade + next_grade_est) / 2
+                    
+                    # 3. 그래도 너무 크면 15%로 안전 제한 (Safety Clamp)
+                    if avg_grade > 15.0: avg_grade = 15.0
+                    elif avg_grade < -15.0: avg_grade = -15.0
+                    
+                    final_grade = avg_grade
+                    stats["neighbor_avg"] += 1
                 
-                # 다음 루프를 위한 갱신
-                current_alt = next_alt
-                prev_final_grade = final_grade
+                # 15% 이하는 그대로 인정
+                else:
+                    final_grade = raw_grade
 
-        if processed_segments:
-            total_len = sum(s['distance_m'] for s in processed_segments) / 1000
-            print(f"      ✂️ [Filter] 터널{stats['tunnel']}회 / 산악{stats['real']}회 / 이웃보정{stats['neighbor_avg']}회")
-        
-        return processed_segments
\ No newline at end of file
+            # 재구성
+            next_alt = current_alt + (dist * final_grade / 100)
+            
+            start_alts.append(current_alt)
+            end_alts.append(next_alt)
+            grades.append(final_grade)
+
+            # 이벤트 집계 (리포트용)
+            if abs(final_grade) > self.STEEP_GRADE_PCT: stats["uphill"] += 1
+            if speed < self.CONGESTION_KPH: stats["congestion"] += 1
+            
+            # 다음 루프를 위한 갱신
+            current_alt = next_alt
+            prev_final_grade = final_grade
+
+        return start_alts, end_alts, grades
+
+    # 4-B. 경사 필터 (벡터화: 상태와 무관한 판정은 배열로 미리 계산, 순차 의존 부분만 좁은 루프)
+    def _grade_filter(self, smoothed_elevs, names, name_idx, distances, speeds, sinuosities, stats):
+        """
+        진짜 순차 상태는 current_alt(직전 구간 끝 고도)와 prev_final_grade 뿐이므로
+        - 고속도로 여부: 도로명별로 1번만 키워드 검사 -> name_idx 로 펼침 (+ 속도 기준)
+        - 터널 후보(굴곡도 < 1.05), 다음 구간 예상 경사(look-ahead): 스무딩 고도만으로 계산
+        - 급경사/정체 이벤트 수: 최종 경사/속도 배열에서 한 번에 집계
+        나머지(원시 경사 -> 분기 -> 제한)만 루프에서 처리. 결과는 기존 방식과 비트 단위로 동일
+        """
+        n = len(distances)
+        sm = smoothed_elevs.tolist() if isinstance(smoothed_elevs, np.ndarray) else list(smoothed_elevs)
+        dist_arr = np.asarray(distances, dtype=np.float64)
+        speed_arr = np.asarray(speeds, dtype=np.float64)
+
+        name_is_highway = np.array([any(k in name for k in self.HIGHWAY_KEYWORDS) for name in names], dtype=bool)
+        highway = ((speed_arr >= self.HIGHWAY_KPH) | name_is_highway[np.asarray(name_idx, dtype=np.intp)]).tolist()
+        straight = (np.asarray(sinuosities, dtype=np.float64) < 1.05).tolist()
+
+        # 다음 구간 예상 경사 = (스무딩 고도[i+2] - [i+1]) / 다음 구간 거리 (마지막 구간 / 거리 0 은 0)
+        sm_arr = np.asarray(sm, dtype=np.float64)
+        look_ahead = np.zeros(n)
+        if n > 1:
+            np.divide(sm_arr[2:] - sm_arr[1:-1], dist_arr[1:], out=look_ahead[:-1], where=dist_arr[1:] > 0)
+            look_ahead[:-1] *= 100
+        look_ahead = look_ahead.tolist()
+        dists = dist_arr.tolist()
+
+        alts = [0.0] * (n + 1)
+        grades = [0.0] * n
+        current_alt = sm[0]
+        prev_final_grade = 0
+        tunnel = real = neighbor_avg = 0
+
+        for i in range(n):
+            dist = dists[i]
+            raw_grade = ((sm[i+1] - current_alt) / dist) * 100 if dist > 0 else 0
+
+            if highway[i]:
+                abs_grade = abs(raw_grade)
+                if abs_grade < 0.5:
+                    final_grade = 0
+                elif abs_grade > 7.0 and straight[i]:
+                    final_grade = 0
+                    tunnel += 1
+                else:
+                    final_grade = 5.0 if raw_grade > 5.0 else -5.0 if raw_grade < -5.0 else raw_grade
+                    if abs_grade > 7.0: real += 1
+            elif abs(raw_grade) > 15.0:
+                avg_grade = (prev_final_grade + look_ahead[i]) / 2
+                final_grade = 15.0 if avg_grade > 15.0 else -15.0 if avg_grade < -15.0 else avg_grade
+                neighbor_avg += 1
+            else:
+                final_grade = raw_grade
+
+            alts[i] = current_alt
+            grades[i] = final_grade
+            current_alt = current_alt + (dist * final_grade / 100)
+            prev_final_grade = final_grade
+        alts[n] = current_alt
+
+        stats["tunnel"] += tunnel
+        stats["real"] += real
+        stats["neighbor_avg"] += neighbor_avg
+        stats["uphill"] += int(np.count_nonzero(np.abs(np.asarray(grades)) > self.STEEP_GRADE_PCT))
+        stats["congestion"] += int(np.count_nonzero(speed_arr < self.CONGESTION_KPH))
+        return alts[:-1], alts[1:], grades
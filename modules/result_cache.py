@@ -0,0 +1,96 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+def make_key(*parts):
+    """입력값을 정렬된 JSON 으로 직렬화한 뒤 sha256 -> 내용 기반 캐시 키"""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """
+    [분석 결과 캐시] 메모리 LRU + 디스크(SQLite) 2단 캐시
+
+    - 항목마다 TTL 을 따로 지정 (교통 민감 결과는 짧게, 정적인 결과는 길게)
+    - namespace 별 hit(메모리/디스크) / miss 통계
+    - 값은 pickle 로 저장하므로 dict/list 등 분석 결과를 그대로 넣을 수 있음
+    - 메모리 계층에서 꺼낸 값은 여러 세션이 공유하므로 읽기 전용으로 다룰 것
+    """
+
+    def __init__(self, maxsize=256, db_path="data/result_cache.sqlite"):
+        self.maxsize = maxsize
+        self.db_path = db_path
+        self.stats = {}
+
+        self._lru = OrderedDict()  # (namespace, key) -> (만료 시각, 값)
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if db_path:
+            db_dir = os.path.dirname(db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS result (ns TEXT, key TEXT, expires REAL, value BLOB, "
+                "PRIMARY KEY (ns, key))"
+            )
+            self._conn.commit()
+
+    def _count(self, namespace, field):
+        s = self.stats.setdefault(namespace, {"mem_hits": 0, "disk_hits": 0, "misses": 0})
+        s[field] += 1
+
+    def hit_rate(self, namespace):
+        s = self.stats.get(namespace)
+        if not s: return 0.0
+        hits = s['mem_hits'] + s['disk_hits']
+        return hits / (hits + s['misses']) if hits + s['misses'] else 0.0
+
+    def get(self, namespace, key):
+        now = time.time()
+        with self._lock:
+            item = self._lru.get((namespace, key))
+            if item is not None and item[0] > now:
+                self._lru.move_to_end((namespace, key))
+                self._count(namespace, "mem_hits")
+                return item[1]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT expires, value FROM result WHERE ns = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                if row and row[0] > now:
+                    value = pickle.loads(row[1])
+                    self._store_mem(namespace, key, row[0], value)
+                    self._count(namespace, "disk_hits")
+                    return value
+
+            self._lru.pop((namespace, key), None)
+            self._count(namespace, "misses")
+            return None
+
+    def put(self, namespace, key, value, ttl_sec):
+        expires = time.time() + ttl_sec
+        with self._lock:
+            self._store_mem(namespace, key, expires, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO result (ns, key, expires, value) VALUES (?, ?, ?, ?)",
+                    (namespace, key, expires, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                )
+                # 만료된 항목 정리
+                self._conn.execute("DELETE FROM result WHERE expires <= ?", (time.time(),))
+                self._conn.commit()
+
+    def _store_mem(self, namespace, key, expires, value):
+        self._lru[(namespace, key)] = (expires, value)
+        self._lru.move_to_end((namespace, key))
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
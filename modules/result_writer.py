@@ -0,0 +1,134 @@
+import os
+import time
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from modules.segment_table import SegmentTable
+
+class ResultWriter:
+    """
+    [컬럼형 결과 저장] 경로 요약 / 구간별 테이블을 날짜별로 파티션된 Parquet 파일로 누적 저장
+
+    - add_*() 로 넣은 행은 메모리 버퍼에 모았다가 batch_rows 를 넘으면 파일 1개(part)로 기록
+      -> 대량 배치에서도 메모리는 버퍼 크기만큼만 사용 (buffered_rows 가 0 이면 모두 기록된 상태)
+    - 저장 위치: {base_dir}/{테이블}/date=YYYY-MM-DD/part-{시각}-{pid}-{번호}.parquet
+      (date 는 기록 시각이 아니라 각 행의 analyzed_at 날짜)
+      (pyarrow.dataset / pandas.read_parquet 로 폴더째 읽고 필요한 컬럼만 스캔 가능)
+    """
+
+    SEGMENT_COLUMNS = {
+        "run_id": pa.string(), "route": pa.string(), "seq": pa.int32(), "name": pa.string(),
+        "distance_m": pa.float64(), "speed_kph": pa.float64(), "congestion": pa.int16(),
+        "delta_v": pa.float64(), "sinuosity": pa.float64(), "grade_pct": pa.float64(),
+        "start_alt": pa.float64(), "end_alt": pa.float64(), "step_emission": pa.float64()
+    }
+    SUMMARY_COLUMNS = {
+        "run_id": pa.string(), "analyzed_at": pa.timestamp("s"), "origin": pa.string(),
+        "destination": pa.string(), "vehicle": pa.string(), "type": pa.string(), "route": pa.string(),
+        "co2_g": pa.float64(), "time_min": pa.float64(), "dist_km": pa.float64(),
+        "weather_pct": pa.float64()
+    }
+
+    def __init__(self, base_dir="data/parquet", batch_rows=50_000):
+        self.base_dir = base_dir
+        self.batch_rows = batch_rows
+        self._buffers = {"segments": {}, "route_summary": {}}  # {테이블: {날짜: {컬럼: 값 목록}}}
+        self._schemas = {
+            "segments": pa.schema(list(self.SEGMENT_COLUMNS.items())),
+            "route_summary": pa.schema(list(self.SUMMARY_COLUMNS.items())),
+        }
+        self._part_no = 0
+        self.files_written = []
+
+    @property
+    def buffered_rows(self):
+        return sum(len(buf["run_id"]) for parts in self._buffers.values() for buf in parts.values())
+
+    def _buffer(self, table, analyzed_at):
+        """analyzed_at 날짜 파티션의 컬럼 버퍼"""
+        columns = self.SEGMENT_COLUMNS if table == "segments" else self.SUMMARY_COLUMNS
+        day = f"{analyzed_at:%Y-%m-%d}"
+        parts = self._buffers[table]
+        if day not in parts:
+            parts[day] = {c: [] for c in columns}
+        return parts[day]
+
+    def add_summary(self, run_id, origin, destination, vehicle, kind, route, co2_g, time_min, dist_km,
+                    weather_pct=None, analyzed_at=None):
+        analyzed_at = analyzed_at or datetime.now()
+        buf = self._buffer("route_summary", analyzed_at)
+        row = {
+            "run_id": run_id, "analyzed_at": analyzed_at, "origin": origin,
+            "destination": destination, "vehicle": vehicle, "type": kind, "route": route,
+            "co2_g": co2_g, "time_min": time_min, "dist_km": dist_km, "weather_pct": weather_pct
+        }
+        for col, value in row.items():
+            buf[col].append(value)
+        self._maybe_flush("route_summary")
+
+    def add_segments(self, run_id, route, segments, analyzed_at=None):
+        buf = self._buffer("segments", analyzed_at or datetime.now())
+        if isinstance(segments, SegmentTable):
+            # 구간 테이블은 컬럼 단위로 그대로 이어 붙임 (구간마다 dict 조회 없음)
+            n = len(segments)
+            buf["run_id"].extend([run_id] * n)
+            buf["route"].extend([route] * n)
+            buf["seq"].extend(range(n))
+            buf["name"].extend(segments.column('name'))
+            for col in list(self.SEGMENT_COLUMNS)[4:]:
+                values = segments.column(col).tolist() if col in segments else [None] * n
+                buf[col].extend(values)
+            self._maybe_flush("segments")
+            return
+
+        for seq, seg in enumerate(segments):
+            buf["run_id"].append(run_id)
+            buf["route"].append(route)
+            buf["seq"].append(seq)
+            buf["name"].append(seg.get('name'))
+            buf["distance_m"].append(seg.get('distance_m'))
+            buf["speed_kph"].append(seg.get('speed_kph'))
+            buf["congestion"].append(seg.get('congestion'))
+            buf["delta_v"].append(seg.get('delta_v'))
+            buf["sinuosity"].append(seg.get('sinuosity'))
+            buf["grade_pct"].append(seg.get('grade_pct'))
+            buf["start_alt"].append(seg.get('start_alt'))
+            buf["end_alt"].append(seg.get('end_alt'))
+            buf["step_emission"].append(seg.get('step_emission'))
+        self._maybe_flush("segments")
+
+    def _maybe_flush(self, table):
+        if sum(len(buf["run_id"]) for buf in self._buffers[table].values()) >= self.batch_rows:
+            self._flush_table(table)
+
+    def _flush_table(self, table):
+        """테이블 버퍼를 날짜 파티션별 part 파일로 기록 -> 기록한 경로 목록"""
+        paths = []
+        for day, buf in self._buffers[table].items():
+            if not buf["run_id"]: continue
+            arrow_table = pa.Table.from_pydict(buf, schema=self._schemas[table])
+            part_dir = os.path.join(self.base_dir, table, f"date={day}")
+            os.makedirs(part_dir, exist_ok=True)
+
+            self._part_no += 1
+            path = os.path.join(part_dir, f"part-{int(time.time())}-{os.getpid()}-{self._part_no:05d}.parquet")
+            pq.write_table(arrow_table, path, compression="zstd")
+            self.files_written.append(path)
+            paths.append(path)
+        self._buffers[table].clear()
+        return paths
+
+    def flush(self):
+        for table in self._buffers:
+            self._flush_table(table)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,167 @@
+import numpy as np
+
+class SegmentRow:
+    """
+    SegmentTable 의 구간 1개를 dict 처럼 보여주는 가벼운 뷰 (값은 복사하지 않음)
+    seg['distance_m'], seg.get('step_emission', 0), seg['grade_pct'] = ... 등 기존 dict 코드가 그대로 동작
+    """
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table, i):
+        self._table = table
+        self._i = i
+
+    def __getitem__(self, key):
+        return self._table.value(key, self._i)
+
+    def __setitem__(self, key, value):
+        self._table.set_value(key, self._i, value)
+
+    def __contains__(self, key):
+        return key in self._table
+
+    def get(self, key, default=None):
+        return self._table.value(key, self._i) if key in self._table else default
+
+    def keys(self):
+        return self._table.fields()
+
+    def values(self):
+        return [self[k] for k in self.keys()]
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def to_dict(self):
+        return {k: self[k] for k in self.keys()}
+
+    def __repr__(self):
+        return f"SegmentRow({self.to_dict()})"
+
+class SegmentTable:
+    """
+    [구간 테이블] 100m 구간들을 컬럼(NumPy 배열) 단위로 저장하는 struct-of-arrays
+
+    - 구간마다 dict(키 12개 + float 객체)를 만드는 대신 컬럼당 배열 1개 -> 구간당 약 70바이트
+    - 도로 이름은 중복 없이 names 에 1번만 저장하고 구간은 번호(name_idx)만 가짐
+    - table[i] / for seg in table 은 SegmentRow(dict 호환 뷰)를 돌려주므로 기존 코드도 그대로 동작
+    - 계산기 / 저장 등 성능이 중요한 곳은 column() 으로 배열을 바로 사용
+    """
+    __slots__ = ("names", "name_idx", "columns")
+
+    FIELDS = ("name", "distance_m", "speed_kph", "congestion", "delta_v", "sinuosity",
+              "start_alt", "end_alt", "grade_pct", "step_emission")
+    DTYPES = {"congestion": np.int8}  # 나머지 숫자 컬럼은 float64 (계산 결과가 dict 버전과 동일하게)
+
+    def __init__(self, names, name_idx, columns):
+        self.names = list(names)
+        self.name_idx = np.asarray(name_idx, dtype=np.int32)
+        self.columns = {key: np.asarray(values, dtype=self.DTYPES.get(key, np.float64))
+                        for key, values in columns.items()}
+
+    @classmethod
+    def empty(cls):
+        """구간 0개 (숫자 컬럼은 길이 0 배열로 모두 갖춤 -> column() 을 바로 써도 됨)"""
+        return cls([], [], {key: [] for key in cls.FIELDS[1:]})
+
+    @classmethod
+    def from_dicts(cls, segments):
+        """기존 dict 구간 리스트 -> SegmentTable"""
+        if isinstance(segments, SegmentTable): return segments
+        names, lookup, name_idx = [], {}, []
+        for seg in segments:
+            name = seg.get('name', '')
+            idx = lookup.get(name)
+            if idx is None:
+                idx = lookup[name] = len(names)
+                names.append(name)
+            name_idx.append(idx)
+
+        keys = [k for k in cls.FIELDS[1:] if segments and all(k in seg for seg in segments)]
+        columns = {k: [seg[k] for seg in segments] for k in keys}
+        return cls(names, name_idx, columns)
+
+    @classmethod
+    def concat(cls, tables):
+        """여러 테이블을 이어 붙임 (공통 컬럼만 유지)"""
+        tables = [t for t in tables if len(t)]
+        if not tables: return cls.empty()
+        names, lookup, parts = [], {}, []
+        for t in tables:
+            remap = np.empty(len(t.names), dtype=np.int32)
+            for i, name in enumerate(t.names):
+                idx = lookup.get(name)
+                if idx is None:
+                    idx = lookup[name] = len(names)
+                    names.append(name)
+                remap[i] = idx
+            parts.append(remap[t.name_idx])
+        keys = [k for k in tables[0].columns if all(k in t.columns for t in tables)]
+        columns = {k: np.concatenate([t.columns[k] for t in tables]) for k in keys}
+        return cls(names, np.concatenate(parts), columns)
+
+    def __len__(self):
+        return len(self.name_idx)
+
+    def __contains__(self, key):
+        return key == "name" or key in self.columns
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return SegmentTable(self.names, self.name_idx[i], {k: v[i] for k, v in self.columns.items()})
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError("segment index out of range")
+        return SegmentRow(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield SegmentRow(self, i)
+
+    def fields(self):
+        return ["name"] + [k for k in self.FIELDS[1:] if k in self.columns] + \
+               [k for k in self.columns if k not in self.FIELDS]
+
+    def value(self, key, i):
+        if key == "name": return self.names[self.name_idx[i]]
+        return self.columns[key][i].item()
+
+    def set_value(self, key, i, value):
+        if key == "name":
+            if value not in self.names: self.names.append(value)
+            self.name_idx[i] = self.names.index(value)
+            return
+        if key not in self.columns:
+            # 처음 쓰는 컬럼은 빈 값(NaN)으로 만들고 이 구간만 채움
+            self.columns[key] = np.full(len(self), np.nan, dtype=self.DTYPES.get(key, np.float64))
+        self.columns[key][i] = value
+
+    def column(self, key):
+        """컬럼 배열 (name 은 구간별 이름 리스트)"""
+        if key == "name": return [self.names[i] for i in self.name_idx.tolist()]
+        return self.columns[key]
+
+    def set_column(self, key, values):
+        values = np.asarray(values, dtype=self.DTYPES.get(key, np.float64))
+        if len(values) != len(self): raise ValueError(f"{key}: 길이 {len(values)} != 구간 수 {len(self)}")
+        self.columns[key] = values
+
+    def to_dicts(self):
+        """SegmentTable -> 기존 dict 구간 리스트 (하위 호환용)"""
+        keys = [k for k in self.fields() if k != "name"]
+        names = self.column("name")
+        cols = [self.columns[k].tolist() for k in keys]
+        return [dict(zip(["name"] + keys, row)) for row in zip(names, *cols)]
+
+    @property
+    def nbytes(self):
+        return self.name_idx.nbytes + sum(v.nbytes for v in self.columns.values()) + \
+               sum(len(n.encode("utf-8")) for n in self.names)
+
+    def __repr__(self):
+        return f"SegmentTable({len(self)} segments, {len(self.names)} names, columns={list(self.columns)})"
@@ -0,0 +1,50 @@
+import threading
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    [요청 병합] 같은 키로 동시에 들어온 호출은 1번만 실행하고 결과를 나눠 가짐
+
+    - 먼저 들어온 호출(leader)이 실제로 fn 을 실행
+    - 실행 중에 같은 키로 들어온 호출(follower)은 기다렸다가 같은 결과(또는 같은 예외)를 받음
+    - 실행이 끝나면 키를 지우므로, 이후 호출은 다시 새로 실행 (결과 저장은 캐시의 역할)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"executed": 0, "shared": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['executed'] += 1
+            else:
+                self.stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None: raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,241 @@
+"""
+[로컬 대역 API 서버] 카카오 / 구글 고도 / ODsay / OpenWeather 응답을 흉내내는 오프라인 HTTP 서버
+
+실행 예:
+    python -m modules.stub_server --port 8765 --fixtures data/fixtures --latency-ms 80 --error-rate 0.02
+    HTTP_STUB_URL=http://127.0.0.1:8765 python main.py
+
+- 요청 경로는 /{원래 호스트}/{원래 경로} (http_client.configure(stub_url=...) 가 이렇게 바꿔서 보냄)
+- 녹화된 응답(fixtures)이 있으면 그대로, 없으면 요청 파라미터로 시드를 정한 합성 응답을 생성
+  -> 같은 요청에는 항상 같은 응답 (키/네트워크 없이 재현 가능한 벤치마크)
+- 응답 지연(latency/jitter)과 오류(429/503 등) 주입으로 재시도/타임아웃 경로도 실험 가능
+"""
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+from modules.api_google import decode_polyline
+from modules.http_replay import FixtureStore
+
+ROAD_NAMES = ["경부고속도로", "영동고속도로", "덕영대로", "강남대로", "수원IC", "한남대교", "남산터널", "일반도로"]
+
+def _seed(*parts):
+    return int(hashlib.md5(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()[:8], 16)
+
+def synth_elevation(lat, lon):
+    """좌표에 대한 매끄러운 가짜 고도 (같은 좌표는 항상 같은 값, 10~250m)"""
+    return 120 + 60 * math.sin(lat * 900) + 40 * math.cos(lon * 700) + 25 * math.sin((lat + lon) * 2300)
+
+def synth_geocode(params):
+    """주소 -> 수도권 범위 안의 고정 좌표"""
+    rnd = random.Random(_seed(params.get("query", "")))
+    x, y = rnd.uniform(126.80, 127.20), rnd.uniform(37.20, 37.70)
+    return {"documents": [{"address_name": params.get("query", ""), "x": f"{x:.7f}", "y": f"{y:.7f}"}],
+            "meta": {"total_count": 1}}
+
+def synth_route(params):
+    """출발/도착 좌표 사이를 구불구불 잇는 도로 목록 (전략마다 우회 정도/속도가 다름)"""
+    ox, oy = map(float, params["origin"].split(","))
+    dx, dy = map(float, params["destination"].split(","))
+    rnd = random.Random(_seed(params.get("origin"), params.get("destination"),
+                              params.get("priority"), params.get("avoid")))
+
+    detour = {"RECOMMEND": 0.02, "DISTANCE": 0.0}.get(params.get("priority"), 0.02)
+    if params.get("avoid") == "toll": detour += 0.04
+    base_speed = 45 if params.get("avoid") == "toll" else 60
+
+    n_points = 400
+    bend = rnd.uniform(-1, 1) * detour
+    vertexes_all = []
+    for i in range(n_points + 1):
+        t = i / n_points
+        # 직선 + 전략별 활 모양 우회 + 작은 흔들림
+        off = bend * math.sin(math.pi * t) + rnd.uniform(-1, 1) * 0.0003
+        x = ox + (dx - ox) * t - (dy - oy) * off
+        y = oy + (dy - oy) * t + (dx - ox) * off
+        vertexes_all.append((x, y))
+
+    roads, total_m, total_sec = [], 0.0, 0.0
+    start = 0
+    while start < n_points:
+        end = min(n_points, start + rnd.randint(5, 40))
+        pts = vertexes_all[start:end + 1]
+        length = sum(math.hypot((b[0] - a[0]) * 88000, (b[1] - a[1]) * 111000) for a, b in zip(pts, pts[1:]))
+        speed = max(5, int(base_speed + rnd.uniform(-35, 40)))
+        state = 4 if speed < 20 else 3 if speed < 35 else 2 if speed < 50 else 1
+        roads.append({"name": rnd.choice(ROAD_NAMES), "distance": int(length), "duration": int(length / (speed / 3.6)),
+                      "traffic_speed": speed, "traffic_state": state,
+                      "vertexes": [round(v, 7) for p in pts for v in p]})
+        total_m += length
+        total_sec += length / (speed / 3.6)
+        start = end
+
+    route = {"result_code": 0, "result_msg": "길찾기 성공",
+             "summary": {"distance": int(total_m), "duration": int(total_sec)},
+             "sections": [{"distance": int(total_m), "duration": int(total_sec), "roads": roads}]}
+    return {"routes": [route]}
+
+def synth_elevations(params):
+    locations = params.get("locations", "")
+    if locations.startswith("enc:"):
+        points = decode_polyline(locations[4:])
+    else:
+        points = [tuple(map(float, p.split(","))) for p in locations.split("|") if p]
+    results = [{"elevation": synth_elevation(lat, lon), "location": {"lat": lat, "lng": lon}, "resolution": 9.5}
+               for lat, lon in points]
+    return {"status": "OK", "results": results}
+
+def synth_transit(params):
+    """지하철 / 버스 / 복합 경로 3개"""
+    sx, sy, ex, ey = (float(params[k]) for k in ("SX", "SY", "EX", "EY"))
+    dist = math.hypot((ex - sx) * 88000, (ey - sy) * 111000) * 1.3
+    rnd = random.Random(_seed(params.get("SX"), params.get("SY"), params.get("EX"), params.get("EY")))
+    walk = {"trafficType": 3, "distance": 400, "sectionTime": 6}
+    subway = {"trafficType": 1, "lane": [{"name": f"수도권 {rnd.randint(1, 9)}호선"}]}
+    bus = {"trafficType": 2, "lane": [{"busNo": str(rnd.randint(100, 9999)), "type": rnd.choice([1, 11, 12])}]}
+
+    paths = []
+    for path_type, legs in ((1, [subway]), (2, [bus]), (3, [bus, subway])):
+        ride = (dist - 800) / len(legs)
+        sub_path = [walk] + [dict(leg, distance=int(ride), sectionTime=int(ride / 500)) for leg in legs] + [walk]
+        total_time = sum(s['sectionTime'] for s in sub_path) + 5 * (len(legs) - 1)
+        paths.append({"pathType": path_type, "info": {"totalDistance": int(dist), "totalTime": total_time},
+                      "subPath": sub_path})
+    return {"result": {"searchType": 0, "path": paths}}
+
+def synth_weather(params):
+    rnd = random.Random(_seed(round(float(params.get("lat", 0)), 1), round(float(params.get("lon", 0)), 1)))
+    return {"weather": [{"main": rnd.choice(["Clear", "Clouds", "Rain"])}],
+            "main": {"temp": round(rnd.uniform(-5, 32), 1), "humidity": rnd.randint(30, 90)}}
+
+# (호스트, 경로 끝부분) -> 합성 응답 생성기
+SYNTHETIC = [
+    ("dapi.kakao.com", "/address.json", synth_geocode),
+    ("apis-navi.kakaomobility.com", "/directions", synth_route),
+    ("maps.googleapis.com", "/elevation/json", synth_elevations),
+    ("api.odsay.com", "/searchPubTransPathT", synth_transit),
+    ("api.openweathermap.org", "/weather", synth_weather),
+]
+
+class StubApiServer:
+    """
+    latency_ms / jitter_ms: 응답 전 대기 시간 (평균 ± 흔들림)
+    error_rate: 이 비율만큼 error_status 로 실패 응답 (재시도 경로 실험용)
+    fixture_dir: 녹화된 응답 폴더 (있으면 합성 응답보다 우선)
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, fixture_dir=None, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, error_status=503, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.store = FixtureStore(fixture_dir) if fixture_dir else None
+        self.stats = {"requests": 0, "fixture": 0, "synthetic": 0, "injected_errors": 0, "not_found": 0}
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = server.handle(self.path)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass  # 요청마다 콘솔 출력하지 않음
+
+        return Handler
+
+    def handle(self, raw_path):
+        """'/{호스트}/{경로}?{쿼리}' -> (상태 코드, JSON 본문)"""
+        parsed = urlparse(raw_path)
+        host, _, path = parsed.path.lstrip("/").partition("/")
+        path = "/" + path
+        params = dict(parse_qsl(parsed.query, keep_blank_values=True))
+
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = max(0.0, self.latency_ms + self._rnd.uniform(-1, 1) * self.jitter_ms) / 1000
+            inject_error = self._rnd.random() < self.error_rate
+        if delay: time.sleep(delay)
+
+        if inject_error:
+            with self._lock: self.stats['injected_errors'] += 1
+            return self.error_status, {"error": "injected"}
+
+        if self.store is not None:
+            resp = self.store.load(f"https://{host}{path}", params)
+            if resp is not None:
+                with self._lock: self.stats['fixture'] += 1
+                return resp.status_code, resp.json()
+
+        for stub_host, suffix, make in SYNTHETIC:
+            if host == stub_host and path.endswith(suffix):
+                with self._lock: self.stats['synthetic'] += 1
+                try:
+                    return 200, make(params)
+                except (KeyError, ValueError) as e:
+                    return 400, {"error": f"잘못된 파라미터: {e}"}
+
+        with self._lock: self.stats['not_found'] += 1
+        return 404, {"error": f"지원하지 않는 API: {host}{path}"}
+
+    def start(self):
+        """백그라운드 스레드로 실행 (벤치마크/스크립트에서 같은 프로세스로 띄울 때)"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        # shutdown() 은 serve_forever 가 돌고 있을 때만 (아니면 영원히 대기)
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread = None
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 대역 API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=None, help="녹화된 응답 폴더 (예: data/fixtures)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="평균 응답 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="지연 흔들림 (±)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503, help="주입할 오류 상태 코드")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubApiServer(args.host, args.port, args.fixtures, args.latency_ms, args.jitter_ms,
+                           args.error_rate, args.error_status, args.seed)
+    print(f"🧪 대역 API 서버 실행 중: {server.url}  (HTTP_STUB_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"📊 요청 통계: {server.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -164,7 +164,7 @@ def create_interactive_graph(all_routes_data):
             
             # 툴팁 내용 (HTML 태그 사용 가능)
             txt = (f"<b>{seg['name']}</b><br>"
-                   f"속도: {seg['speed_kph']}km/h ({label_map[cong]})<br>"
+                   f"속도: {seg['speed_kph']:g}km/h ({label_map[cong]})<br>"
                    f"경사: {seg['grade_pct']:.1f}%<br>"
                    f"배출: {seg.get('step_emission', 0):.1f}g")
             hover_texts.append(txt)
@@ -0,0 +1,42 @@
+"""GoogleElevation: 청크 응답 처리 (실패한 청크는 0으로 채우고 원인을 출력)"""
+import pytest
+
+from modules.api_google import GoogleElevation
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+class FakeHttp:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def get(self, url, params=None):
+        return FakeResponse(self.payload)
+
+def fetch(payload, coords):
+    google = GoogleElevation("test-key")
+    google.http = FakeHttp(payload)
+    return google.get_elevations_bulk(coords)
+
+COORDS = [(37.5, 127.0), (37.51, 127.01), (37.52, 127.02)]
+
+def test_ok_response_returns_elevations():
+    payload = {"status": "OK", "results": [{"elevation": e} for e in (10.0, 20.0, 30.0)]}
+    assert fetch(payload, COORDS) == [10.0, 20.0, 30.0]
+
+def test_count_mismatch_is_reported_separately(capsys):
+    payload = {"status": "OK", "results": [{"elevation": 10.0}, {"elevation": 20.0}]}
+    assert fetch(payload, COORDS) == [0, 0, 0]
+    out = capsys.readouterr().out
+    assert "요청 3개 / 응답 2개" in out
+    assert "거절" not in out
+
+@pytest.mark.parametrize("status", ["OVER_QUERY_LIMIT", "REQUEST_DENIED"])
+def test_rejected_status_is_reported(capsys, status):
+    payload = {"status": status, "results": [], "error_message": "quota"}
+    assert fetch(payload, COORDS) == [0, 0, 0]
+    assert f"구글 거절 ({status}): quota" in capsys.readouterr().out
@@ -0,0 +1,18 @@
+"""batch.py: resume 시 성공한 id 만 건너뛰는지 확인"""
+import json
+
+from batch import load_done_ids
+
+def test_load_done_ids_skips_only_ok(tmp_path):
+    out = tmp_path / "result.jsonl"
+    lines = [json.dumps(r) for r in (
+        {"id": "a", "status": "ok"},
+        {"id": "b", "status": "error", "error": "ConnectionError()"},
+        {"id": "c", "status": "no_coords"},
+        {"id": "b", "status": "ok"},  # 재시도에서 성공
+    )]
+    out.write_text("\n".join(lines) + '\n{"id": "d", "sta', encoding="utf-8")  # 마지막 줄은 쓰다가 끊김
+    assert load_done_ids(str(out)) == {"a", "b"}
+
+def test_load_done_ids_missing_file(tmp_path):
+    assert load_done_ids(str(tmp_path / "none.jsonl")) == set()
@@ -0,0 +1,35 @@
+"""CachedElevation: 여러 스레드가 함께 써도 통계가 맞는지 확인"""
+import time
+import threading
+
+from modules.elevation_cache import CachedElevation
+from benchmarks.synthetic import SyntheticElevation
+
+class SlowStats(dict):
+    """값을 읽은 뒤 스레드를 양보해서 += 사이에 다른 스레드가 끼어들게 만드는 통계 dict"""
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        time.sleep(0.0002)
+        return value
+
+def test_stats_are_consistent_across_threads(tmp_path):
+    cache = CachedElevation(SyntheticElevation(), db_path=str(tmp_path / "elev.sqlite"))
+    cache.stats = SlowStats(cache.stats)
+    n_threads, n_calls, n_coords = 8, 20, 25
+
+    def worker(t):
+        for c in range(n_calls):
+            # 호출마다 다른 격자 셀 -> 첫 조회는 전부 miss, 같은 좌표 재조회는 전부 hit
+            coords = [(37.5 + (t * n_calls + c) * 0.001 + k * 0.00001, 127.0) for k in range(n_coords)]
+            cache.get_elevations_bulk(coords)
+            cache.get_elevations_bulk(coords)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    for th in threads: th.start()
+    for th in threads: th.join()
+
+    expected = n_threads * n_calls * n_coords
+    assert dict(cache.stats) == {"hits": expected, "misses": expected, "upstream_calls": n_threads * n_calls}
+    assert cache.hit_rate() == 0.5
+    assert f"API 호출 {n_threads * n_calls}회" in cache.summary()
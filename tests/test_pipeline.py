@@ -0,0 +1,66 @@
+"""run_analysis: 결과 캐시가 있으면 외부 API(카카오 경로 / 날씨)를 다시 부르지 않는지 확인"""
+import pytest
+
+from modules.pipeline import run_analysis
+from modules.result_cache import ResultCache
+from modules.calculator import CarbonCalculator
+from modules.calculator_pub import PublicTransportCalculator
+from modules.vehicle_db import VehicleDB
+from benchmarks.synthetic import make_route, SyntheticElevation
+
+class FakeKakao:
+    def __init__(self):
+        self.route_calls = 0
+
+    def get_coords(self, name):
+        return {"출발": (127.02, 37.26), "도착": (127.1, 37.3)}[name]
+
+    def get_multi_routes(self, start, end):
+        self.route_calls += 1
+        return [dict(make_route(8, seed=seed), strategy_label=label) for seed, label in enumerate(["추천", "최단"])]
+
+class FakeWeather:
+    def __init__(self, condition="Clear"):
+        self.calls = 0
+        self.condition = condition
+
+    def get_weather(self, lat, lon):
+        self.calls += 1
+        return {'temp': 21.0, 'humidity': 55, 'condition': self.condition, 'is_wet': False}
+
+class FakeODsay:
+    def search_path(self, sx, sy, ex, ey):
+        return None
+
+def make_res(weather=None):
+    return {"kakao": FakeKakao(), "google": SyntheticElevation(), "weather": weather or FakeWeather(),
+            "odsay": FakeODsay(), "v_db": VehicleDB(), "car_calc": CarbonCalculator(),
+            "pub_calc": PublicTransportCalculator(), "result_cache": ResultCache(db_path=None)}
+
+@pytest.fixture
+def cars():
+    v_db = VehicleDB()
+    return [v_db.get_vehicle_spec(key) for key in list(v_db.specs)[:2]]
+
+def test_car_cache_hit_skips_routing_and_weather(cars):
+    res = make_res()
+    first = run_analysis("출발", "도착", cars[0], res)
+    second = run_analysis("출발", "도착", cars[0], res)
+    assert res['kakao'].route_calls == 1
+    assert res['weather'].calls == 1
+    assert second['car_data']['summary'] == first['car_data']['summary']
+
+def test_other_vehicle_reuses_cached_routes(cars):
+    res = make_res()
+    run_analysis("출발", "도착", cars[0], res)
+    result = run_analysis("출발", "도착", cars[1], res)
+    assert res['kakao'].route_calls == 1
+    assert res['weather'].calls == 1
+    assert result['car_data']['collected']
+
+def test_weather_error_is_not_cached(cars):
+    res = make_res(FakeWeather(condition="Error"))
+    run_analysis("출발", "도착", cars[0], res)
+    run_analysis("출발", "도착", cars[0], res)
+    assert res['weather'].calls == 2
+    assert res['kakao'].route_calls == 1
@@ -0,0 +1,167 @@
+"""DataProcessor: 벡터화 방식이 기존(legacy) 방식과 같은 결과를 내는지 확인"""
+import random
+
+import numpy as np
+import pytest
+
+from modules.processor import DataProcessor, round_coords
+from benchmarks.synthetic import make_route, SyntheticElevation
+
+ROUTES = [(km, seed) for km in (3, 30, 150) for seed in range(2)]
+
+def process(engine, routes, **kwargs):
+    processor = DataProcessor(SyntheticElevation(), engine=engine, **kwargs)
+    return processor.process_routes(routes, with_events=True)
+
+def test_round_coords_matches_python_round():
+    rnd = random.Random(0)
+    values = [round(rnd.uniform(-180, 180), rnd.choice([6, 7, 8, 12])) for _ in range(50_000)]
+    values += [37.2598465, -37.2598465, 127.0000005, 0.0000005]
+    assert round_coords(values).tolist() == [round(v, 6) for v in values]
+
+@pytest.mark.parametrize("km,seed", ROUTES)
+def test_vectorized_sampling_matches_legacy(km, seed):
+    route = make_route(km, seed=seed)
+    legacy = DataProcessor(None, engine="legacy")._sample_segments(route)
+    vectorized = DataProcessor(None)._sample_segments(route)
+
+    assert vectorized['p_start'] == legacy['p_start']
+    assert vectorized['p_end'] == legacy['p_end']
+    assert [vectorized['names'][i] for i in vectorized['name_idx']] == \
+           [legacy['names'][i] for i in legacy['name_idx']]
+    for key in ("speed_kph", "congestion", "delta_v"):
+        assert vectorized[key] == legacy[key]
+    np.testing.assert_allclose(vectorized['distance_m'], legacy['distance_m'], rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose(vectorized['sinuosity'], legacy['sinuosity'], rtol=1e-12)
+
+def test_vectorized_route_matches_legacy():
+    routes = [make_route(km, seed=seed) for km, seed in ROUTES]
+    for (legacy, legacy_stats), (table, stats) in zip(process("legacy", routes), process("vectorized", routes)):
+        assert stats == legacy_stats
+        assert len(table) == len(legacy)
+        for key in ("distance_m", "start_alt", "end_alt", "grade_pct"):
+            np.testing.assert_allclose(table.column(key), legacy.column(key), rtol=1e-9, atol=1e-9)
+
+NAMES = ["경부고속도로", "수원IC", "남산터널", "한남대교", "덕영대로", "일반도로", "테헤란로"]
+
+def random_filter_input(rnd):
+    """필터 분기(고속도로 평탄/터널/산악, 일반도로 이웃보정)를 고루 거치는 무작위 입력"""
+    n = rnd.randint(1, 60)
+    smoothed = [rnd.uniform(0, 300)]
+    for _ in range(n):
+        jump = rnd.choice([0.0, rnd.gauss(0, 0.3), rnd.gauss(0, 5), rnd.gauss(0, 30)])
+        smoothed.append(smoothed[-1] + jump)
+    name_idx = [rnd.randrange(len(NAMES)) for _ in range(n)]
+    distances = [rnd.choice([0.0, rnd.uniform(1, 30), rnd.uniform(80, 130)]) for _ in range(n)]
+    speeds = [float(rnd.choice([0, 10, 30, 60, 79, 80, 100])) for _ in range(n)]
+    sinuosities = [rnd.choice([1.0, 1.04, 1.05, rnd.uniform(1.0, 1.5)]) for _ in range(n)]
+    return smoothed, name_idx, distances, speeds, sinuosities
+
+def empty_stats():
+    return {"tunnel": 0, "real": 0, "neighbor_avg": 0, "uphill": 0, "congestion": 0}
+
+def run_both_filters(processor, smoothed, names, name_idx, distances, speeds, sinuosities):
+    legacy_stats, stats = empty_stats(), empty_stats()
+    legacy = processor._grade_filter_legacy(smoothed, [names[i] for i in name_idx], distances, speeds,
+                                            sinuosities, legacy_stats)
+    vectorized = processor._grade_filter(smoothed, names, np.asarray(name_idx), distances, speeds,
+                                         sinuosities, stats)
+    return (legacy, legacy_stats), (tuple(vectorized), stats)
+
+def test_grade_filter_matches_legacy_on_random_inputs():
+    processor = DataProcessor(None)
+    rnd = random.Random(0)
+    branches = empty_stats()
+    for _ in range(2000):
+        smoothed, name_idx, distances, speeds, sinuosities = random_filter_input(rnd)
+        (legacy, legacy_stats), (vectorized, stats) = run_both_filters(
+            processor, smoothed, NAMES, name_idx, distances, speeds, sinuosities)
+        assert vectorized == legacy  # 시작/끝 고도와 경사가 비트 단위로 같음
+        assert stats == legacy_stats
+        for key in branches: branches[key] += stats[key]
+    assert all(branches.values())  # 모든 보정 분기를 한 번 이상 거침
+
+@pytest.mark.parametrize("km,seed", ROUTES)
+def test_grade_filter_matches_legacy_on_synthetic_routes(km, seed):
+    processor = DataProcessor(SyntheticElevation())
+    cols = processor._sample_segments(make_route(km, seed=seed))
+    alt_map = processor._fetch_elevations(cols['p_start'] + cols['p_end'])
+    smoothed = processor._smooth_elevations(cols, alt_map)
+    (legacy, legacy_stats), (vectorized, stats) = run_both_filters(
+        processor, smoothed, cols['names'], cols['name_idx'].tolist(), cols['distance_m'],
+        cols['speed_kph'], cols['sinuosity'])
+    assert vectorized == legacy
+    assert stats == legacy_stats
+
+class HillElevation:
+    """위도 LAT_HILL 북쪽만 8% 오르막인 고도 provider (조회 좌표 수를 셈)"""
+    LAT_HILL = 37.51
+
+    def __init__(self):
+        self.points = 0
+
+    def get_elevations_bulk(self, coords_list):
+        self.points += len(coords_list)
+        return [50.0 + max(0.0, lat - self.LAT_HILL) * 111000 * 0.08 for lat, _ in coords_list]
+
+def hill_route():
+    """평지 1km + 언덕 1km, 정점 간격 약 11m 인 도심 도로 2개"""
+    def road(name, lat0):
+        vertexes = []
+        for k in range(91):
+            vertexes += [127.0, round(lat0 + k * 0.0001, 6)]
+        return {"name": name, "traffic_speed": 15, "traffic_state": 2, "vertexes": vertexes}
+    return {"sections": [{"roads": [road("덕영대로", 37.501), road("남산길", 37.51)]}]}
+
+def adaptive_segments(max_elevation_points=None):
+    elevation = HillElevation()
+    processor = DataProcessor(elevation, resolution="adaptive", max_elevation_points=max_elevation_points)
+    table = processor.process_route(hill_route())
+    return table, processor.adaptive_stats, elevation.points
+
+def test_adaptive_cuts_steep_hill_finer_than_segment_length():
+    table, stats, _ = adaptive_segments(max_elevation_points=1000)
+    fixed = DataProcessor(HillElevation()).process_route(hill_route())
+    length = DataProcessor(None).segment_length
+    hill = np.asarray(table.column('name')) == "남산길"
+    dist = np.asarray(table.column('distance_m'))
+    assert stats['fine'] > 0
+    assert dist[hill].max() <= length / DataProcessor.ADAPTIVE_FINE_FACTOR + 15
+    assert dist[~hill].max() > length
+    assert abs(dist.sum() - sum(fixed.column('distance_m'))) < 1e-6
+
+def test_adaptive_stays_within_budget():
+    for budget in (None, 20, 30):
+        _, stats, queried = adaptive_segments(max_elevation_points=budget)
+        assert queried == stats['points'] <= (stats['fixed_points'] if budget is None else budget)
+
+def test_adaptive_warns_when_coarse_pass_exceeds_budget(capsys):
+    table, stats, _ = adaptive_segments(max_elevation_points=3)
+    assert "⚠️ [Adaptive]" in capsys.readouterr().out
+    assert stats['refined'] == 0 and len(table) == stats['coarse']
+
+class OutageElevation(SyntheticElevation):
+    """고도 API 장애: GoogleElevation 처럼 실패한 좌표를 0으로 채워서 반환"""
+
+    def get_elevations_bulk(self, coords_list):
+        self.calls += 1
+        return [0] * len(coords_list)
+
+def test_geometry_cache_skips_layers_from_elevation_outage():
+    from modules.result_cache import ResultCache
+    cache = ResultCache(db_path=None)
+    route = make_route(10, profile="urban", seed=0)
+
+    outage = DataProcessor(OutageElevation(), geometry_cache=cache).process_route(route)
+    assert not np.any(outage.column('start_alt'))
+
+    healthy = SyntheticElevation()
+    recovered = DataProcessor(healthy, geometry_cache=cache).process_route(route)
+    expected = DataProcessor(SyntheticElevation()).process_route(route)
+    assert healthy.calls == 1
+    np.testing.assert_allclose(recovered.column('start_alt'), expected.column('start_alt'))
+    assert np.ptp(recovered.column('start_alt')) > 0
+
+    again = SyntheticElevation()
+    DataProcessor(again, geometry_cache=cache).process_route(route)
+    assert again.calls == 0
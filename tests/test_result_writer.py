@@ -0,0 +1,51 @@
+"""ResultWriter / run_batch: Parquet 파티션 날짜와 중단 시 저장 보장 확인"""
+import json
+from datetime import datetime
+
+import pyarrow.parquet as pq
+import pytest
+
+import batch
+from modules.result_writer import ResultWriter
+
+def read_table(base_dir, table):
+    return pq.read_table(f"{base_dir}/{table}").to_pandas()
+
+def test_partition_date_comes_from_analyzed_at(tmp_path):
+    writer = ResultWriter(str(tmp_path))
+    for run_id, at in (("a", datetime(2026, 3, 1, 23, 59, 58)), ("b", datetime(2026, 3, 2, 0, 0, 1))):
+        writer.add_segments(run_id, "추천", [{"name": "덕영대로", "distance_m": 100.0}], at)
+        writer.add_summary(run_id, "출발", "도착", "2", "Car", "추천", 10.0, 1.0, 0.1, None, at)
+    assert writer.buffered_rows == 4
+    writer.close()
+    assert writer.buffered_rows == 0
+
+    for table in ("segments", "route_summary"):
+        days = sorted(p.name for p in (tmp_path / table).iterdir())
+        assert days == ["date=2026-03-01", "date=2026-03-02"]
+    segments = read_table(tmp_path, "segments")
+    assert dict(zip(segments['run_id'], segments['date'].astype(str))) == {"a": "2026-03-01", "b": "2026-03-02"}
+
+def test_run_batch_keeps_parquet_and_jsonl_in_sync_on_crash(tmp_path, monkeypatch):
+    def fake_analyze(pair, with_segments=False):
+        if pair['id'] == "3":
+            raise RuntimeError("worker crashed")
+        record = {'id': pair['id'], 'origin': pair['origin'], 'destination': pair['destination'],
+                  'vehicle': pair['vehicle'], 'analyzed_at': "2026-03-01T12:00:00", 'status': "ok", 'pub': []}
+        record['_segments'] = [("추천", [{"name": "덕영대로", "distance_m": 100.0}],
+                                {'co2': 10.0, 'time': 1.0, 'dist': 0.1})]
+        return record
+
+    monkeypatch.setattr(batch, "create_resources", lambda **keys: {})
+    monkeypatch.setattr(batch, "analyze_pair", fake_analyze)
+    pairs = [{'id': str(i), 'origin': "출발", 'destination': "도착", 'vehicle': "2"} for i in range(6)]
+    out_path, parquet_dir = tmp_path / "result.jsonl", tmp_path / "pq"
+
+    with pytest.raises(RuntimeError):
+        batch.run_batch(pairs, str(out_path), {}, workers=1, use_threads=True, parquet_dir=str(parquet_dir))
+
+    # 완료 순서에 따라 몇 건이 기록되는지는 달라질 수 있지만, JSONL 에 있는 결과는 Parquet 에도 있어야 함
+    done = {json.loads(line)['id'] for line in out_path.read_text(encoding="utf-8").splitlines()}
+    assert done and "3" not in done
+    assert set(read_table(parquet_dir, "route_summary")['run_id']) == done
+    assert set(read_table(parquet_dir, "segments")['run_id']) == done
@@ -0,0 +1,32 @@
+"""SegmentTable: 빈 테이블 / concat 처리 확인"""
+import numpy as np
+
+from modules.segment_table import SegmentTable
+from modules.calculator import CarbonCalculator
+
+WEATHER = {'temp': 20.0, 'humidity': 50, 'is_wet': False}
+
+def test_empty_table_has_numeric_columns():
+    table = SegmentTable.empty()
+    assert len(table) == 0
+    for key in SegmentTable.FIELDS[1:]:
+        assert len(table.column(key)) == 0
+
+def test_concat_of_empty_tables_works_with_calculator():
+    empty = SegmentTable.concat([SegmentTable.from_dicts([]), SegmentTable.empty()])
+    assert len(empty) == 0
+    calc = CarbonCalculator()
+    assert len(calc.segment_columns(empty)['distance_m']) == 0
+
+    matrix = calc.calculate_fleet_matrix([SegmentTable.empty(), SegmentTable.empty()], None, WEATHER)
+    assert matrix['co2'].shape[1] == 2
+    assert not np.any(matrix['co2'])
+
+def test_concat_keeps_rows_and_names():
+    a = SegmentTable.from_dicts([{"name": "덕영대로", "distance_m": 100.0, "grade_pct": 1.0}])
+    b = SegmentTable.from_dicts([{"name": "강남대로", "distance_m": 50.0, "grade_pct": -2.0},
+                                 {"name": "덕영대로", "distance_m": 80.0, "grade_pct": 0.5}])
+    table = SegmentTable.concat([a, SegmentTable.empty(), b])
+    assert table.column('name') == ["덕영대로", "강남대로", "덕영대로"]
+    assert table.column('distance_m').tolist() == [100.0, 50.0, 80.0]
+    assert len(table.names) == 2
@@ -152,7 +152,7 @@ def render_tab_compare(car_data, pub_data, weather_info):
     with col_chart:
         st.markdown("#### 📊 비교 분석")
         # 탭으로 공간 활용 최적화
-        sub_tab1, sub_tab2 = st.tabs(["경로별 비교", "대중교통 비교"])
+        sub_tab1, sub_tab2, sub_tab3 = st.tabs(["경로별 비교", "대중교통 비교", "차종별 비교"])
         
         with sub_tab1:
             # 승용차 경로끼리 비교 (막대 차트)
@@ -175,4 +175,17 @@ def render_tab_compare(car_data, pub_data, weather_info):
                 fig_pub.update_layout(height=200, margin=dict(l=0, r=0, t=10, b=0), showlegend=False)
                 st.plotly_chart(fig_pub, use_container_width=True)
             else:
-                st.info("대중교통 경로가 없습니다.")
\ No newline at end of file
+                st.info("대중교통 경로가 없습니다.")
+
+        with sub_tab3:
+            fleet = car_data.get('fleet')
+            if fleet:
+                # 전 차종 x 경로 CO2 행렬 (선택 차량과 같은 날씨/구간 기준)
+                df_fleet = pd.DataFrame(fleet)
+                fig_fleet = px.bar(df_fleet, x='CO2', y='Vehicle', color='Route', orientation='h',
+                                   barmode='group', text_auto='.0f')
+                fig_fleet.update_layout(height=320, margin=dict(l=0, r=0, t=10, b=0),
+                                        yaxis_title=None, legend_title=None)
+                st.plotly_chart(fig_fleet, use_container_width=True)
+            else:
+                st.info("차종 비교 데이터가 없습니다.")
\ No newline at end of file